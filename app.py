@@ -14,7 +14,6 @@ from openai import OpenAI
 import google.generativeai as genai # For future Gemini integration
 import requests
 from bs4 import BeautifulSoup
-from urllib.parse import urlparse
 from authlib.integrations.flask_client import OAuth
 
 # Load environment variables
@@ -116,10 +115,6 @@ if not SERVER_SERPAPI_KEY:
 else:
     print("Server's SERPAPI_KEY loaded.")
 
-KNOWN_SOCIAL_MEDIA_PLATFORMS = [ "x.com", "twitter.com", "instagram.com", "tiktok.com", "youtube.com", "youtu.be", "facebook.com", "reddit.com", "linkedin.com", "pinterest.com", "tumblr.com", "medium.com", "quora.com", "threads.net" ]
-KNOWN_MAINSTREAM_NEWS_DOMAINS = [ "nytimes.com", "bbc.com", "cnn.com", "reuters.com", "apnews.com", "washingtonpost.com", "wsj.com", "theguardian.com", "npr.org", "abcnews.go.com", "cbsnews.com", "nbcnews.com", "foxnews.com", "usatoday.com", "bloomberg.com", "forbes.com", "news.google.com", "cnbc.com", "politico.com", "axios.com", "theatlantic.com", "newyorker.com", "time.com", "latimes.com", "chicagotribune.com", "chron.com"  ]
-KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES = [ "arxiv.org", "pubmed.ncbi.nlm.nih.gov", "nature.com", "sciencemag.org", "jamanetwork.com", "thelancet.com", "ieee.org", "acm.org", "springer.com", "elsevier.com", "wiley.com", "sagepub.com", "jstor.org", "plos.org", "frontiersin.org", "bmj.com", "cell.com" ]
-
 def fetch_text_from_url(url):
     try:
         headers = {'User-Agent': 'Mozilla/5.0 (Windows NT 10.0; Win64; x64) AppleWebKit/537.36 (KHTML, like Gecko) Chrome/100.0.4896.127 Safari/537.36','Accept': 'text/html,application/xhtml+xml,application/xml;q=0.9,image/avif,image/webp,image/apng,*/*;q=0.8,application/signed-exchange;v=b3;q=0.9','Accept-Language': 'en-US,en;q=0.9', 'DNT': '1', 'Connection': 'keep-alive', 'Upgrade-Insecure-Requests': '1'}
@@ -157,35 +152,6 @@ def fetch_text_from_url(url):
     except requests.exceptions.RequestException as e: print(f"Request error URL {url}: {e}"); return None
     except Exception as e: print(f"Parsing error URL {url}: {type(e).__name__} - {e}"); return None
 
-def classify_source_type(result_url, source_engine_name=None):
-    if not result_url: return "unknown_url"
-    try:
-        parsed_url = urlparse(result_url); netloc = parsed_url.netloc.lower(); path = parsed_url.path.lower()
-        if netloc.startswith("www."): netloc = netloc[4:]
-        if netloc.endswith((".gov",".mil")) or ".gov." in netloc or ".mil." in netloc: return "government"
-        if netloc.endswith(".edu"): return "academic_institution"
-        if "wikipedia.org" in netloc: return "encyclopedia"
-        for domain in KNOWN_SOCIAL_MEDIA_PLATFORMS:
-            if domain == netloc or netloc.endswith("."+domain) or domain in netloc:
-                if (domain == "youtube.com" or "youtube.com" in netloc or "youtu.be" in netloc) and ("/channel/" in path or "/c/" in path or "/user/" in path or path.startswith("/@")): return "social_media_channel_creator"
-                if ("youtube.com" in netloc or "youtu.be" in netloc): return "social_media_platform_video"
-                if "medium.com" in netloc: p_parts=[p for p in path.split('/') if p]; return p_parts and (p_parts[0].startswith('@')or(not'.'in p_parts[0]and p_parts[0]not in['search','tag','topic','collections','about','jobs','policy','help','settings','explore','me','new-story']))and"social_blogging_platform_user_pub"or"social_blogging_platform"
-                return "social_media_platform"
-        for domain in KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES:
-            if domain in netloc: return "research_publication"
-        for domain in KNOWN_MAINSTREAM_NEWS_DOMAINS:
-            if domain == netloc or netloc.endswith("."+domain): return any(p in path for p in ["/blog","/opinion","/contributor","/live/"])and"news_opinion_blog_live"or"news_media_mainstream"
-        if netloc.endswith(".org"):
-            if any(p in path for p in ["/blog","/news","/press","/report","/briefing","/article","/story"]): return "ngo_nonprofit_publication"
-            if any(p in netloc for p in ["foundation","institute","society","association","charity","trust","fund","council","union"]): return "ngo_nonprofit_organization"
-            return "ngo_nonprofit_general"
-        if any(p in path for p in ["/blog","/press-release","/newsroom","/insights","/pr/","/investors","/company/about","/about-us","/corporate"]):
-            if not any(n_dom in netloc for n_dom in KNOWN_MAINSTREAM_NEWS_DOMAINS): return "corporate_blog_pr_info"
-        if any(p in path for p in ["/news/","/article/","/story/","/post/","/views/"]) and any(tld in netloc for tld in [".com",".net",".info",".co",".online",".io",".news",".press",".report",".blog"]): return "news_media_other_or_blog"
-        if any(tld in netloc for tld in [".com",".net",".biz",".info",".org",".co",".io",".app",".site",".online",".me",".tv",".news",".blog",".press",".report"]): return "website_general"
-        return "unknown_other"
-    except Exception as e: print(f"Error classifying URL '{result_url}': {type(e).__name__} - {e}"); return "unknown_error_parsing"
-
 def get_sentiment_and_bias(text_content, ai_provider='openai', user_api_key=None):
     if not text_content: return {"score": 0.0, "label": "neutral_no_content"}, {"score": 0.0, "label": "neutral_no_content"}
     print(f"[AI SENTIMENT] Provider: {ai_provider}, User Key Provided: {'Yes' if user_api_key else 'No (will use server key if OpenAI)'}")
@@ -222,9 +188,21 @@ def get_sentiment_and_bias(text_content, ai_provider='openai', user_api_key=None
             except Exception as e_fallback: print(f"Error in Gemini sentiment text fallback: {type(e_fallback).__name__} - {e_fallback}"); return {"score":0.0,"label":"neutral_gemini_error"},{"score":0.0,"label":"neutral_gemini_error"}
     else: print(f"[AI SENTIMENT] Unknown provider: {ai_provider}"); return {"score":0.0,"label":"neutral_provider_unknown"},{"score":0.0,"label":"neutral_provider_unknown"}
 
-def fetch_results_via_serpapi(query, engine_name, api_key_to_use, num_results=10):
+# Imported after load_dotenv so cache settings from .env apply
+from perspective_engine.services.serp_cache import cached_serp_fetch
+from perspective_engine.services.serp_payload import SERP_JSON_RESTRICTOR
+from perspective_engine.services.pagination import serp_page_params
+from perspective_engine.services.serp_key_pool import pooled_serp_key
+from perspective_engine.services.classification import classify_source_type, infer_perspective_from_url_and_title
+from perspective_engine.services.credibility import intrinsic_scores
+from perspective_engine.config.constants import SOURCE_TYPE_BASE_TRUST, SOURCE_TYPE_DEFAULT_BASE_TRUST
+
+@cached_serp_fetch
+@pooled_serp_key
+def fetch_results_via_serpapi(query, engine_name, api_key_to_use, num_results=10, start=0):
     if not api_key_to_use: print(f"SerpApi: No API key for {engine_name}."); return []
-    params = {"q":query,"engine":engine_name.lower(),"api_key":api_key_to_use,"num":num_results,"hl":"en","gl":"us"}
+    params = {"q":query,"engine":engine_name.lower(),"api_key":api_key_to_use,"num":num_results,"hl":"en","gl":"us","json_restrictor":SERP_JSON_RESTRICTOR}
+    params.update(serp_page_params(engine_name, start))
     print(f"SerpApi: Querying {engine_name} for '{query}' (num:{num_results})")
     try:
         s_client = SerpApiClient(params); r_data = s_client.get_dict(); o_results = r_data.get("organic_results",[])
@@ -272,71 +250,17 @@ def search_endpoint():
             result['perspective_query_type'] = f"{perspective}_fetch"
             
             # Set trust scores based on source type
-            base_trust_map = {
-                "government": 85,
-                "academic_institution": 90,
-                "encyclopedia": 80,
-                "research_publication": 85,
-                "news_media_mainstream": 75,
-                "news_opinion_blog_live": 65,
-                "ngo_nonprofit_publication": 70,
-                "ngo_nonprofit_organization": 65,
-                "ngo_nonprofit_general": 60,
-                "corporate_blog_pr_info": 55,
-                "news_media_other_or_blog": 50,
-                "social_media_platform": 30,
-                "social_media_platform_video": 35,
-                "social_media_channel_creator": 40,
-                "social_blogging_platform_user_pub": 45,
-                "social_blogging_platform": 40,
-                "website_general": 50,
-                "mainstream": 75,
-                "alternative": 40,
-                "unknown": 30,
-                "unknown_url": 25,
-                "unknown_other": 30,
-                "unknown_error_parsing": 20
-            }
-            
-            result['base_trust'] = base_trust_map.get(source_type, 50)
+            result['base_trust'] = SOURCE_TYPE_BASE_TRUST.get(source_type, SOURCE_TYPE_DEFAULT_BASE_TRUST)
             result['recency_boost'] = 5  # Default recency boost
-            
-            # Calculate intrinsic score using the scoring endpoint logic
-            score_data = {
-                'source_type': source_type,
-                'base_trust': result['base_trust'],
-                'recency_boost': result['recency_boost'],
-                'factcheckVerdict': 'pending'
-            }
-            
-            # Calculate intrinsic credibility score
-            BTS_MAX = 60
-            RMS_MAX = 15
-            FCS_MAX = 20
-            ITA_MAX = 10
-            
-            bts = min(max(result['base_trust']/100 * BTS_MAX, 0), BTS_MAX)
-            rs = min(max(result['recency_boost']/100 * RMS_MAX, 0), RMS_MAX)
-            
-            # Source type quality adjustment
-            itq_map = {
-                "government": .8, "academic_institution": .9, "research_publication": .9,
-                "encyclopedia": .7, "news_media_mainstream": .6, "news_opinion_blog_live": .3,
-                "ngo_nonprofit_publication": .5, "ngo_nonprofit_organization": .4,
-                "ngo_nonprofit_general": .2, "corporate_blog_pr_info": .1,
-                "news_media_other_or_blog": -.3, "social_media_platform": -.8,
-                "social_media_platform_video": -.7, "social_media_channel_creator": -.5,
-                "social_blogging_platform_user_pub": -.4, "social_blogging_platform": -.6,
-                "website_general": 0, "unknown_url": -.9, "unknown_other": -.9,
-                "unknown_error_parsing": -1, "mainstream": .6, "alternative": -.4, "unknown": -.7
-            }
-            
-            tqv = itq_map.get(source_type, 0.)
-            ita = tqv * ITA_MAX
-            tis = bts + rs + ita  # No fact check yet
-            fs = int(round(min(max(tis, 0), 100)))
-            
-            result['intrinsic_credibility_score'] = fs
+        
+        # Calculate intrinsic credibility scores (no fact check yet)
+        scores, _ = intrinsic_scores(
+            [result['source_type_label'] for result in all_results],
+            [result['base_trust'] for result in all_results],
+            [result['recency_boost'] for result in all_results]
+        )
+        for result, score in zip(all_results, scores.tolist()):
+            result['intrinsic_credibility_score'] = score
         
         return jsonify({
             "query": query,
@@ -773,70 +697,6 @@ def classify_with_openai(results, api_key):
         
         return results
 
-def infer_perspective_from_url_and_title(url, title):
-    """Simple rule-based fallback classifier"""
-    url = url.lower() if url else ''
-    title = title.lower() if title else ''
-    
-    # Government, educational, or major health organizations
-    if any(domain in url for domain in ['.gov', '.edu', 'who.int', 'cdc.gov', 'nih.gov', '.un.org']):
-        return 'mainstream'
-    
-    # Major news outlets (expanded list for robustness)
-    mainstream_news_domains = [
-        'bbc.', 'cnn.', 'nytimes.', 'washingtonpost.', 'reuters.', 'apnews.', 
-        'nbcnews.', 'abcnews.', 'cbsnews.', 'theguardian.', 'wsj.', 'economist.',
-        'npr.org', 'pbs.org', 'usatoday.', 'bloomberg.', 'forbes.', 'politico.', 'axios.'
-    ]
-    if any(outlet in url for outlet in mainstream_news_domains):
-        return 'mainstream'
-    
-    # Wikipedia and similar reference sites
-    if 'wikipedia.org' in url or 'britannica.com' in url or 'snopes.com' in url or 'factcheck.org' in url:
-        return 'neutral'
-    
-    # Keywords suggesting alternative perspectives (expanded)
-    alternative_keywords = [
-        'conspiracy', 'truth', 'alternative', 'freedom', 'patriot', 'liberty',
-        'exposed', 'reveal', 'scandal', 'coverup', 'natural news', 'infowars',
-        'shocking', 'they don\'t want you to know', 'banned', 'censored',
-        'holistic approach', 'natural immunity', 'medical freedom', 'health freedom',
-        'suppressed science', 'the real story', 'unreported', 'controversial study',
-        'uncensored', 'deep state', 'globalist', 'great reset', 'agenda 21', 'agenda 2030',
-        'plandemic', 'scamdemic', 'big pharma', 'big tech', 'hidden', 'secret', 'they lied'
-    ]
-    if any(term in url or term in title for term in alternative_keywords):
-        return 'alternative'
-    
-    # Scientific and academic journals (often mainstream or neutral depending on interpretation context)
-    academic_journal_domains = [
-        'nature.com', 'science.org', 'nejm.org', 'bmj.com', 'thelancet.com',
-        'cell.com', 'pubmed', 'sciencedirect', 'springer', 'wiley', 'oxfordjournals.org',
-        'jamanetwork.com', 'arxiv.org', 'plos.org', 'frontiersin.org'
-    ]
-    if any(term in url for term in academic_journal_domains):
-        # Could be neutral if it's just the paper, or mainstream if it's an editorial supporting consensus
-        # For simplicity in rule-based, let's lean neutral/mainstream if not caught by alternative keywords
-        if not any(alt_kw in title for alt_kw in ['controversial', 'disputed', 'alternative view']):
-             return 'mainstream' # Or 'neutral' - this is debatable for a simple rule
-    
-    # Check for keywords in title that suggest alternative viewpoint (expanded)
-    alternative_title_phrases = [
-        'what they aren\'t telling you', 'the truth about', 'what doctors won\'t say',
-        'doctors are silent', 'big-pharma agenda', 'media won\'t show you',
-        'the untold story of', 'hidden agenda', 'the great awakening', 'red pill'
-    ]
-    if any(phrase in title for phrase in alternative_title_phrases):
-        return 'alternative'
-    
-    # Additional patterns for mainstream content
-    if re.search(r'official|report|study|research|analysis|guidelines|statement from|university study|government report', title, re.I) and not any(alt_kw in title for alt_kw in alternative_keywords + alternative_title_phrases):
-        return 'mainstream'
-    
-    # Default to neutral if no clear signals
-    return 'neutral'
-
-
 def return_oauth_error(error_message):
     """Helper function to return OAuth error"""
     frontend_url = session.get('auth_redirect_url', 'http://localhost:5173')
@@ -958,4 +818,4 @@ if __name__ == '__main__':
     
     # Run the Flask server on port 5001 to match frontend expectations
     print("Starting Flask server on http://127.0.0.1:5001")
-    app.run(host='0.0.0.0', port=5001, debug=True)
\ No newline at end of file
+    app.run(host='0.0.0.0', port=5001, debug=True)
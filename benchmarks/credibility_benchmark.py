@@ -0,0 +1,213 @@
+"""
+Compare rule-based credibility scoring one result at a time and in batches
+
+Old: score_search_result walks the reputation domain lists with any(...)
+     chains and computes the factors, weighted score, credibility tier and
+     perspective in interpreted Python for each result.
+New: score_results reads each result's text features with the keyword
+     scanners, then computes every factor, score, tier and perspective for
+     the whole list with NumPy array operations.
+
+Both paths must give the same scores, factors and perspectives for every
+result here. Source type labels are not compared: score_results takes them
+from classify_source_type. tests/test_credibility.py pins the URLs whose
+outputs differ from this loop on purpose.
+
+Run from the repository root:
+    python benchmarks/credibility_benchmark.py
+"""
+import os
+import random
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perspective_engine.services.credibility import credibility_keywords, score_results
+from perspective_engine.services.search_result import CredibilityFactors, SearchResult
+
+RESULTS = 10000
+RUNS = 5
+DOMAINS = ["cdc.gov", "reuters.com", "nytimes.com", "foxnews.com", "wikipedia.org", "nature.com",
+           "medium.com", "reddit.com", "breitbart.com", "example.com", "naturalnews.com", "healthline.com"]
+# Mostly ordinary words, with a few of the keywords the heuristics look for
+WORDS = ("the of and to in a is that for on was with as it by at from this have are be an which "
+         "vaccines climate policy election results inflation government people year new first said "
+         "according study research data report analysis experts shocking hidden truth").split()
+
+def build_results():
+    rnd = random.Random(7)
+    return [{
+        "link": f"https://www.{rnd.choice(DOMAINS)}/{i}/{rnd.choice(WORDS)}-{rnd.choice(WORDS)}",
+        "title": " ".join(rnd.choice(WORDS) for _ in range(8)).title(),
+        "snippet": " ".join(rnd.choice(WORDS) for _ in range(30)) + "."
+    } for i in range(RESULTS)]
+
+def score_one_at_a_time(result):
+    """score_search_result as it was before score_results"""
+    # Get URL and title for analysis
+    url = result.get('link', '').lower()
+    title = result.get('title', '').lower()
+    snippet = result.get('snippet', '').lower()
+
+    # Initialize credibility factors
+    source_reputation = 0
+    evidence_quality = 0
+    bias_level = 0
+    transparency = 0
+
+    # ===== SOURCE REPUTATION ANALYSIS =====
+    # Government and educational institutions (highest credibility)
+    if any(domain in url for domain in ['.gov', '.mil', '.edu', 'who.int', 'un.org', 'europa.eu', 'nih.gov', 'cdc.gov']):
+        source_reputation = 9
+        result['source_type_label'] = 'government'
+
+    # Major news organizations with established fact-checking
+    elif any(domain in url for domain in ['reuters.com', 'apnews.com', 'bloomberg.com', 'economist.com']):
+        source_reputation = 8
+        result['source_type_label'] = 'news_media_mainstream'
+
+    # Established mainstream news sources
+    elif any(domain in url for domain in ['nytimes.com', 'washingtonpost.com', 'wsj.com', 'bbc.', 
+                                        'cnn.com', 'nbcnews.com', 'abcnews.go.com', 'cbsnews.com',
+                                        'nypost.com', 'latimes.com', 'chicagotribune.com', 'bostonglobe.com',
+                                        'usatoday.com', 'sfchronicle.com', 'dallasnews.com']):
+        source_reputation = 7
+        result['source_type_label'] = 'news_media_mainstream'
+
+    # Other mainstream news sources
+    elif any(domain in url for domain in ['foxnews.com', 'msnbc.com', 'newsweek.com', 'time.com', 
+                                        'theatlantic.com', 'politico.com', 'axios.com', 'vox.com',
+                                        'huffpost.com', 'businessinsider.com', 'forbes.com']):
+        source_reputation = 6
+        result['source_type_label'] = 'news_media_mainstream'
+
+    # Academic publishers and encyclopedias
+    elif any(domain in url for domain in ['nature.com', 'science.org', 'jstor.org', 'springer', 
+                                        'wikipedia.org', 'britannica.com', 'scholarpedia.org']):
+        source_reputation = 8
+        result['source_type_label'] = 'encyclopedia'
+
+    # Established blogs and opinion sites
+    elif any(domain in url for domain in ['medium.com', 'substack.com', 'wordpress.com', 'blogspot.com']):
+        source_reputation = 4
+        result['source_type_label'] = 'news_media_other_or_blog'
+
+    # Social media platforms
+    elif any(domain in url for domain in ['facebook.com', 'twitter.com', 'instagram.com', 'tiktok.com', 
+                                        'reddit.com', 'youtube.com', 'linkedin.com']):
+        source_reputation = 3
+        result['source_type_label'] = 'social_media_platform'
+
+    # Alternative news sources
+    elif any(domain in url for domain in ['breitbart.com', 'infowars.com', 'dailycaller.com', 'thegatewaypundit.com',
+                                        'motherjones.com', 'democracynow.org', 'counterpunch.org',
+                                        'zerohedge.com', 'dailywire.com', 'theblaze.com', 'alternet.org']):
+        source_reputation = 4
+        result['source_type_label'] = 'news_media_other_or_blog'
+
+    # Default for other websites
+    else:
+        source_reputation = 5
+        result['source_type_label'] = 'website_general'
+
+    # ===== EVIDENCE QUALITY ASSESSMENT =====
+    # Look for indicators of evidence in snippet
+    title_keywords = credibility_keywords.find(title)
+    snippet_keywords = credibility_keywords.find(snippet)
+    evidence_count = credibility_keywords.count(snippet_keywords)["evidence_indicators"]
+    evidence_quality = min(8, evidence_count * 2 + 2)  # Base of 2, max of 8
+
+    # ===== BIAS ASSESSMENT =====
+    # Check for emotional or biased language
+    text_hits = credibility_keywords.count(title_keywords | snippet_keywords)
+    bias_count = text_hits["bias_indicators"]
+    bias_level = max(0, 10 - bias_count * 2)  # Higher score means less bias
+
+    # ===== TRANSPARENCY ASSESSMENT =====
+    # Higher for sources that typically provide clear authorship
+    if result['source_type_label'] in ['government', 'news_media_mainstream', 'encyclopedia']:
+        transparency = 8
+    elif result['source_type_label'] in ['news_media_other_or_blog']:
+        transparency = 5
+    else:
+        transparency = 4
+
+    # ===== CALCULATE OVERALL CREDIBILITY SCORE =====
+    # Weighted average of factors (out of 100)
+    credibility_score = int((
+        (source_reputation * 4) +  # 40% weight
+        (evidence_quality * 3) +   # 30% weight
+        (bias_level * 2) +         # 20% weight
+        (transparency * 1)         # 10% weight
+    ) * 10 / 10)  # Convert to 0-100 scale
+
+    result['intrinsic_credibility_score'] = credibility_score
+
+    # Assign credibility level
+    if credibility_score >= 75:
+        result['source_credibility'] = 'high'
+    elif credibility_score >= 50:
+        result['source_credibility'] = 'medium'
+    elif credibility_score >= 25:
+        result['source_credibility'] = 'low'
+    else:
+        result['source_credibility'] = 'unknown'
+
+    # ===== PERSPECTIVE CLASSIFICATION =====
+    # IMPORTANT: Set perspective based on source type FIRST
+    if result['source_type_label'] == 'news_media_mainstream':
+        # All mainstream news sources are classified as mainstream perspective
+        result['perspective'] = 'mainstream'
+
+    # Neutral: Factual, balanced, minimal bias (primarily encyclopedias and academic sources)
+    elif result['source_type_label'] in ['encyclopedia'] or (
+        result['source_type_label'] == 'government' and 
+        any(edu in url for edu in ['.edu', 'university', 'college', 'academic'])):
+        result['perspective'] = 'neutral'
+
+    # Government sources generally reflect mainstream perspective
+    elif result['source_type_label'] == 'government':
+        result['perspective'] = 'mainstream'
+
+    # Alternative: Divergent viewpoints, challenges consensus
+    elif (result['source_type_label'] in ['social_media_platform', 'news_media_other_or_blog'] or
+         (bias_level <= 5) or
+         text_hits["alternative_terms"]):
+        result['perspective'] = 'alternative'
+
+    # Default fallback - if we can't determine, use neutral
+    else:
+        result['perspective'] = 'neutral'
+
+    # Add detailed analysis data
+    result['credibility_factors'] = CredibilityFactors(
+        source_reputation=source_reputation,
+        evidence_quality=evidence_quality,
+        bias_level=bias_level,
+        transparency=transparency
+    )
+
+    return result
+
+def without_label(result):
+    return {key: value for key, value in result.items() if key != "source_type_label"}
+
+def measure(label, fn, results):
+    timings = []
+    for _ in range(RUNS):
+        batch = [SearchResult(result) for result in results]
+        start = time.perf_counter()
+        fn(batch)
+        timings.append((time.perf_counter() - start) * 1000)
+    best = min(timings)
+    print(f"{label:<16} results={len(results)}  best time={best:8.1f} ms  ({best * 1000 / len(results):5.1f} us/result)")
+    return [result.to_dict() for result in batch], best
+
+if __name__ == "__main__":
+    results = build_results()
+    old_output, old_ms = measure("one at a time", lambda batch: [score_one_at_a_time(r) for r in batch], results)
+    new_output, new_ms = measure("score_results", score_results, results)
+    assert [without_label(result) for result in old_output] == [without_label(result) for result in new_output]
+    print()
+    print(f"speedup: {old_ms / new_ms:.2f}x")
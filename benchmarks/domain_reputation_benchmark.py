@@ -0,0 +1,101 @@
+"""
+Measure domain reputation database lookups and memory at different sizes
+
+Each size is compiled to a file with compile_reputation_db and opened as a
+DomainReputationDB. Lookups should cost the same whatever the size, and the
+Python heap of the worker should stay flat: the table lives in mapped pages
+that all workers share. A dict holding the same entries is measured for
+comparison. The last step rebuilds the file while threads keep looking up
+domains, and checks none of them saw a missing or half-written table.
+
+Run from the repository root:
+    python benchmarks/domain_reputation_benchmark.py
+"""
+import os
+import random
+import sys
+import tempfile
+import threading
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perspective_engine.services.domain_reputation import DomainReputationDB, compile_reputation_db
+
+SIZES = [1000, 100000, 500000]
+LOOKUPS = 100000
+SOURCE_TYPES = ["news_media_other_or_blog", "website_general", "corporate_blog_pr_info", "ngo_nonprofit_general"]
+PERSPECTIVES = ["", "", "mainstream", "alternative", "neutral"]
+
+def build_rows(count):
+    rnd = random.Random(count)
+    return [(f"site{n}.{rnd.choice(['com', 'org', 'net', 'co.uk'])}", rnd.choice(SOURCE_TYPES),
+             rnd.randint(0, 10), rnd.choice(PERSPECTIVES)) for n in range(count)]
+
+def lookup_hosts(rows):
+    """Half listed hosts (some as subdomains), half unlisted"""
+    rnd = random.Random(1)
+    hosts = []
+    for i in range(LOOKUPS):
+        if i % 2:
+            hosts.append(f"www.unlisted{i}.com")
+        else:
+            hosts.append(rnd.choice(["", "news.", "blog."]) + rnd.choice(rows)[0])
+    return hosts
+
+def measure(count, directory):
+    rows = build_rows(count)
+    path = os.path.join(directory, f"reputation_{count}.bin")
+    start = time.perf_counter()
+    compile_reputation_db(rows, path)
+    compile_seconds = time.perf_counter() - start
+
+    tracemalloc.start()
+    db = DomainReputationDB(path, check_seconds=60)
+    db_heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    tracemalloc.start()
+    as_dict = {domain: (source_type, reputation, perspective) for domain, source_type, reputation, perspective in rows}
+    dict_heap = tracemalloc.get_traced_memory()[0]
+    tracemalloc.stop()
+
+    hosts = lookup_hosts(rows)
+    start = time.perf_counter()
+    found = sum(1 for host in hosts if db.lookup(host) is not None)
+    lookup_us = (time.perf_counter() - start) * 1e6 / len(hosts)
+    assert found == LOOKUPS // 2
+    print(f"domains={count:<7} file={os.path.getsize(path) / 1e6:6.1f} MB  compile={compile_seconds:5.2f} s  "
+          f"lookup={lookup_us:5.2f} us  heap: mmap db={db_heap / 1e3:7.1f} KB, dict={dict_heap / 1e6:6.1f} MB")
+    del as_dict
+    return path, rows
+
+def check_hot_reload(path, rows):
+    db = DomainReputationDB(path, check_seconds=0)
+    domain = rows[0][0]
+    errors = []
+    stop = threading.Event()
+
+    def reader():
+        while not stop.is_set():
+            if db.lookup(domain) is None:
+                errors.append(domain)
+
+    readers = [threading.Thread(target=reader) for _ in range(4)]
+    for thread in readers:
+        thread.start()
+    for build in range(10):
+        compile_reputation_db([(domain, "website_general", build % 11, "")] + rows[1:1000], path)
+        time.sleep(0.02)
+    stop.set()
+    for thread in readers:
+        thread.join()
+    assert not errors
+    print(f"hot reload: {db.stats()['reloads']} builds swapped in under 4 reader threads, no failed lookups")
+
+if __name__ == "__main__":
+    with tempfile.TemporaryDirectory() as directory:
+        for count in SIZES:
+            path, rows = measure(count, directory)
+        check_hot_reload(path, rows)
@@ -0,0 +1,184 @@
+"""
+A local stand-in for SerpAPI, for load testing /search without spending quota
+
+Answers GET /search (and /search.json) with SerpAPI-shaped organic results,
+and GET /account.json with a generous quota so the key pool stays happy.
+Results are generated from the query, engine and start offset, so repeated
+queries return the same links and engines overlap the way real ones do.
+
+Point the app at it and use any key:
+    python benchmarks/fake_serpapi.py --port 8001 --latency lognormal --latency-ms 400
+    SERPAPI_BASE_URL=http://127.0.0.1:8001 SERPAPI_KEY=fake python run.py
+
+Latency distributions (--latency):
+    fixed      every call takes --latency-ms
+    uniform    between 0 and twice --latency-ms
+    lognormal  median --latency-ms, spread --latency-sigma (long right tail, like the real API)
+    exponential  mean --latency-ms
+"""
+import argparse
+import hashlib
+import json
+import math
+import random
+import threading
+import time
+from http.server import BaseHTTPRequestHandler, ThreadingHTTPServer
+from urllib.parse import urlsplit, parse_qs
+
+DOMAINS = [
+    "cdc.gov", "nih.gov", "reuters.com", "apnews.com", "nytimes.com", "bbc.co.uk", "foxnews.com",
+    "wikipedia.org", "britannica.com", "medium.com", "substack.com", "reddit.com", "youtube.com",
+    "breitbart.com", "zerohedge.com", "example.com", "healthline.com", "nature.com"
+]
+WORDS = (
+    "according to a new study researchers found that the data shows evidence report analysis "
+    "experts say published in survey statistics officials the latest shocking hidden truth"
+).split()
+
+class FakeSerpApi:
+    """Response generator and latency/error model, shared by every handler thread"""
+
+    def __init__(self, latency="lognormal", latency_ms=400.0, latency_sigma=0.5, error_rate=0.0,
+                 rate_limit_rate=0.0, num_results=10, snippet_words=30, engine_latency=None, seed=None):
+        self.latency = latency
+        self.latency_ms = latency_ms
+        self.latency_sigma = latency_sigma
+        self.error_rate = error_rate
+        self.rate_limit_rate = rate_limit_rate
+        self.num_results = num_results
+        self.snippet_words = snippet_words
+        self.engine_latency = engine_latency or {}
+        self._random = random.Random(seed)
+        self._lock = threading.Lock()
+        self.calls = 0
+
+    def delay_seconds(self, engine):
+        median = self.engine_latency.get(engine, self.latency_ms)
+        with self._lock:
+            if self.latency == "fixed":
+                delay = median
+            elif self.latency == "uniform":
+                delay = self._random.uniform(0, 2 * median)
+            elif self.latency == "exponential":
+                delay = self._random.expovariate(1.0 / median) if median > 0 else 0.0
+            else:
+                delay = self._random.lognormvariate(math.log(median), self.latency_sigma) if median > 0 else 0.0
+        return delay / 1000.0
+
+    def failure_status(self):
+        """500 or 429 for a share of calls, else None"""
+        with self._lock:
+            self.calls += 1
+            roll = self._random.random()
+        if roll < self.error_rate:
+            return 500
+        if roll < self.error_rate + self.rate_limit_rate:
+            return 429
+        return None
+
+    def organic_results(self, query, engine, start, num):
+        """Deterministic results; engines share most links, in a slightly different order"""
+        num = min(num, self.num_results)
+        results = []
+        for rank in range(start, start + num):
+            # Every engine returns the same documents, shifted by a per-engine amount
+            doc = rank + int(hashlib.sha1(engine.encode()).hexdigest(), 16) % 3
+            digest = hashlib.sha1(f"{query}|{doc}".encode()).hexdigest()
+            domain = DOMAINS[int(digest[:4], 16) % len(DOMAINS)]
+            words = [WORDS[int(digest[i:i + 2], 16) % len(WORDS)] for i in range(0, 40, 2)]
+            snippet = " ".join((words * (self.snippet_words // len(words) + 1))[:self.snippet_words])
+            results.append({
+                "position": rank + 1,
+                "title": f"{query.title()}: {' '.join(words[:6])}",
+                "link": f"https://www.{domain}/{digest[:12]}/{query.replace(' ', '-')}",
+                "snippet": snippet.capitalize() + "."
+            })
+        return results
+
+def make_handler(fake):
+    class Handler(BaseHTTPRequestHandler):
+        protocol_version = "HTTP/1.1"
+
+        def do_GET(self):
+            url = urlsplit(self.path)
+            params = {key: values[-1] for key, values in parse_qs(url.query).items()}
+            if url.path == "/account.json":
+                return self.send_json(200, {
+                    "account_rate_limit_per_hour": 1_000_000,
+                    "total_searches_left": 1_000_000,
+                    "plan_searches_left": 1_000_000
+                })
+            if url.path not in ("/search", "/search.json"):
+                return self.send_json(404, {"error": "Unknown path"})
+
+            engine = params.get("engine", "google")
+            time.sleep(fake.delay_seconds(engine))
+            status = fake.failure_status()
+            if status == 429:
+                return self.send_json(429, {"error": "Your account has run out of searches."})
+            if status:
+                return self.send_json(500, {"error": "Internal error"})
+
+            # Bing pages by a 1-based "first", the others by a 0-based "start"
+            if engine == "bing":
+                start = max(0, int(params.get("first", 1)) - 1)
+            else:
+                start = int(params.get("start", 0))
+            num = int(params.get("num", params.get("count", 10)) or 10)
+            self.send_json(200, {
+                "search_metadata": {"status": "Success", "total_time_taken": 0.0},
+                "search_parameters": {"engine": engine, "q": params.get("q", "")},
+                "organic_results": fake.organic_results(params.get("q", ""), engine, start, num)
+            })
+
+        def send_json(self, status, body):
+            payload = json.dumps(body).encode("utf-8")
+            self.send_response(status)
+            self.send_header("Content-Type", "application/json")
+            self.send_header("Content-Length", str(len(payload)))
+            self.end_headers()
+            self.wfile.write(payload)
+
+        def log_message(self, format, *args):
+            pass
+
+    return Handler
+
+def parse_engine_latency(values):
+    """Turn ["bing=800", ...] into {"bing": 800.0}"""
+    latencies = {}
+    for value in values or []:
+        engine, _, ms = value.partition("=")
+        latencies[engine.strip().lower()] = float(ms)
+    return latencies
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Local SerpAPI stand-in")
+    parser.add_argument("--host", default="127.0.0.1")
+    parser.add_argument("--port", type=int, default=8001)
+    parser.add_argument("--latency", choices=["fixed", "uniform", "lognormal", "exponential"], default="lognormal")
+    parser.add_argument("--latency-ms", type=float, default=400.0, help="Median (or mean/fixed) latency")
+    parser.add_argument("--latency-sigma", type=float, default=0.5, help="Spread of the lognormal distribution")
+    parser.add_argument("--engine-latency", action="append", metavar="ENGINE=MS",
+                        help="Latency for one engine, e.g. bing=900; may be repeated")
+    parser.add_argument("--error-rate", type=float, default=0.0, help="Share of calls answered with HTTP 500")
+    parser.add_argument("--rate-limit-rate", type=float, default=0.0, help="Share of calls answered with HTTP 429")
+    parser.add_argument("--results", type=int, default=10, help="Most organic results per page")
+    parser.add_argument("--snippet-words", type=int, default=30)
+    parser.add_argument("--seed", type=int, default=None)
+    args = parser.parse_args()
+
+    fake = FakeSerpApi(
+        latency=args.latency, latency_ms=args.latency_ms, latency_sigma=args.latency_sigma,
+        error_rate=args.error_rate, rate_limit_rate=args.rate_limit_rate, num_results=args.results,
+        snippet_words=args.snippet_words, engine_latency=parse_engine_latency(args.engine_latency), seed=args.seed
+    )
+    server = ThreadingHTTPServer((args.host, args.port), make_handler(fake))
+    server.daemon_threads = True
+    print(f"Fake SerpAPI: Listening on http://{args.host}:{args.port} "
+          f"({args.latency} {args.latency_ms:.0f} ms, {args.error_rate:.0%} errors, {args.rate_limit_rate:.0%} 429s)")
+    try:
+        server.serve_forever()
+    except KeyboardInterrupt:
+        print(f"Fake SerpAPI: Stopped after {fake.calls} searches")
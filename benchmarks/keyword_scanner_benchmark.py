@@ -0,0 +1,137 @@
+"""
+Compare keyword heuristics as substring loops and as one KeywordScanner pass
+
+Old: infer_perspective_from_url_and_title and score_search_result test each
+     keyword list with its own any(...)/sum(...) loop over the URL, title and
+     snippet, plus an uncompiled re.search on the title.
+New: each field is read once by a prebuilt Aho-Corasick automaton that
+     counts every keyword class at the same time.
+
+Both paths must give the same labels and counts for every result. The
+numbers assume pyahocorasick is installed (see requirements.txt); the
+pure-Python fallback automaton is slower than the loops it replaces.
+
+Run from the repository root:
+    python benchmarks/keyword_scanner_benchmark.py
+"""
+import os
+import random
+import re
+import sys
+import time
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perspective_engine.services.credibility import credibility_keywords
+from perspective_engine.config.constants import ALTERNATIVE_KEYWORDS
+from perspective_engine.services.classification import infer_perspective_from_url_and_title
+
+RESULTS = 20000
+RUNS = 3
+DOMAINS = ["cdc.gov", "reuters.com", "nytimes.com", "wikipedia.org", "nature.com", "medium.com",
+           "reddit.com", "example.com", "naturalnews.com", "healthline.com"]
+# Mostly ordinary words, with a few of the keywords the heuristics look for
+WORDS = ("the of and to in a is that for on was with as it by at from this have are be an which "
+         "vaccines climate policy election results inflation government people year new first said "
+         "according study research data report analysis experts shocking hidden truth").split()
+
+def build_results():
+    rnd = random.Random(7)
+    results = []
+    for i in range(RESULTS):
+        title = " ".join(rnd.choice(WORDS) for _ in range(8)).title()
+        if i % 5 == 0:
+            title += " - " + rnd.choice(ALTERNATIVE_KEYWORDS).title()
+        results.append({
+            "link": f"https://www.{rnd.choice(DOMAINS)}/{i}/{title.lower().replace(' ', '-')[:60]}",
+            "title": title,
+            "snippet": " ".join(rnd.choice(WORDS) for _ in range(30)) + "."
+        })
+    return results
+
+def infer_perspective_with_loops(url, title):
+    """infer_perspective_from_url_and_title as it was before KeywordScanner"""
+    url = url.lower() if url else ''
+    title = title.lower() if title else ''
+    if any(domain in url for domain in ['.gov', '.edu', 'who.int', 'cdc.gov', 'nih.gov', '.un.org']):
+        return 'mainstream'
+    mainstream_news_domains = [
+        'bbc.', 'cnn.', 'nytimes.', 'washingtonpost.', 'reuters.', 'apnews.',
+        'nbcnews.', 'abcnews.', 'cbsnews.', 'theguardian.', 'wsj.', 'economist.',
+        'npr.org', 'pbs.org', 'usatoday.', 'bloomberg.', 'forbes.', 'politico.', 'axios.'
+    ]
+    if any(outlet in url for outlet in mainstream_news_domains):
+        return 'mainstream'
+    if 'wikipedia.org' in url or 'britannica.com' in url or 'snopes.com' in url or 'factcheck.org' in url:
+        return 'neutral'
+    if any(term in url or term in title for term in ALTERNATIVE_KEYWORDS):
+        return 'alternative'
+    academic_journal_domains = [
+        'nature.com', 'science.org', 'nejm.org', 'bmj.com', 'thelancet.com',
+        'cell.com', 'pubmed', 'sciencedirect', 'springer', 'wiley', 'oxfordjournals.org',
+        'jamanetwork.com', 'arxiv.org', 'plos.org', 'frontiersin.org'
+    ]
+    if any(term in url for term in academic_journal_domains):
+        if not any(alt_kw in title for alt_kw in ['controversial', 'disputed', 'alternative view']):
+            return 'mainstream'
+    alternative_title_phrases = [
+        'what they aren\'t telling you', 'the truth about', 'what doctors won\'t say',
+        'doctors are silent', 'big-pharma agenda', 'media won\'t show you',
+        'the untold story of', 'hidden agenda', 'the great awakening', 'red pill'
+    ]
+    if any(phrase in title for phrase in alternative_title_phrases):
+        return 'alternative'
+    if re.search(r'official|report|study|research|analysis|guidelines|statement from|university study|government report',
+                 title, re.I) and not any(alt_kw in title for alt_kw in ALTERNATIVE_KEYWORDS + alternative_title_phrases):
+        return 'mainstream'
+    return 'neutral'
+
+def text_heuristics_with_loops(title, snippet):
+    """score_search_result's keyword counts as they were before KeywordScanner"""
+    title, snippet = title.lower(), snippet.lower()
+    evidence_indicators = ['according to', 'study', 'research', 'evidence', 'data', 'survey', 'report',
+                           'analysis', 'found that', 'statistics', 'experts say', 'published in']
+    bias_indicators = ['shocking', 'outrageous', 'scandal', 'hoax', 'conspiracy', 'truth', 'exposed',
+                       'they don\'t want you to know', 'mainstream media won\'t tell you', 'wake up']
+    return (
+        sum(1 for indicator in evidence_indicators if indicator in snippet),
+        sum(1 for indicator in bias_indicators if indicator in title.lower() or indicator in snippet.lower()),
+        any(term in title.lower() or term in snippet.lower() for term in
+            ['conspiracy', 'alternative', 'truth movement', 'cover-up', 'hidden', 'secret'])
+    )
+
+def text_heuristics_with_scanner(title, snippet):
+    title_keywords = credibility_keywords.find(title)
+    snippet_keywords = credibility_keywords.find(snippet)
+    text_hits = credibility_keywords.count(title_keywords | snippet_keywords)
+    return (
+        credibility_keywords.count(snippet_keywords)["evidence_indicators"],
+        text_hits["bias_indicators"],
+        bool(text_hits["alternative_terms"])
+    )
+
+def old_path(results):
+    return [(infer_perspective_with_loops(r["link"], r["title"]),
+             text_heuristics_with_loops(r["title"], r["snippet"])) for r in results]
+
+def new_path(results):
+    return [(infer_perspective_from_url_and_title(r["link"], r["title"]),
+             text_heuristics_with_scanner(r["title"], r["snippet"])) for r in results]
+
+def measure(label, fn, results):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        output = fn(results)
+        timings.append((time.perf_counter() - start) * 1000)
+    best = min(timings)
+    print(f"{label:<14} results={len(results)}  best time={best:8.1f} ms  ({best * 1000 / len(results):5.1f} us/result)")
+    return output, best
+
+if __name__ == "__main__":
+    results = build_results()
+    old_output, old_ms = measure("substring loops", old_path, results)
+    new_output, new_ms = measure("KeywordScanner", new_path, results)
+    assert old_output == new_output
+    print()
+    print(f"speedup: {old_ms / new_ms:.2f}x")
@@ -0,0 +1,150 @@
+"""
+Drive /search at a fixed concurrency and report latency percentiles and throughput
+
+Meant to run against the app pointed at benchmarks/fake_serpapi.py, so
+/search exercises the real network path (fan-out, key pool, hedging, circuit
+breakers, cache) without spending SerpAPI quota:
+
+    python benchmarks/fake_serpapi.py --latency lognormal --latency-ms 400
+    SERPAPI_BASE_URL=http://127.0.0.1:8001 SERPAPI_KEY=fake python run.py
+    python benchmarks/search_load_test.py --concurrency 16 --requests 500
+
+Each worker sends its next request as soon as the last one answers (a closed
+loop). By default every request is a new query, so the SERP cache and
+request coalescing are bypassed; use --distinct-queries to measure them.
+
+The SerpAPI key pool limits each key to SERP_KEY_RATE_PER_SECOND, so with one
+fake key that limit is the throughput ceiling. To load the rest of the path,
+raise SERP_KEY_RATE_PER_SECOND and SERP_KEY_BURST or list several fake keys
+in SERPAPI_KEYS.
+"""
+import argparse
+import itertools
+import os
+import sys
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+import requests
+from perspective_engine.services.latency import LatencyTracker
+
+TOPICS = ["vaccine safety", "climate change", "election results", "inflation", "nuclear power",
+          "gun control", "immigration policy", "covid origins", "minimum wage", "electric cars"]
+
+class LoadTest:
+    """Closed-loop load generator with shared counters"""
+
+    def __init__(self, url, engines, distinct_queries=0, deadline_ms=None, timeout=30.0):
+        self.url = url
+        self.engines = engines
+        self.distinct_queries = distinct_queries
+        self.deadline_ms = deadline_ms
+        self.timeout = timeout
+        self._lock = threading.Lock()
+        self._sequence = itertools.count()
+        self._local = threading.local()
+        self.reset()
+
+    def reset(self):
+        """Forget latencies and outcomes so far, e.g. after a warmup. Queries keep counting up."""
+        self.latency = LatencyTracker(window_size=None, buckets_ms=[100, 250, 500, 1000, 2000, 5000, 10000])
+        self.counts = {"ok": 0, "http_errors": 0, "failed": 0, "search_errors": 0, "partial": 0, "empty": 0}
+
+    def next_query(self):
+        n = next(self._sequence)
+        if self.distinct_queries:
+            n %= self.distinct_queries
+        return f"{TOPICS[n % len(TOPICS)]} {n}"
+
+    def session(self):
+        if not hasattr(self._local, "session"):
+            self._local.session = requests.Session()
+        return self._local.session
+
+    def one_request(self):
+        body = {"query": self.next_query(), "engines": self.engines}
+        if self.deadline_ms:
+            body["deadline_ms"] = self.deadline_ms
+
+        started = time.perf_counter()
+        try:
+            response = self.session().post(self.url, json=body, timeout=self.timeout)
+            elapsed = time.perf_counter() - started
+            data = response.json() if response.status_code == 200 else {}
+        except Exception as e:
+            print(f"Load test: Request failed: {type(e).__name__} - {e}")
+            self._count("failed")
+            return
+
+        self.latency.record("search", elapsed)
+        if response.status_code != 200:
+            self._count("http_errors")
+        elif "error_info" in data:
+            self._count("search_errors")
+        else:
+            self._count("ok")
+            if data.get("timed_out_engines") or data.get("cut_short"):
+                self._count("partial")
+            if not data.get("results"):
+                self._count("empty")
+
+    def run(self, concurrency, total_requests=None, duration=None):
+        """Run until total_requests have been sent or duration seconds have passed"""
+        stop_at = time.perf_counter() + duration if duration else None
+        remaining = itertools.count() if total_requests is None else iter(range(total_requests))
+        remaining_lock = threading.Lock()
+
+        def worker():
+            while True:
+                if stop_at is not None and time.perf_counter() >= stop_at:
+                    return
+                with remaining_lock:
+                    if next(remaining, None) is None:
+                        return
+                self.one_request()
+
+        started = time.perf_counter()
+        with ThreadPoolExecutor(max_workers=concurrency) as executor:
+            for _ in range(concurrency):
+                executor.submit(worker)
+        return time.perf_counter() - started
+
+    def _count(self, name):
+        with self._lock:
+            self.counts[name] += 1
+
+    def report(self, concurrency, elapsed):
+        stats = self.latency.snapshot().get("search", {})
+        answered = stats.get("samples", 0)
+        print()
+        print(f"target:      {self.url} engines={','.join(self.engines)} concurrency={concurrency}")
+        print(f"requests:    {answered + self.counts['failed']} in {elapsed:.1f}s = {answered / elapsed:.1f} req/s")
+        print(f"outcomes:    {self.counts}")
+        if answered:
+            print(f"latency:     p50={stats['p50_ms']} ms  p95={stats['p95_ms']} ms  p99={stats['p99_ms']} ms")
+            print(f"histogram:   {stats['histogram']}")
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Load test POST /search")
+    parser.add_argument("--url", default="http://127.0.0.1:5001/search")
+    parser.add_argument("--concurrency", type=int, default=8)
+    parser.add_argument("--requests", type=int, default=200, help="Total requests (ignored with --duration)")
+    parser.add_argument("--duration", type=float, default=None, help="Run for this many seconds instead")
+    parser.add_argument("--engines", default="google,bing")
+    parser.add_argument("--distinct-queries", type=int, default=0,
+                        help="Cycle through this many queries; 0 makes every query new")
+    parser.add_argument("--deadline-ms", type=int, default=None, help="Send this deadline_ms with every request")
+    parser.add_argument("--warmup", type=int, default=0, help="Requests sent first and left out of the report")
+    args = parser.parse_args()
+
+    engines = [engine.strip() for engine in args.engines.split(",") if engine.strip()]
+    load_test = LoadTest(args.url, engines, args.distinct_queries, args.deadline_ms)
+    if args.warmup:
+        load_test.run(args.concurrency, args.warmup)
+        load_test.reset()
+
+    elapsed = load_test.run(args.concurrency, None if args.duration else args.requests, args.duration)
+    load_test.report(args.concurrency, elapsed)
@@ -0,0 +1,127 @@
+"""
+Compare result memory with plain dicts and with SearchResult
+
+Old: each deduplicated result is a dict, with credibility_factors as a
+     nested dict and labels as plain strings.
+New: dedupe_results builds slotted SearchResults with enum labels and a
+     CredibilityFactors tuple; dicts are only built at the HTTP edge.
+
+Both paths run dedup, fusion and rule scoring over a bulk-sized result set
+and keep every result alive, as a bulk job or a large page does.
+
+Run from the repository root:
+    python benchmarks/search_result_benchmark.py
+"""
+import gc
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perspective_engine.api.search import ranked, score_search_result
+from perspective_engine.services.dedup import canonicalize_url, content_id, dedupe_results
+from perspective_engine.services.fusion import fuse_results
+
+QUERIES = 1000
+RESULTS_PER_ENGINE = 10
+RUNS = 3
+DOMAINS = ["cdc.gov", "reuters.com", "nytimes.com", "wikipedia.org", "medium.com", "reddit.com", "example.com"]
+
+def build_engine_pages():
+    """Two engines' first pages for each query, with half the links shared"""
+    pages = []
+    for q in range(QUERIES):
+        engines = []
+        for engine, offset in (("Google", 0), ("Bing", RESULTS_PER_ENGINE // 2)):
+            engines.append(ranked([{
+                "title": f"Result {i} for query {q}",
+                "link": f"https://www.{DOMAINS[i % len(DOMAINS)]}/q{q}/article-{i}?utm_source=serp",
+                "snippet": "According to a new study, researchers found that the data shows a clear trend.",
+                "source_engine": engine
+            } for i in range(offset, offset + RESULTS_PER_ENGINE)]))
+        pages.append(engines[0] + engines[1])
+    return pages
+
+def dedupe_as_dicts(results):
+    """dedupe_results as it was before SearchResult: a new dict per result"""
+    merged = {}
+    for result in results:
+        link = result.get("link")
+        result_id = content_id(link)
+        entry = merged.get(result_id)
+        if entry is None:
+            entry = merged[result_id] = {
+                **result,
+                "content_id": result_id,
+                "canonical_url": canonicalize_url(link),
+                "engines": [],
+                "provenance": []
+            }
+        engine = result.get("source_engine")
+        entry["provenance"].append({"engine": engine, "rank": result.get("position")})
+        if engine not in entry["engines"]:
+            entry["engines"].append(engine)
+    return list(merged.values())
+
+def old_path(pages):
+    kept = []
+    for page in pages:
+        results = fuse_results(dedupe_as_dicts(page))
+        for result in results:
+            score_search_result(result)
+            result["credibility_factors"] = result["credibility_factors"]._asdict()
+        kept.append(results)
+    return kept
+
+def new_path(pages):
+    kept = []
+    for page in pages:
+        results = fuse_results(dedupe_results(page))
+        for result in results:
+            score_search_result(result)
+        kept.append(results)
+    return kept
+
+def measure(label, fn, pages):
+    # Like timeit, keep the collector out of the timings: it would otherwise
+    # charge each path for whatever the other left alive
+    timings = []
+    gc.collect()
+    gc.disable()
+    try:
+        for _ in range(RUNS):
+            start = time.perf_counter()
+            fn(pages)
+            timings.append((time.perf_counter() - start) * 1000)
+    finally:
+        gc.enable()
+    elapsed_ms = min(timings)
+
+    tracemalloc.start()
+    kept = fn(pages)
+    retained, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    count = sum(len(results) for results in kept)
+    print(f"{label:<13} results={count:>6}  best time={elapsed_ms:8.1f} ms  "
+          f"retained={retained / 1024:8.1f} KiB ({retained / count:6.0f} B/result)  peak={peak / 1024:8.1f} KiB")
+    return kept, retained
+
+if __name__ == "__main__":
+    pages = build_engine_pages()
+
+    old_kept, old_retained = measure("dicts", old_path, pages)
+    new_kept, new_retained = measure("SearchResult", new_path, pages)
+
+    assert [[result.to_dict() for result in results] for results in new_kept] == old_kept
+
+    start = time.perf_counter()
+    for results in new_kept:
+        [result.to_dict() for result in results]
+    edge_ms = (time.perf_counter() - start) * 1000
+
+    print()
+    print(f"retained memory: {old_retained / new_retained:.1f}x lower")
+    print(f"to_dict() at the HTTP edge for every result: {edge_ms:.1f} ms")
@@ -0,0 +1,112 @@
+"""
+Compare the old and new SerpAPI fetch parse paths
+
+Old: full SerpAPI document, decoded with response.text (charset detection)
+     and parsed in full by get_dict().
+New: document restricted by SERP_JSON_RESTRICTOR, parsed from raw bytes by
+     parse_serp_payload().
+
+Run from the repository root:
+    python benchmarks/serp_payload_benchmark.py
+"""
+import json
+import os
+import sys
+import time
+import tracemalloc
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from requests.models import Response
+from perspective_engine.services.serp_payload import parse_serp_payload
+
+ITERATIONS = 200
+
+def build_full_document(num_results=10):
+    """Build a SerpAPI-shaped Google response with the extras a real one carries"""
+    organic = []
+    for i in range(num_results):
+        organic.append({
+            "position": i + 1,
+            "title": f"Result title number {i} about the topic",
+            "link": f"https://example{i}.com/articles/{i}/some-long-slug-for-the-article",
+            "redirect_link": f"https://www.google.com/url?sa=t&url=https://example{i}.com/{i}",
+            "displayed_link": f"https://example{i}.com › articles › {i}",
+            "favicon": "data:image/png;base64," + "A" * 600,
+            "snippet": "A reasonably long snippet of text describing the result. " * 4,
+            "snippet_highlighted_words": ["topic", "result"],
+            "sitelinks": {"inline": [{"title": f"Sitelink {j}", "link": f"https://example{i}.com/{j}"} for j in range(4)]},
+            "rich_snippet": {"top": {"detected_extensions": {"rating": 4.5}, "extensions": ["Rating: 4.5", "Review"]}},
+            "about_this_result": {"source": {"description": "Source description " * 10, "icon": "https://x/" + "i" * 80}},
+            "cached_page_link": f"https://webcache.googleusercontent.com/search?q=cache:{i}",
+            "source": f"Example {i}"
+        })
+    return {
+        "search_metadata": {"id": "abc123", "status": "Success", "json_endpoint": "https://serpapi.com/searches/abc.json",
+                            "created_at": "2026-01-01", "processed_at": "2026-01-01", "google_url": "https://www.google.com/search?q=x",
+                            "raw_html_file": "https://serpapi.com/searches/abc.html", "total_time_taken": 1.23},
+        "search_parameters": {"engine": "google", "q": "topic", "google_domain": "google.com", "hl": "en", "gl": "us", "num": "10"},
+        "search_information": {"organic_results_state": "Results for exact spelling", "total_results": 123456789},
+        "ads": [{"position": j, "title": f"Ad {j}", "link": f"https://ads{j}.com", "description": "Buy now " * 20} for j in range(4)],
+        "knowledge_graph": {"title": "Topic", "type": "Thing", "description": "Knowledge graph text " * 40,
+                            "header_images": [{"image": "data:image/jpeg;base64," + "B" * 4000} for _ in range(3)]},
+        "inline_images": [{"thumbnail": "data:image/jpeg;base64," + "C" * 2000, "source": f"https://img{j}.com"} for j in range(8)],
+        "top_stories": [{"title": f"Story {j}", "link": f"https://news{j}.com", "thumbnail": "data:image/jpeg;base64," + "D" * 1500} for j in range(6)],
+        "related_questions": [{"question": f"Question {j}?", "snippet": "Answer text " * 30} for j in range(4)],
+        "related_searches": [{"query": f"related {j}", "link": f"https://www.google.com/search?q=related+{j}"} for j in range(8)],
+        "pagination": {"current": 1, "next": "https://www.google.com/search?q=x&start=10"},
+        "organic_results": organic
+    }
+
+def restrict(document):
+    """Apply the same projection SERP_JSON_RESTRICTOR asks SerpAPI for"""
+    return {"organic_results": [
+        {k: r[k] for k in ("title", "link", "snippet") if k in r} for r in document["organic_results"]
+    ]}
+
+def make_response(body):
+    """Wrap bytes in a requests Response without an explicit charset, like SerpAPI's"""
+    response = Response()
+    response._content = body
+    response.status_code = 200
+    response.headers["Content-Type"] = "application/json"
+    return response
+
+def old_path(body):
+    response = make_response(body)
+    data = dict(json.loads(response.text))
+    return [{"title": i.get("title"), "link": i.get("link"), "snippet": i.get("snippet")}
+            for i in data.get("organic_results", [])]
+
+def new_path(body):
+    response = make_response(body)
+    return parse_serp_payload(response.content)[0]
+
+def measure(label, fn, body):
+    start = time.perf_counter()
+    for _ in range(ITERATIONS):
+        fn(body)
+    per_call_ms = (time.perf_counter() - start) * 1000 / ITERATIONS
+
+    tracemalloc.start()
+    fn(body)
+    _, peak = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    print(f"{label:<10} bytes={len(body):>8}  parse={per_call_ms:7.3f} ms/call  peak_mem={peak / 1024:8.1f} KiB")
+    return per_call_ms, peak
+
+if __name__ == "__main__":
+    full = build_full_document()
+    full_body = json.dumps(full).encode("utf-8")
+    lean_body = json.dumps(restrict(full)).encode("utf-8")
+
+    assert old_path(full_body) == new_path(lean_body)
+
+    old_ms, old_peak = measure("full", old_path, full_body)
+    new_ms, new_peak = measure("restricted", new_path, lean_body)
+
+    print()
+    print(f"bytes on the wire: {len(full_body) / len(lean_body):.1f}x smaller")
+    print(f"parse time:        {old_ms / new_ms:.1f}x faster")
+    print(f"peak memory:       {old_peak / new_peak:.1f}x lower")
@@ -0,0 +1,76 @@
+"""
+Compare source type classification with and without the per-host memo
+
+Old: classify_source_type parses every URL and walks the rule set for it,
+     even when the same host was classified a moment ago.
+New: the rule plan for each host is memoized (HostRuleMemo), so a warm host
+     whose label does not depend on the path costs one dict lookup, and
+     other warm hosts only run the path checks left in their plan.
+
+Traffic is drawn from a few thousand hosts with a long-tailed popularity,
+as in a day of search results. Both paths must give the same labels.
+
+Run from the repository root:
+    python benchmarks/source_type_memo_benchmark.py
+"""
+import os
+import random
+import sys
+import time
+from urllib.parse import urlparse
+
+sys.path.insert(0, os.path.dirname(os.path.dirname(os.path.abspath(__file__))))
+
+from perspective_engine.config.constants import (
+    KNOWN_SOCIAL_MEDIA_PLATFORMS, KNOWN_MAINSTREAM_NEWS_DOMAINS, KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES
+)
+from perspective_engine.services.classification import classify_source_type, source_type_memo, source_type_rules
+
+RESULTS = 100000
+HOSTS = 3000
+RUNS = 3
+PATHS = ["/news/{i}/story-title", "/{i}/article", "/blog/post-{i}", "/@author/{i}", "/channel/{i}",
+         "/wiki/Page_{i}", "/opinion/{i}", "/about-us", "/r/topic/comments/{i}", "/doi/10.1000/{i}"]
+
+def build_urls():
+    rnd = random.Random(11)
+    known = KNOWN_SOCIAL_MEDIA_PLATFORMS + KNOWN_MAINSTREAM_NEWS_DOMAINS + KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES
+    tlds = [".com", ".org", ".net", ".gov", ".edu", ".co.uk", ".io", ".info"]
+    hosts = ["www." + domain for domain in known] + [
+        f"{rnd.choice(['', 'www.', 'news.', 'blog.'])}site{n}{rnd.choice(tlds)}" for n in range(HOSTS - len(known))
+    ]
+    # Zipf-like popularity: the first hosts make up most results
+    weights = [1 / (rank + 1) for rank in range(len(hosts))]
+    return [
+        f"https://{host}" + rnd.choice(PATHS).format(i=i)
+        for i, host in enumerate(rnd.choices(hosts, weights, k=RESULTS))
+    ]
+
+def classify_without_memo(result_url):
+    """classify_source_type as it was before HostRuleMemo"""
+    parsed_url = urlparse(result_url)
+    host = (parsed_url.hostname or "").lower()
+    path = parsed_url.path.lower()
+    if host.startswith("www."):
+        host = host[4:]
+    segments = [p for p in path.split('/') if p]
+    return source_type_rules.match({"host": host, "path": path, "segment": segments[0] if segments else ""})
+
+def measure(label, fn, urls):
+    timings = []
+    for _ in range(RUNS):
+        start = time.perf_counter()
+        output = [fn(url) for url in urls]
+        timings.append((time.perf_counter() - start) * 1000)
+    best = min(timings)
+    print(f"{label:<14} results={len(urls)}  best time={best:8.1f} ms  ({best * 1000 / len(urls):5.2f} us/result)")
+    return output, best
+
+if __name__ == "__main__":
+    urls = build_urls()
+    old_output, old_ms = measure("no memo", classify_without_memo, urls)
+    new_output, new_ms = measure("HostRuleMemo", classify_source_type, urls)
+    assert old_output == new_output
+    print()
+    print(f"memo: {source_type_memo.stats()}")
+    print(f"speedup: {old_ms / new_ms:.2f}x")
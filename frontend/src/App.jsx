@@ -1,6 +1,6 @@
 import React, { useState, useEffect, useContext } from 'react';
 import { AuthContext } from './contexts/AuthContext';
-import { searchAPI, factCheckAPI, summarizeAPI } from './services/api';
+import { searchStreamAPI, loadMoreAPI, factCheckAPI, summarizeAPI } from './services/api';
 import { loginUser, registerUser } from './services/auth';
 import { createResultId } from './utils/helpers';
 import Header from './components/layout/Header';
@@ -24,6 +24,8 @@ function App() {
   const [hasSearched, setHasSearched] = useState(false);
   const [hasSearchError, setHasSearchError] = useState(false);
   const [searchErrorMessage, setSearchErrorMessage] = useState('');
+  const [nextCursor, setNextCursor] = useState(null);
+  const [isLoadingMore, setIsLoadingMore] = useState(false);
 
   const [activeDisplayPerspective, setActiveDisplayPerspective] = useState('all');
   const [showCredibilityOverview, setShowCredibilityOverview] = useState(true);
@@ -31,7 +33,8 @@ function App() {
   const [selectedEngines, setSelectedEngines] = useState({
     google: true,
     bing: false,
-    duckduckgo: false
+    duckduckgo: false,
+    local: false
   });
 
   const [authModalVisible, setAuthModalVisible] = useState(false);
@@ -65,61 +68,62 @@ function App() {
     }));
   };
 
+  // Results get an id the list can key on; content_id is stable across pages
+  const withIds = (results) => results.map(result => ({
+    ...result,
+    id: result.id || result.content_id || createResultId(result),
+    perspective: result.perspective || 'neutral'
+  }));
+
+  // Append a page of results, skipping any already shown
+  const appendResults = (results) => {
+    setSearchResults(prevResults => {
+      const shown = new Set(prevResults.map(result => result.id));
+      return [...prevResults, ...withIds(results).filter(result => !shown.has(result.id))];
+    });
+  };
+
   const handleSearch = async () => {
     if (!searchQuery.trim()) return;
     setIsLoading(true);
+    setIsProcessing(true);
     setHasSearched(true);
     setHasSearchError(false);
     setSearchErrorMessage('');
     setShowCredibilityOverview(true);
     setSearchResults([]);
+    setNextCursor(null);
 
     try {
       const effectiveSerpApiKey = serpApiKeyUser || undefined;
       const currentAuthToken = authToken || localStorage.getItem('perspectiveEngineToken');
-      
-      const backendResponse = await searchAPI(
+
+      // Each engine's results are shown as soon as that engine answers
+      await searchStreamAPI(
         searchQuery,
         Object.keys(selectedEngines).filter(engine => selectedEngines[engine]),
         activeDisplayPerspective,
         effectiveSerpApiKey,
         currentAuthToken,
-        selectedAiProvider
+        selectedAiProvider,
+        (event) => {
+          if (event.event === 'engine') {
+            appendResults(event.results || []);
+            setIsLoading(false);
+          } else if (event.event === 'classification') {
+            const perspectives = new Map((event.results || []).map(result => [result.link, result.perspective]));
+            setSearchResults(prevResults => prevResults.map(result =>
+              perspectives.get(result.link) ? { ...result, perspective: perspectives.get(result.link) } : result
+            ));
+          } else if (event.event === 'error') {
+            setHasSearchError(true);
+            setSearchErrorMessage(event.error_info || 'Search failed.');
+          } else if (event.event === 'done') {
+            setNextCursor(event.next_cursor || null);
+          }
+        }
       );
 
-      console.log("App.jsx: Results received from backend:", backendResponse);
-
-      // Handle both possible response formats:
-      // 1. Direct array: [result1, result2, ...]
-      // 2. Object with results property: {results: [result1, result2, ...], ...}
-      let resultsFromBackend;
-      
-      if (Array.isArray(backendResponse)) {
-        resultsFromBackend = backendResponse;
-      } else if (backendResponse && Array.isArray(backendResponse.results)) {
-        resultsFromBackend = backendResponse.results;
-      } else {
-        console.error("Backend returned unexpected format:", backendResponse);
-        setHasSearchError(true);
-        setSearchErrorMessage('Invalid response format from server.');
-        setSearchResults([]);
-        return;
-      }
-
-      if (resultsFromBackend.length === 0) {
-        setSearchResults([]);
-        return;
-      }
-
-      const processedResults = resultsFromBackend.map(result => ({
-        ...result,
-        id: result.id || createResultId(result),
-        perspective: result.perspective || 'neutral'
-      }));
-
-      console.log('App.jsx: Processed results with backend perspectives:', processedResults);
-      setSearchResults(processedResults);
-
     } catch (error) {
       console.error('App.jsx: Search error:', error);
       setHasSearchError(true);
@@ -131,6 +135,24 @@ function App() {
     }
   };
 
+  const handleLoadMore = async () => {
+    if (!nextCursor) return;
+    setIsLoadingMore(true);
+
+    try {
+      const currentAuthToken = authToken || localStorage.getItem('perspectiveEngineToken');
+      const backendResponse = await loadMoreAPI(nextCursor, currentAuthToken);
+      appendResults(backendResponse.results || []);
+      setNextCursor(backendResponse.next_cursor || null);
+    } catch (error) {
+      console.error('App.jsx: Load more error:', error);
+      setHasSearchError(true);
+      setSearchErrorMessage(error.message || 'Failed to load more results.');
+    } finally {
+      setIsLoadingMore(false);
+    }
+  };
+
   useEffect(() => {
     const storedProvider = localStorage.getItem('selectedAiProvider') || 'openai';
     const storedOpenaiKey = localStorage.getItem('openaiApiKey') || '';
@@ -305,6 +327,7 @@ function App() {
             handleSearch={handleSearch}
             isLoading={isLoading}
             isProcessing={isProcessing}
+            authToken={authToken || localStorage.getItem('perspectiveEngineToken')}
           />
           <EngineSelector 
             selectedEngines={selectedEngines} 
@@ -340,7 +363,7 @@ function App() {
         )}
 
         <div className="mt-6 max-w-5xl mx-auto grid gap-4 md:grid-cols-2 lg:grid-cols-3">
-          {!isLoading && !isProcessing && searchResults
+          {!isLoading && searchResults
             .filter(result => activeDisplayPerspective === 'all' || result.perspective === activeDisplayPerspective)
             .map((result) => (
               <SearchResultItem
@@ -355,6 +378,21 @@ function App() {
               />
             ))}
         </div>
+
+        {!isLoading && !isProcessing && nextCursor && searchResults.length > 0 && (
+          <div className="flex justify-center mt-6">
+            {isLoadingMore ? (
+              <Loader size="md" />
+            ) : (
+              <button
+                onClick={handleLoadMore}
+                className="px-4 py-2 bg-purple-600 hover:bg-purple-700 text-white rounded-md transition-colors"
+              >
+                Load more results
+              </button>
+            )}
+          </div>
+        )}
       </main>
       <Footer />
 
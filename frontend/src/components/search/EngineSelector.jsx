@@ -40,6 +40,18 @@ const EngineSelector = ({ selectedEngines, handleEngineChange }) => {
         />
         <span className="text-sm font-bold tracking-wide">DUCKDUCKGO</span>
       </label>
+      
+      <label className={`inline-flex items-center px-3 py-1.5 cursor-pointer border rounded-md ${
+        selectedEngines.local ? 'bg-purple-600 text-white border-purple-600' : 'bg-white text-gray-700 border-gray-300 hover:bg-gray-50'
+      }`}>
+        <input
+          type="checkbox"
+          checked={selectedEngines.local}
+          onChange={() => handleEngineChange('local')}
+          className="sr-only"
+        />
+        <span className="text-sm font-bold tracking-wide">LOCAL</span>
+      </label>
     </div>
   );
 };
@@ -1,7 +1,32 @@
-import React from 'react';
+import React, { useEffect, useState } from 'react';
 import { Search, Loader2 } from 'lucide-react';
+import { suggestAPI } from '../../services/api';
+
+const SUGGEST_MIN_CHARS = 2;
+const SUGGEST_DEBOUNCE_MS = 120;
+
+const SearchBar = ({ searchQuery, setSearchQuery, handleKeyDown, handleSearch, isLoading, isProcessing, authToken }) => {
+  const [suggestions, setSuggestions] = useState([]);
+
+  // Offer past queries as the user types; cached ones come back first and load instantly
+  useEffect(() => {
+    if (!authToken || !searchQuery || searchQuery.trim().length < SUGGEST_MIN_CHARS) {
+      setSuggestions([]);
+      return undefined;
+    }
+    let cancelled = false;
+    const timer = setTimeout(async () => {
+      const results = await suggestAPI(searchQuery, authToken);
+      if (!cancelled) {
+        setSuggestions(results);
+      }
+    }, SUGGEST_DEBOUNCE_MS);
+    return () => {
+      cancelled = true;
+      clearTimeout(timer);
+    };
+  }, [searchQuery, authToken]);
 
-const SearchBar = ({ searchQuery, setSearchQuery, handleKeyDown, handleSearch, isLoading, isProcessing }) => {
   return (
     <div className="flex flex-col gap-4">
       <div className="relative">
@@ -16,7 +41,14 @@ const SearchBar = ({ searchQuery, setSearchQuery, handleKeyDown, handleSearch, i
           onKeyDown={handleKeyDown}
           className="w-full p-4 pl-10 pr-16 rounded-md bg-white border border-gray-300 text-gray-900 placeholder-gray-500 focus:outline-none focus:ring-2 focus:ring-purple-500 focus:border-purple-500"
           spellCheck="false"
+          list="search-suggestions"
+          autoComplete="off"
         />
+        <datalist id="search-suggestions">
+          {suggestions.map((suggestion) => (
+            <option key={suggestion.query} value={suggestion.query} />
+          ))}
+        </datalist>
         <button
           onClick={handleSearch}
           disabled={isLoading || isProcessing}
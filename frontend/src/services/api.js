@@ -30,6 +30,103 @@ export const searchAPI = async (query, engines, perspective, serpApiKey, authTok
   }
 };
 
+// Fetch the next page of a search using the next_cursor from a previous response.
+// The cursor carries the query, engines and perspective, so only it is sent.
+export const loadMoreAPI = async (cursor, authToken) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/search`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(authToken ? { 'Authorization': `Bearer ${authToken}` } : {})
+      },
+      body: JSON.stringify({ cursor })
+    });
+
+    if (!response.ok) {
+      const errorData = await response.json();
+      throw new Error(errorData.error || 'Load more failed');
+    }
+
+    return await response.json();
+  } catch (error) {
+    console.error('Load more request failed:', error);
+    throw error;
+  }
+};
+
+// Past queries starting with prefix, those with cached results first.
+// Only signed-in users get suggestions. They are a nicety, so failures
+// (including a missing token) resolve to an empty list.
+export const suggestAPI = async (prefix, authToken, engines = ['google'], limit = 8) => {
+  if (!authToken) {
+    return [];
+  }
+  try {
+    const params = new URLSearchParams({ q: prefix, engines: engines.join(','), limit: String(limit) });
+    const response = await fetch(`${API_BASE_URL}/suggest?${params}`, {
+      headers: { 'Authorization': `Bearer ${authToken}` }
+    });
+    if (!response.ok) {
+      return [];
+    }
+    const data = await response.json();
+    return data.suggestions || [];
+  } catch (error) {
+    console.error('Suggest request failed:', error);
+    return [];
+  }
+};
+
+// Streaming variant of searchAPI. Calls onEvent for each NDJSON event as it arrives:
+// "engine" (scored results for one engine), "engine_timeout", "classification",
+// "error" and finally "done".
+export const searchStreamAPI = async (query, engines, perspective, serpApiKey, authToken, selectedAiProvider = 'openai', onEvent = () => {}) => {
+  try {
+    const response = await fetch(`${API_BASE_URL}/search/stream`, {
+      method: 'POST',
+      headers: {
+        'Content-Type': 'application/json',
+        ...(authToken ? { 'Authorization': `Bearer ${authToken}` } : {})
+      },
+      body: JSON.stringify({
+        query,
+        engines,
+        perspective,
+        serpapi_key: serpApiKey,
+        ai_provider: selectedAiProvider,
+        use_ai_classification: true
+      })
+    });
+
+    if (!response.ok) {
+      const errorData = await response.json();
+      throw new Error(errorData.error || 'Search failed');
+    }
+
+    const reader = response.body.getReader();
+    const decoder = new TextDecoder();
+    let buffer = '';
+
+    while (true) {
+      const { done, value } = await reader.read();
+      if (done) break;
+
+      buffer += decoder.decode(value, { stream: true });
+      const lines = buffer.split('\n');
+      buffer = lines.pop();
+      lines.filter(line => line.trim()).forEach(line => onEvent(JSON.parse(line)));
+    }
+
+    if (buffer.trim()) {
+      onEvent(JSON.parse(buffer));
+    }
+  } catch (error) {
+    console.error('Search stream request failed:', error);
+    throw error;
+  }
+};
+
 export const factCheckAPI = async (url, claim, aiProvider = 'openai', apiKey, authToken) => {
   try {
     const response = await fetch(`${API_BASE_URL}/fact-check`, {
@@ -0,0 +1,54 @@
+"""Shared search_history table.
+
+Revision ID: 3b9d6c2e41f7
+Revises: 8702fc7c78e9
+Create Date: 2026-10-18 09:12:00.000000
+
+"""
+from alembic import op
+import sqlalchemy as sa
+
+
+# revision identifiers, used by Alembic.
+revision = '3b9d6c2e41f7'
+down_revision = '8702fc7c78e9'
+branch_labels = None
+depends_on = None
+
+
+def upgrade():
+    # The table may already exist from db.create_all() with the older
+    # project_prism_app columns (user_id NOT NULL, no perspective)
+    inspector = sa.inspect(op.get_bind())
+    if not inspector.has_table('search_history'):
+        op.create_table('search_history',
+        sa.Column('id', sa.Integer(), nullable=False),
+        sa.Column('query', sa.String(length=500), nullable=False),
+        sa.Column('engines_used', sa.String(length=200), nullable=True),
+        sa.Column('perspective', sa.String(length=50), nullable=True),
+        sa.Column('results_count', sa.Integer(), nullable=True),
+        sa.Column('created_at', sa.DateTime(), nullable=True),
+        sa.Column('user_id', sa.Integer(), nullable=True),
+        sa.ForeignKeyConstraint(['user_id'], ['users.id'], ),
+        sa.PrimaryKeyConstraint('id')
+        )
+        op.create_index('ix_search_history_created_at', 'search_history', ['created_at'], unique=False)
+        return
+
+    columns = {column['name'] for column in inspector.get_columns('search_history')}
+    with op.batch_alter_table('search_history') as batch_op:
+        if 'perspective' not in columns:
+            batch_op.add_column(sa.Column('perspective', sa.String(length=50), nullable=True))
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=True)
+    indexes = {index['name'] for index in inspector.get_indexes('search_history')}
+    if 'ix_search_history_created_at' not in indexes:
+        op.create_index('ix_search_history_created_at', 'search_history', ['created_at'], unique=False)
+
+
+def downgrade():
+    # Anonymous searches have no user to fall back to, so they are dropped
+    op.execute('DELETE FROM search_history WHERE user_id IS NULL')
+    op.drop_index('ix_search_history_created_at', table_name='search_history')
+    with op.batch_alter_table('search_history') as batch_op:
+        batch_op.drop_column('perspective')
+        batch_op.alter_column('user_id', existing_type=sa.Integer(), nullable=False)
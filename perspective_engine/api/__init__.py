@@ -5,22 +5,30 @@ def setup_api(app):
     api = Api(app)
     
     # Import and register resources
-    from perspective_engine.api.search import SearchResource
+    from perspective_engine.api.search import SearchResource, SearchStreamResource, SearchStatsResource
     from perspective_engine.api.auth import GoogleAuthResource, GoogleCallbackResource
     from perspective_engine.api.classify import ClassifyResource
     from perspective_engine.api.summarize import SummarizeResource
     from perspective_engine.api.fact_check import FactCheckResource
     from perspective_engine.api.verify import VerifyTokenResource
+    from perspective_engine.api.suggest import SuggestResource
+    from perspective_engine.api.bulk import BulkSearchResource, BulkJobResource, BulkJobResultsResource
     from perspective_engine.api.user_settings import UserApiKeyResource
     
     # Register resources
     api.add_resource(SearchResource, '/search')
+    api.add_resource(SearchStreamResource, '/search/stream')
+    api.add_resource(SearchStatsResource, '/search/stats')
     api.add_resource(ClassifyResource, '/classify-perspectives')
     api.add_resource(SummarizeResource, '/summarize')
     api.add_resource(FactCheckResource, '/fact-check')
     api.add_resource(GoogleAuthResource, '/auth/google')
     api.add_resource(GoogleCallbackResource, '/auth/google/callback')
     api.add_resource(VerifyTokenResource, '/auth/verify')
+    api.add_resource(SuggestResource, '/suggest')
+    api.add_resource(BulkSearchResource, '/search/bulk')
+    api.add_resource(BulkJobResource, '/search/bulk/<string:job_id>')
+    api.add_resource(BulkJobResultsResource, '/search/bulk/<string:job_id>/results')
     api.add_resource(UserApiKeyResource, '/user/api-keys')
     
     # Add non-resource routes
@@ -0,0 +1,87 @@
+import os
+from flask import request, send_file
+from flask_restful import Resource
+from flask_jwt_extended import get_jwt_identity, jwt_required
+from perspective_engine.api.search import coalesced_search
+from perspective_engine.config.constants import BULK_JOB_MAX_QUERIES, BULK_JOB_MAX_ACTIVE_PER_USER
+from perspective_engine.services.api_key_service import get_user_api_key
+from perspective_engine.services.bulk_jobs import bulk_jobs
+
+class BulkSearchResource(Resource):
+    @jwt_required()
+    def post(self):
+        """
+        Queue a bulk search job and return its ID straight away
+
+        Signed-in users only, with at most BULK_JOB_MAX_ACTIVE_PER_USER jobs
+        queued or running each, since every query may spend server SerpAPI
+        quota.
+        """
+        data = request.get_json()
+        if not data:
+            return {"error": "Invalid JSON"}, 400
+        
+        queries = [" ".join(str(query).split()) for query in data.get('queries') or []]
+        queries = [query for query in queries if query]
+        if not queries:
+            return {"error": "At least one query is required"}, 400
+        if len(queries) > BULK_JOB_MAX_QUERIES:
+            return {"error": f"At most {BULK_JOB_MAX_QUERIES} queries per job"}, 400
+        
+        engines = data.get('engines', ['google'])
+        perspective = data.get('perspective', 'balanced')
+        user_id = get_jwt_identity()
+        api_key = get_user_api_key(user_id, "serpapi")
+        
+        job = bulk_jobs.submit(
+            queries, engines, perspective,
+            lambda query: coalesced_search(query, engines, perspective, api_key=api_key, user_id=user_id),
+            user_id
+        )
+        if job is None:
+            return {"error": f"At most {BULK_JOB_MAX_ACTIVE_PER_USER} bulk jobs may be queued or running at once"}, 429
+        return {
+            **job.to_dict(),
+            "status_url": f"/search/bulk/{job.id}",
+            "results_url": f"/search/bulk/{job.id}/results"
+        }, 202
+
+class BulkJobResource(Resource):
+    @jwt_required()
+    def get(self, job_id):
+        """Report a bulk job's progress"""
+        job = find_job(job_id)
+        if job is None:
+            return {"error": "Job not found"}, 404
+        return job.to_dict()
+    
+    @jwt_required()
+    def delete(self, job_id):
+        """Cancel a bulk job. Queries already searched stay in its results."""
+        job = find_job(job_id)
+        if job is None:
+            return {"error": "Job not found"}, 404
+        job.cancel()
+        return job.to_dict()
+
+class BulkJobResultsResource(Resource):
+    @jwt_required()
+    def get(self, job_id):
+        """Download a bulk job's results as JSONL, one line per finished query"""
+        job = find_job(job_id)
+        if job is None or not os.path.exists(job.output_path):
+            return {"error": "Job not found"}, 404
+        return send_file(
+            os.path.abspath(job.output_path),
+            mimetype='application/x-ndjson',
+            as_attachment=True,
+            download_name=f"bulk-search-{job.id}.jsonl",
+            max_age=0
+        )
+
+def find_job(job_id):
+    """Look up a job, hiding jobs that belong to another user"""
+    job = bulk_jobs.get(job_id)
+    if job is None or str(job.user_id) != str(get_jwt_identity()):
+        return None
+    return job
@@ -5,7 +5,9 @@ from flask_jwt_extended import jwt_required, get_jwt_identity, verify_jwt_in_req
 class ClassifyResource(Resource):
     def post(self):
         """Handle classification requests"""
-        from perspective_engine.services.ai_classification_service import classify_perspectives_with_ai
+        from perspective_engine.services.ai_classification_service import classify_perspectives_with_ai, classify_with_rules
+        from perspective_engine.services.fusion import classify_within_budget
+        from perspective_engine.services.deadline import request_deadline, run_stage
         
         # Try to get user ID from JWT token if available
         user_id = None
@@ -26,14 +28,29 @@ class ClassifyResource(Resource):
             return {'error': 'No results to classify'}, 400
         
         try:
-            # Classify results using AI
-            classified_results = classify_perspectives_with_ai(
-                results, 
-                ai_provider, 
-                user_id
+            deadline = request_deadline(data, "classify")
+        except ValueError as e:
+            return {'error': str(e)}, 400
+        
+        def classify_head(head):
+            # Rule-based labels stand in for AI ones that miss the deadline. The AI
+            # call gets copies, as it may still be running when the rules label head.
+            return run_stage(
+                deadline, "ai", classify_perspectives_with_ai, [dict(result) for result in head], ai_provider, user_id,
+                fallback=lambda: classify_with_rules(head)
             )
+        
+        def classify_tail(tail):
+            if deadline.expired:
+                deadline.cut("rules")
+                return tail
+            return classify_with_rules(tail)
+        
+        try:
+            # Classify the top results using AI, in the ranked order /search returned
+            classified_results = classify_within_budget(results, classify_head, classify_tail)
             
-            return {'results': classified_results}
+            return {'results': classified_results, **deadline.report()}
             
         except Exception as e:
             print(f"Classification error: {e}")
@@ -6,6 +6,8 @@ from openai import OpenAI
 import google.generativeai as genai
 import requests
 from bs4 import BeautifulSoup
+from perspective_engine.services.deadline import request_deadline, run_stage
+from perspective_engine.services.local_index import local_index
 
 class FactCheckResource(Resource):
     def post(self):
@@ -21,10 +23,15 @@ class FactCheckResource(Resource):
         if not url and not claim:
             return {"error": "URL or claim required"}, 400
         
+        try:
+            deadline = request_deadline(data, "fact_check")
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        
         # If URL is provided, try to fetch content
         if url and not claim:
             try:
-                content = fetch_content_from_url(url)
+                content = run_stage(deadline, "fetch", fetch_content_from_url, url)
                 if content:
                     claim = content
                 else:
@@ -33,32 +40,39 @@ class FactCheckResource(Resource):
                 print(f"Error fetching URL content: {e}")
                 claim = f"Content from URL: {url}"
         
-        # Get API key from environment variables
-        if ai_provider.lower() == 'openai':
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                try:
-                    return fact_check_with_openai(claim, api_key)
-                except Exception as e:
-                    print(f"OpenAI fact check error: {e}")
-        elif ai_provider.lower() == 'gemini':
-            api_key = os.getenv('GEMINI_API_KEY')
-            if api_key:
-                try:
-                    return fact_check_with_gemini(claim, api_key)
-                except Exception as e:
-                    print(f"Gemini fact check error: {e}")
-        
-        # If we get here, try OpenAI as fallback
-        openai_key = os.getenv('OPENAI_API_KEY')
-        if openai_key:
-            try:
-                return fact_check_with_openai(claim, openai_key)
-            except Exception as e:
-                print(f"OpenAI fallback error: {e}")
+        response = run_stage(deadline, "ai", fact_check_with_ai, claim, ai_provider)
         
         # Fallback response
-        return fallback_response(claim)
+        if response is None:
+            response = fallback_response(claim)
+        return {**response, **deadline.report()}
+
+def fact_check_with_ai(claim, ai_provider):
+    """Fact check with the requested provider, then OpenAI. Returns None if neither works."""
+    # Get API key from environment variables
+    if ai_provider.lower() == 'openai':
+        api_key = os.getenv('OPENAI_API_KEY')
+        if api_key:
+            try:
+                return fact_check_with_openai(claim, api_key)
+            except Exception as e:
+                print(f"OpenAI fact check error: {e}")
+    elif ai_provider.lower() == 'gemini':
+        api_key = os.getenv('GEMINI_API_KEY')
+        if api_key:
+            try:
+                return fact_check_with_gemini(claim, api_key)
+            except Exception as e:
+                print(f"Gemini fact check error: {e}")
+    
+    # If we get here, try OpenAI as fallback
+    openai_key = os.getenv('OPENAI_API_KEY')
+    if openai_key:
+        try:
+            return fact_check_with_openai(claim, openai_key)
+        except Exception as e:
+            print(f"OpenAI fallback error: {e}")
+    return None
 
 def fetch_content_from_url(url):
     """Fetch content from a URL"""
@@ -85,6 +99,8 @@ def fetch_content_from_url(url):
         # Drop blank lines
         text = '\n'.join(chunk for chunk in chunks if chunk)
         
+        local_index.add_page(url, text)
+        
         # Limit text length to avoid token limits
         return text[:5000]
     except Exception as e:
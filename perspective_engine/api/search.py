@@ -1,280 +1,395 @@
 from flask_restful import Resource
-from flask import request, jsonify
-import os
+from flask import request, jsonify, Response, stream_with_context
+from flask_jwt_extended import get_jwt_identity, verify_jwt_in_request
+import json
+import time
+from perspective_engine.services.circuit_breaker import serp_breakers
+from perspective_engine.config.constants import (
+    SEARCH_PAGE_SIZE, SEARCH_DEADLINE_SECONDS, LOCAL_ENGINE
+)
+from perspective_engine.services.pagination import decode_cursor, next_page_cursor
+from perspective_engine.services.deadline import Deadline, request_deadline, run_stage
+from perspective_engine.services.classification import source_type_memo
+from perspective_engine.services.credibility import score_results
+from perspective_engine.services.dedup import dedupe_results
+from perspective_engine.services.domain_reputation import domain_reputation
+from perspective_engine.services.fusion import classify_within_budget, fuse_results
+from perspective_engine.services.search_fanout import (
+    fetch_engines_concurrently, iter_engine_results, fanout_stats
+)
+from perspective_engine.services.hedging import hedge_budget
+from perspective_engine.services.latency import serp_latency
+from perspective_engine.services.serp_cache import serp_cache
+from perspective_engine.services.serp_key_pool import serp_key_pool
+from perspective_engine.services.api_key_service import get_user_api_key
+from perspective_engine.services.search_history import record_search, search_history_writer
+from perspective_engine.services.cache_warmer import cache_warmer
+from perspective_engine.services.bulk_jobs import bulk_jobs
+from perspective_engine.services.local_index import local_index
+from perspective_engine.services.search_service import fetch_results_via_serpapi, get_mock_results
+from perspective_engine.services.singleflight import SingleFlight
+
+# Identical searches that arrive while one is running share its result
+search_flight = SingleFlight()
+
+# error_info sent with sample results, so clients never take them for real ones
+MOCK_RESULTS_NOTICE = "No engine returned results; these are sample results"
 
 class SearchResource(Resource):
     def post(self):
         """Handle search requests"""
         data = request.get_json()
-        if not data:
-            return {"error": "Invalid JSON"}, 400
+        params, error = parse_search_request(data)
+        if error:
+            return error
+        try:
+            deadline = request_deadline(data, "search")
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        
+        # Try to get user ID from JWT token if available
+        user_id = None
+        try:
+            verify_jwt_in_request(optional=True)
+            user_id = get_jwt_identity()
+        except Exception:
+            pass
+        
+        api_key = get_user_api_key(user_id, "serpapi")
+        query, engines, perspective, max_staleness, page = params
+        response = coalesced_search(query, engines, perspective, max_staleness, page, api_key, user_id, deadline)
+        
+        # Only first pages count towards query popularity
+        if page is None:
+            record_search(query, engines, perspective, len(response.get("results", [])), user_id)
+        return response
+
+class SearchStreamResource(Resource):
+    def post(self):
+        """Handle search requests, streaming each engine's results as NDJSON as they arrive"""
+        data = request.get_json()
+        params, error = parse_search_request(data)
+        if error:
+            return error
+        try:
+            deadline = request_deadline(data, "search_stream")
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        
+        # Try to get user ID from JWT token if available
+        user_id = None
+        try:
+            verify_jwt_in_request(optional=True)
+            user_id = get_jwt_identity()
+        except Exception:
+            pass
         
+        ai_provider = data.get('ai_provider', 'openai') if data.get('use_ai_classification') else None
+        query, engines, perspective, max_staleness, _ = params
+        events = stream_search(query, engines, perspective, max_staleness, ai_provider, user_id, deadline)
+        return Response(stream_with_context(events), mimetype='application/x-ndjson')
+
+class SearchStatsResource(Resource):
+    def get(self):
+        """Report cache, coalescing, fan-out, hedging, latency, circuit breaker, key pool, warmer, search history, local index, classification memo, domain reputation and bulk job counters"""
+        return {
+            "serp_cache": serp_cache.stats(),
+            "search_coalescing": search_flight.stats(),
+            "search_fanout": fanout_stats(),
+            "hedging": hedge_budget.stats(),
+            "serp_latency": serp_latency.snapshot(),
+            "circuit_breakers": serp_breakers.stats(),
+            "serp_keys": serp_key_pool.stats(),
+            "cache_warmer": cache_warmer.stats(),
+            "search_history": search_history_writer.stats(),
+            "local_index": local_index.stats(),
+            "source_type_memo": source_type_memo.stats(),
+            "domain_reputation": domain_reputation.stats(),
+            "bulk_jobs": bulk_jobs.stats()
+        }
+
+def parse_search_request(data):
+    """
+    Validate a search request body
+
+    A request carrying a cursor from a previous response asks for the next
+    page; its query, engines and perspective come from the cursor.
+
+    Returns:
+        ((query, engines, perspective, max_staleness, page), None) on success,
+        or (None, (error_body, status_code)) on failure. page is the decoded
+        cursor, or None for a first page.
+    """
+    if not data:
+        return None, ({"error": "Invalid JSON"}, 400)
+    
+    page = None
+    if data.get('cursor'):
+        try:
+            page = decode_cursor(data['cursor'])
+        except ValueError as e:
+            return None, ({"error": str(e)}, 400)
+        query, engines, perspective = page['query'], page['engines'], page['perspective']
+    else:
         query = data.get('query')
         if not query:
-            return {"error": "Search query is required"}, 400
+            return None, ({"error": "Search query is required"}, 400)
             
         engines = data.get('engines', ['google'])
         perspective = data.get('perspective', 'balanced')
-        
-        try:
-            # Use hardcoded API key
-            api_key = os.getenv("SERPAPI_KEY")
-            
-            # Perform real search
-            print(f"Search API: Using real search for query '{query}'")
-            results = []
-            
-            for engine in engines:
-                engine_results = fetch_results_via_serpapi(query, engine, api_key)
-                if engine_results:
-                    results.extend(engine_results)
-            
-            # If no results, fall back to mock results
-            if not results:
-                print("No results from SerpAPI, using mock results")
-                results = get_mock_results(query)
-            
-            # Process results with enhanced classification
-            for result in results:
-                # Get URL and title for analysis
-                url = result.get('link', '').lower()
-                title = result.get('title', '').lower()
-                snippet = result.get('snippet', '').lower()
-                
-                # Initialize credibility factors
-                source_reputation = 0
-                evidence_quality = 0
-                bias_level = 0
-                transparency = 0
-                
-                # ===== SOURCE REPUTATION ANALYSIS =====
-                # Government and educational institutions (highest credibility)
-                if any(domain in url for domain in ['.gov', '.mil', '.edu', 'who.int', 'un.org', 'europa.eu', 'nih.gov', 'cdc.gov']):
-                    source_reputation = 9
-                    result['source_type_label'] = 'government'
-                
-                # Major news organizations with established fact-checking
-                elif any(domain in url for domain in ['reuters.com', 'apnews.com', 'bloomberg.com', 'economist.com']):
-                    source_reputation = 8
-                    result['source_type_label'] = 'news_media_mainstream'
-                
-                # Established mainstream news sources
-                elif any(domain in url for domain in ['nytimes.com', 'washingtonpost.com', 'wsj.com', 'bbc.', 
-                                                    'cnn.com', 'nbcnews.com', 'abcnews.go.com', 'cbsnews.com',
-                                                    'nypost.com', 'latimes.com', 'chicagotribune.com', 'bostonglobe.com',
-                                                    'usatoday.com', 'sfchronicle.com', 'dallasnews.com']):
-                    source_reputation = 7
-                    result['source_type_label'] = 'news_media_mainstream'
-                
-                # Other mainstream news sources
-                elif any(domain in url for domain in ['foxnews.com', 'msnbc.com', 'newsweek.com', 'time.com', 
-                                                    'theatlantic.com', 'politico.com', 'axios.com', 'vox.com',
-                                                    'huffpost.com', 'businessinsider.com', 'forbes.com']):
-                    source_reputation = 6
-                    result['source_type_label'] = 'news_media_mainstream'
-                
-                # Academic publishers and encyclopedias
-                elif any(domain in url for domain in ['nature.com', 'science.org', 'jstor.org', 'springer', 
-                                                    'wikipedia.org', 'britannica.com', 'scholarpedia.org']):
-                    source_reputation = 8
-                    result['source_type_label'] = 'encyclopedia'
-                
-                # Established blogs and opinion sites
-                elif any(domain in url for domain in ['medium.com', 'substack.com', 'wordpress.com', 'blogspot.com']):
-                    source_reputation = 4
-                    result['source_type_label'] = 'news_media_other_or_blog'
-                
-                # Social media platforms
-                elif any(domain in url for domain in ['facebook.com', 'twitter.com', 'instagram.com', 'tiktok.com', 
-                                                    'reddit.com', 'youtube.com', 'linkedin.com']):
-                    source_reputation = 3
-                    result['source_type_label'] = 'social_media_platform'
-                
-                # Alternative news sources
-                elif any(domain in url for domain in ['breitbart.com', 'infowars.com', 'dailycaller.com', 'thegatewaypundit.com',
-                                                    'motherjones.com', 'democracynow.org', 'counterpunch.org',
-                                                    'zerohedge.com', 'dailywire.com', 'theblaze.com', 'alternet.org']):
-                    source_reputation = 4
-                    result['source_type_label'] = 'news_media_other_or_blog'
-                
-                # Default for other websites
-                else:
-                    source_reputation = 5
-                    result['source_type_label'] = 'website_general'
-                
-                # ===== EVIDENCE QUALITY ASSESSMENT =====
-                # Look for indicators of evidence in snippet
-                evidence_indicators = ['according to', 'study', 'research', 'evidence', 'data', 'survey', 'report', 
-                                    'analysis', 'found that', 'statistics', 'experts say', 'published in']
-                evidence_count = sum(1 for indicator in evidence_indicators if indicator in snippet)
-                evidence_quality = min(8, evidence_count * 2 + 2)  # Base of 2, max of 8
-                
-                # ===== BIAS ASSESSMENT =====
-                # Check for emotional or biased language
-                bias_indicators = ['shocking', 'outrageous', 'scandal', 'hoax', 'conspiracy', 'truth', 'exposed', 
-                                'they don\'t want you to know', 'mainstream media won\'t tell you', 'wake up']
-                bias_count = sum(1 for indicator in bias_indicators if indicator in title.lower() or indicator in snippet.lower())
-                bias_level = max(0, 10 - bias_count * 2)  # Higher score means less bias
-                
-                # ===== TRANSPARENCY ASSESSMENT =====
-                # Higher for sources that typically provide clear authorship
-                if result['source_type_label'] in ['government', 'news_media_mainstream', 'encyclopedia']:
-                    transparency = 8
-                elif result['source_type_label'] in ['news_media_other_or_blog']:
-                    transparency = 5
-                else:
-                    transparency = 4
-                
-                # ===== CALCULATE OVERALL CREDIBILITY SCORE =====
-                # Weighted average of factors (out of 100)
-                credibility_score = int((
-                    (source_reputation * 4) +  # 40% weight
-                    (evidence_quality * 3) +   # 30% weight
-                    (bias_level * 2) +         # 20% weight
-                    (transparency * 1)         # 10% weight
-                ) * 10 / 10)  # Convert to 0-100 scale
-                
-                result['intrinsic_credibility_score'] = credibility_score
-                
-                # Assign credibility level
-                if credibility_score >= 75:
-                    result['source_credibility'] = 'high'
-                elif credibility_score >= 50:
-                    result['source_credibility'] = 'medium'
-                elif credibility_score >= 25:
-                    result['source_credibility'] = 'low'
-                else:
-                    result['source_credibility'] = 'unknown'
-                
-                # ===== PERSPECTIVE CLASSIFICATION =====
-                # IMPORTANT: Set perspective based on source type FIRST
-                if result['source_type_label'] == 'news_media_mainstream':
-                    # All mainstream news sources are classified as mainstream perspective
-                    result['perspective'] = 'mainstream'
-                
-                # Neutral: Factual, balanced, minimal bias (primarily encyclopedias and academic sources)
-                elif result['source_type_label'] in ['encyclopedia'] or (
-                    result['source_type_label'] == 'government' and 
-                    any(edu in url for edu in ['.edu', 'university', 'college', 'academic'])):
-                    result['perspective'] = 'neutral'
-                
-                # Government sources generally reflect mainstream perspective
-                elif result['source_type_label'] == 'government':
-                    result['perspective'] = 'mainstream'
-                
-                # Alternative: Divergent viewpoints, challenges consensus
-                elif (result['source_type_label'] in ['social_media_platform', 'news_media_other_or_blog'] or
-                     (bias_level <= 5) or
-                     any(term in title.lower() or term in snippet.lower() for term in 
-                         ['conspiracy', 'alternative', 'truth movement', 'cover-up', 'hidden', 'secret'])):
-                    result['perspective'] = 'alternative'
-                
-                # Default fallback - if we can't determine, use neutral
-                else:
-                    result['perspective'] = 'neutral'
-                
-                # Add detailed analysis data
-                result['credibility_factors'] = {
-                    'source_reputation': source_reputation,
-                    'evidence_quality': evidence_quality,
-                    'bias_level': bias_level,
-                    'transparency': transparency
-                }
-            
-            return {
-                "query": query,
-                "engines": engines,
-                "perspective": perspective,
-                "results": results
-            }
-            
-        except Exception as e:
-            print(f"Search error: {e}")
-            # Fall back to mock results
-            mock_results = get_mock_results(query)
-            
-            return {
-                "query": query,
-                "engines": engines,
-                "perspective": perspective,
-                "results": mock_results,
-                "error_info": str(e)
-            }
-
-def fetch_results_via_serpapi(query, engine_name, api_key, num_results=10):
-    """Fetch search results from SerpAPI"""
-    if not api_key:
-        print(f"No API key for {engine_name}")
-        return []
-        
-    params = {
-        "q": query,
-        "engine": engine_name.lower(),
-        "api_key": api_key,
-        "num": num_results,
-        "hl": "en",
-        "gl": "us"
-    }
     
-    print(f"SerpApi: Querying {engine_name} for '{query}' (num:{num_results})")
+    max_staleness = data.get('max_staleness_seconds')
+    if max_staleness is not None:
+        try:
+            max_staleness = max(0, int(max_staleness))
+        except (TypeError, ValueError):
+            return None, ({"error": "max_staleness_seconds must be an integer"}, 400)
     
+    return (query, engines, perspective, max_staleness, page), None
+
+def make_search_key(query, engines, perspective, max_staleness=None, page=None):
+    """Build a coalescing key from normalized search parameters"""
+    normalized_query = " ".join(query.lower().split())
+    normalized_engines = ",".join(engine.lower() for engine in dict.fromkeys(engines))
+    page_key = json.dumps([page["offsets"], sorted(page["seen_ids"])], sort_keys=True) if page else ""
+    return "|".join([normalized_query, normalized_engines, str(perspective).lower(), str(max_staleness), page_key])
+
+def coalesced_search(query, engines, perspective, max_staleness=None, page=None, api_key=None,
+                     user_id=None, deadline=None):
+    """run_search, sharing one run with identical searches already in flight"""
+    key = make_search_key(query, engines, perspective, max_staleness, page)
+    # Searches paid for by a user's own SerpAPI key are not shared with other users
+    if api_key:
+        key = f"{key}|user:{user_id}"
+    # Callers only share a search run under the same deadline
+    if deadline is not None and deadline.bounded:
+        key = f"{key}|deadline:{deadline.budget_ms}"
+    return search_flight.do(
+        key, lambda: run_search(query, engines, perspective, max_staleness, page, api_key, deadline)
+    )
+
+def run_search(query, engines, perspective, max_staleness=None, page=None, api_key=None, deadline=None):
+    """
+    Fetch, score and classify results for a search request
+
+    Args:
+        page: Decoded cursor when loading more results. Only the next SerpAPI
+            page is fetched for each engine, and links returned on earlier
+            pages are dropped before scoring.
+        api_key: The user's own SerpAPI key, used alongside the server key pool
+        deadline: The client's Deadline. Engines that have not answered by the
+            end of the "serp" share are left out, and if no time is left for
+            the "rules" share the page is returned unscored.
+
+    Sample results are returned, marked is_mock, only when every engine
+    answered a first page with nothing. A search whose engines timed out
+    returns the results it has, even none.
+    """
+    deadline = deadline or Deadline()
+    offsets = page["offsets"] if page else {engine: 0 for engine in engines}
+    seen_ids = set(page["seen_ids"]) if page else set()
     try:
-        from serpapi import SerpApiClient
-        s_client = SerpApiClient(params)
-        r_data = s_client.get_dict()
-        o_results = r_data.get("organic_results", [])
+        # Perform real search, querying all engines at once
+        print(f"Search API: Using real search for query '{query}'")
+        freshness = {}
+        fetched_counts = {}
+
+        def fetch_engine(q, engine):
+            engine_results, freshness[engine] = fetch_engine_page(
+                q, engine, api_key, offsets[engine], max_staleness
+            )
+            fetched_counts[engine] = len(engine_results)
+            return ranked(engine_results, offsets[engine])
+
+        page_engines = [engine for engine in engines if engine in offsets]
+        results, timed_out_engines = fetch_engines_concurrently(
+            query, page_engines, fetch_engine, min(SEARCH_DEADLINE_SECONDS, deadline.stage("serp"))
+        )
+        if timed_out_engines:
+            deadline.cut("serp")
         
-        if not o_results:
-            print(f"SerpApi: No organic_results for '{query}' on {engine_name}. Response: {r_data.get('error', 'Unknown')}")
-            return []
+        # Merge copies of the same page across engines and drop anything
+        # already returned on an earlier page, then rank across engines
+        results = fuse_results(dedupe_results(results, seen_ids))
+
+        # Sample results stand in only when every engine answered with
+        # nothing; a search cut short by its deadline returns what it has
+        is_mock = not results and not page and not timed_out_engines
+        if is_mock:
+            print("No results from SerpAPI, using mock results")
+            results = dedupe_results(get_mock_results(query))
+
+        # Score the whole page at once, unless the "rules" share is already spent
+        if deadline.stage("rules") <= 0:
+            deadline.cut("rules")
+        else:
+            score_results(results)
+        if not is_mock:
+            local_index.add_results(results)
+
+        response = {
+            "query": query,
+            "engines": engines,
+            "perspective": perspective,
+            "results": [result.to_dict() for result in results],
+            "freshness": freshness,
+            "next_cursor": next_page_cursor(
+                query, engines, perspective, offsets, fetched_counts, timed_out_engines,
+                (page["seen_ids"] if page else []) + [result.content_id for result in results], SEARCH_PAGE_SIZE
+            )
+        }
+        if timed_out_engines:
+            response["timed_out_engines"] = timed_out_engines
+        if is_mock:
+            response["is_mock"] = True
+            response["error_info"] = MOCK_RESULTS_NOTICE
+        response.update(deadline.report())
+        return response
+
+    except Exception as e:
+        print(f"Search error: {e}")
+        # Fall back to mock results
+        mock_results = get_mock_results(query)
+
+        return {
+            "query": query,
+            "engines": engines,
+            "perspective": perspective,
+            "results": mock_results,
+            "is_mock": True,
+            "error_info": str(e)
+        }
+
+def stream_search(query, engines, perspective, max_staleness=None, ai_provider=None, user_id=None, deadline=None):
+    """
+    Run a search and yield NDJSON events as work completes
+
+    Under a client deadline, engines still running at the end of the "serp"
+    share time out, results arriving after the whole deadline are sent
+    unscored, and AI labels not ready by the end of the "ai" share are skipped.
+
+    Events, in order:
+        engine / engine_timeout - one per engine, with scored results, as each answers
+        classification - AI perspective labels for the top ranked results, when
+                         ai_provider is set and the labels are ready in time
+        done - summary once everything has been sent, with a next_cursor
+               that /search accepts to load more results
+    """
+    deadline = deadline or Deadline()
+    api_key = get_user_api_key(user_id, "serpapi")
+    freshness = {}
+    fetched_counts = {}
+    timed_out_engines = []
+    seen_ids = set()
+    all_results = []
+
+    def fetch_engine(q, engine):
+        engine_results, freshness[engine] = fetch_engine_page(q, engine, api_key, 0, max_staleness)
+        fetched_counts[engine] = len(engine_results)
+        return ranked(engine_results)
+
+    print(f"Search stream: Streaming results for query '{query}'")
+    try:
+        serp_seconds = min(SEARCH_DEADLINE_SECONDS, deadline.stage("serp"))
+        for engine, engine_results in iter_engine_results(query, engines, fetch_engine, serp_seconds):
+            if engine_results is None:
+                timed_out_engines.append(engine)
+                deadline.cut("serp")
+                yield to_ndjson({"event": "engine_timeout", "engine": engine})
+                continue
             
-        p_results = [{
-            "title": i.get("title", "No title"),
-            "link": i.get("link"),
-            "snippet": i.get("snippet", "No snippet."),
-            "source_engine": engine_name.capitalize()
-        } for i in o_results if i.get("link")]
+            # Copies of results already sent for an earlier engine are dropped
+            engine_results = dedupe_results(engine_results, seen_ids)
+            if deadline.expired:
+                deadline.cut("rules")
+            else:
+                score_results(engine_results)
+            local_index.add_results(engine_results)
+            all_results.extend(engine_results)
+            yield to_ndjson({
+                "event": "engine",
+                "engine": engine,
+                "freshness": freshness.get(engine),
+                "results": [result.to_dict() for result in engine_results]
+            })
         
-        print(f"SerpApi: Found {len(p_results)} results for {engine_name}")
-        return p_results
+        # Sample results stand in only when every engine answered with nothing
+        if not all_results and not timed_out_engines:
+            print("No results from SerpAPI, using mock results")
+            all_results = score_results(dedupe_results(get_mock_results(query)))
+            yield to_ndjson({
+                "event": "engine",
+                "engine": "mock",
+                "is_mock": True,
+                "error_info": MOCK_RESULTS_NOTICE,
+                "results": [result.to_dict() for result in all_results]
+            })
         
+        if ai_provider:
+            from perspective_engine.services.ai_classification_service import classify_perspectives_with_ai
+            
+            # Only the top ranked results go to the LLM; the rest keep the
+            # rule-based perspective already sent with their engine
+            ranked = [{
+                "title": result.get("title"),
+                "link": result.get("link"),
+                "snippet": result.get("snippet")
+            } for result in fuse_results(all_results)]
+            classified = classify_within_budget(
+                ranked,
+                lambda head: run_stage(deadline, "ai", classify_perspectives_with_ai, head, ai_provider, user_id) or [],
+                lambda tail: []
+            )
+            if classified:
+                local_index.add_results(classified)
+                yield to_ndjson({
+                    "event": "classification",
+                    "ai_provider": ai_provider,
+                    "results": [{
+                        "link": result.get("link"),
+                        "perspective": result.get("perspective")
+                    } for result in classified if isinstance(result, dict)]
+                })
+            
     except Exception as e:
-        print(f"SerpApi: Error {engine_name}: {type(e).__name__} - {e}")
-        return []
-
-def get_mock_results(query):
-    """Return mock results for testing"""
-    print(f"Generating mock results for query: {query}")
+        print(f"Search stream error: {e}")
+        yield to_ndjson({"event": "error", "error_info": str(e)})
     
-    return [
-        {
-            "title": f"COVID-19: What You Need to Know About {query}",
-            "link": "https://www.cdc.gov/coronavirus/2019-ncov/index.html",
-            "snippet": "Learn about COVID-19, including symptoms, complications, how it spreads, prevention, treatment, and more from the Centers for Disease Control.",
-            "source_engine": "Google"
-        },
-        {
-            "title": f"Latest Research on {query} and Vaccines",
-            "link": "https://www.nih.gov/coronavirus",
-            "snippet": "The National Institutes of Health provides the latest research and clinical trials related to COVID-19 vaccines and treatments.",
-            "source_engine": "Google"
-        },
-        {
-            "title": f"The Truth About {query} That Mainstream Media Won't Tell You",
-            "link": "https://alternative-health-news.com/covid-truth",
-            "snippet": "Discover the hidden facts about COVID-19 that government agencies and mainstream media are keeping from the public.",
-            "source_engine": "Bing"
-        },
-        {
-            "title": f"{query} - Wikipedia",
-            "link": "https://en.wikipedia.org/wiki/COVID-19",
-            "snippet": "Coronavirus disease 2019 (COVID-19) is a contagious disease caused by the virus SARS-CoV-2. The first known case was identified in Wuhan, China, in December 2019.",
-            "source_engine": "Google"
-        },
-        {
-            "title": f"World Health Organization: {query} Pandemic",
-            "link": "https://www.who.int/emergencies/diseases/novel-coronavirus-2019",
-            "snippet": "WHO is working with global experts, governments and partners to track the pandemic, advise on critical interventions and distribute vital medical supplies.",
-            "source_engine": "Bing"
-        }
-    ]
+    record_search(query, engines, perspective, len(all_results), user_id)
+    yield to_ndjson({
+        "event": "done",
+        "query": query,
+        "engines": engines,
+        "perspective": perspective,
+        "total_results": len(all_results),
+        "next_cursor": next_page_cursor(
+            query, engines, perspective, {engine: 0 for engine in engines},
+            fetched_counts, timed_out_engines, [result.content_id for result in all_results], SEARCH_PAGE_SIZE
+        ),
+        **deadline.report()
+    })
+
+def fetch_engine_page(query, engine, api_key, start, max_staleness=None):
+    """
+    Fetch one page of one engine's results with its freshness
+
+    The "local" engine is answered from the local full-text index, with no
+    SerpAPI call.
+    """
+    if engine.lower() == LOCAL_ENGINE:
+        return local_index.search(query, SEARCH_PAGE_SIZE, start), {"status": "local", "age_seconds": 0}
+    return fetch_results_via_serpapi.with_freshness(
+        query, engine, api_key, SEARCH_PAGE_SIZE, start, max_staleness=max_staleness
+    )
+
+def ranked(engine_results, offset=0):
+    """Copy one engine's results, recording each one's rank on that engine"""
+    return [{**result, "position": offset + index + 1} for index, result in enumerate(engine_results)]
+
+def to_ndjson(event):
+    """Serialize one streaming event as a line of JSON"""
+    return json.dumps(event) + "\n"
+
+def score_search_result(result):
+    """Add source type, credibility score and perspective to a single result"""
+    return score_results([result])[0]
@@ -0,0 +1,52 @@
+import time
+from flask import request
+from flask_restful import Resource
+from flask_jwt_extended import jwt_required
+from perspective_engine.config.constants import SEARCH_PAGE_SIZE, SUGGEST_TOP_K
+from perspective_engine.services.serp_cache import serp_cache, make_cache_key
+from perspective_engine.services.suggest import query_suggester
+
+class SuggestResource(Resource):
+    @jwt_required()
+    def get(self):
+        """
+        Suggest past queries starting with ?q=, listing those with cached results first
+
+        Signed-in users only, and only queries that SUGGEST_MIN_DISTINCT_USERS
+        different users have searched for.
+        """
+        started = time.perf_counter()
+        prefix = request.args.get('q', '')
+        try:
+            limit = max(1, min(int(request.args.get('limit', 8)), SUGGEST_TOP_K))
+        except ValueError:
+            return {"error": "limit must be a number"}, 400
+        engines = [engine for engine in request.args.get('engines', 'google').lower().split(',') if engine]
+
+        queries = query_suggester.suggest(prefix)
+        cached = cached_queries(queries, engines)
+        suggestions = [{"query": query, "cached": query in cached} for query in queries]
+        # Steer people towards queries that will be answered from the cache
+        suggestions.sort(key=lambda suggestion: not suggestion["cached"])
+
+        return {
+            "prefix": prefix,
+            "suggestions": suggestions[:limit],
+            "took_ms": round((time.perf_counter() - started) * 1000, 3)
+        }
+
+def cached_queries(queries, engines):
+    """
+    The queries for which every engine has an unexpired first page in the
+    SERP cache's memory tier
+
+    Runs on every keystroke, so it looks at the memory tier only, taking the
+    cache lock once. A query whose page is only on disk is reported as not
+    cached.
+    """
+    keys = {(query, engine): make_cache_key(query, engine, SEARCH_PAGE_SIZE) for query in queries for engine in engines}
+    ages = serp_cache.memory_ages(keys.values())
+    return {
+        query for query in queries
+        if all(ages.get(keys[query, engine], float("inf")) < serp_cache.ttl_for(engine) for engine in engines)
+    }
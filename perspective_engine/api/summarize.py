@@ -6,6 +6,8 @@ from openai import OpenAI
 import google.generativeai as genai
 import requests
 from bs4 import BeautifulSoup
+from perspective_engine.services.deadline import request_deadline, run_stage
+from perspective_engine.services.local_index import local_index
 
 class SummarizeResource(Resource):
     def post(self):
@@ -21,10 +23,15 @@ class SummarizeResource(Resource):
         if not url and not text:
             return {"error": "URL or text required"}, 400
         
+        try:
+            deadline = request_deadline(data, "summarize")
+        except ValueError as e:
+            return {"error": str(e)}, 400
+        
         # If URL is provided, try to fetch content
         if url and not text:
             try:
-                text = fetch_content_from_url(url)
+                text = run_stage(deadline, "fetch", fetch_content_from_url, url)
                 if not text:
                     text = f"Content from URL: {url}"
             except Exception as e:
@@ -33,32 +40,39 @@ class SummarizeResource(Resource):
         
         content_to_summarize = text
         
-        # Get API key from environment variables
-        if ai_provider.lower() == 'openai':
-            api_key = os.getenv('OPENAI_API_KEY')
-            if api_key:
-                try:
-                    return summarize_with_openai(content_to_summarize, api_key)
-                except Exception as e:
-                    print(f"OpenAI summarize error: {e}")
-        elif ai_provider.lower() == 'gemini':
-            api_key = os.getenv('GEMINI_API_KEY')
-            if api_key:
-                try:
-                    return summarize_with_gemini(content_to_summarize, api_key)
-                except Exception as e:
-                    print(f"Gemini summarize error: {e}")
+        response = run_stage(deadline, "ai", summarize_with_ai, content_to_summarize, ai_provider)
         
-        # If we get here, try OpenAI as fallback
-        openai_key = os.getenv('OPENAI_API_KEY')
-        if openai_key:
+        # Fallback response
+        if response is None:
+            response = fallback_response(content_to_summarize)
+        return {**response, **deadline.report()}
+
+def summarize_with_ai(content_to_summarize, ai_provider):
+    """Summarize with the requested provider, then OpenAI. Returns None if neither works."""
+    # Get API key from environment variables
+    if ai_provider.lower() == 'openai':
+        api_key = os.getenv('OPENAI_API_KEY')
+        if api_key:
             try:
-                return summarize_with_openai(content_to_summarize, openai_key)
+                return summarize_with_openai(content_to_summarize, api_key)
             except Exception as e:
-                print(f"OpenAI fallback error: {e}")
-        
-        # Fallback response
-        return fallback_response(content_to_summarize)
+                print(f"OpenAI summarize error: {e}")
+    elif ai_provider.lower() == 'gemini':
+        api_key = os.getenv('GEMINI_API_KEY')
+        if api_key:
+            try:
+                return summarize_with_gemini(content_to_summarize, api_key)
+            except Exception as e:
+                print(f"Gemini summarize error: {e}")
+    
+    # If we get here, try OpenAI as fallback
+    openai_key = os.getenv('OPENAI_API_KEY')
+    if openai_key:
+        try:
+            return summarize_with_openai(content_to_summarize, openai_key)
+        except Exception as e:
+            print(f"OpenAI fallback error: {e}")
+    return None
 
 def fetch_content_from_url(url):
     """Fetch content from a URL"""
@@ -85,6 +99,8 @@ def fetch_content_from_url(url):
         # Drop blank lines
         text = '\n'.join(chunk for chunk in chunks if chunk)
         
+        local_index.add_page(url, text)
+        
         # Limit text length to avoid token limits
         return text[:5000]
     except Exception as e:
@@ -1,6 +1,6 @@
 from flask import Flask, request, session, url_for, jsonify
 from perspective_engine.api import setup_api
-from perspective_engine.config.constants import DEFAULT_PORT, DEFAULT_HOST
+from perspective_engine.config.constants import DEFAULT_PORT, DEFAULT_HOST, CACHE_WARMER_ENABLED
 import os
 from flask_cors import CORS
 
@@ -189,8 +189,24 @@ def create_app():
     # Import models and create database tables
     with app.app_context():
         # Import models to register them with SQLAlchemy
-        from perspective_engine.models import User, UserApiKey
+        from perspective_engine.models import User, UserApiKey, SearchHistory
         db.create_all()
+        
+        # Build the /suggest trie from past searches
+        from perspective_engine.services.suggest import query_suggester
+        try:
+            print(f"Suggest: Indexed {query_suggester.load_history()} past queries")
+        except Exception as e:
+            print(f"Suggest: Could not load search history: {e}")
+    
+    # Save searches to SearchHistory off the request path
+    from perspective_engine.services.search_history import search_history_writer
+    search_history_writer.start(app)
+    
+    # Keep popular queries from SearchHistory warm in the SERP cache
+    if CACHE_WARMER_ENABLED:
+        from perspective_engine.services.cache_warmer import cache_warmer
+        cache_warmer.start(app)
     
     return app
 
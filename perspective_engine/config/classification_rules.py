@@ -0,0 +1,214 @@
+from perspective_engine.config.constants import (
+    KNOWN_SOCIAL_MEDIA_PLATFORMS, KNOWN_MAINSTREAM_NEWS_DOMAINS,
+    KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES, ALTERNATIVE_KEYWORDS
+)
+
+# Rule tables for the rule-based classifiers, compiled by
+# perspective_engine.services.rules_engine at startup.
+#
+# Rules are tried in order and the first rule whose conditions all hold gives
+# the label. A condition is "<field>_<test>": a list of strings, any one of
+# which may match:
+#   contains   the field contains one of the strings
+#   excludes   the field contains none of them
+#   prefixes   the field starts with one of them
+#   suffixes   the field ends with one of them (TLD classes)
+#   in         the field equals one of them
+#   not_in     the field equals none of them
+# "domains" holds when the host's most specific known domain (the host or a
+# parent down to its registrable domain) is one of the listed domains.
+
+YOUTUBE_DOMAINS = ["youtube.com", "youtu.be"]
+MEDIUM_DOMAINS = ["medium.com"]
+BLOG_PLATFORM_DOMAINS = ["substack.com", "wordpress.com", "blogspot.com"]
+INTERGOVERNMENTAL_DOMAINS = ["who.int", "un.org", "europa.eu"]
+ENCYCLOPEDIA_DOMAINS = ["wikipedia.org", "britannica.com", "scholarpedia.org"]
+ALTERNATIVE_NEWS_DOMAINS = [
+    "breitbart.com", "infowars.com", "dailycaller.com", "thegatewaypundit.com", "motherjones.com",
+    "democracynow.org", "counterpunch.org", "zerohedge.com", "dailywire.com", "theblaze.com",
+    "alternet.org"
+]
+
+# Medium paths whose first segment is a site section, not a publication
+MEDIUM_SITE_SECTIONS = [
+    "search", "tag", "topic", "collections", "about", "jobs", "policy", "help",
+    "settings", "explore", "me", "new-story"
+]
+
+GENERIC_TLD_MARKERS = [
+    ".com", ".net", ".biz", ".info", ".org", ".co", ".io", ".app", ".site", ".online",
+    ".me", ".tv", ".news", ".blog", ".press", ".report"
+]
+
+# Fields: host (lower case, without www.), path (lower case) and segment,
+# the first path segment
+SOURCE_TYPE_RULES = [
+    # Government or educational
+    {"label": "government", "host_suffixes": [".gov", ".mil"]},
+    {"label": "government", "host_contains": [".gov.", ".mil."]},
+    {"label": "government", "domains": INTERGOVERNMENTAL_DOMAINS},
+    {"label": "academic_institution", "host_suffixes": [".edu"]},
+
+    # Encyclopedia
+    {"label": "encyclopedia", "domains": ENCYCLOPEDIA_DOMAINS},
+
+    # Social media
+    {"label": "social_media_channel_creator", "domains": YOUTUBE_DOMAINS,
+     "path_contains": ["/channel/", "/c/", "/user/"]},
+    {"label": "social_media_channel_creator", "domains": YOUTUBE_DOMAINS, "path_prefixes": ["/@"]},
+    {"label": "social_media_platform_video", "domains": YOUTUBE_DOMAINS},
+    {"label": "social_blogging_platform_user_pub", "domains": MEDIUM_DOMAINS, "segment_prefixes": ["@"]},
+    # A plain publication name; "" means the path has no first segment
+    {"label": "social_blogging_platform_user_pub", "domains": MEDIUM_DOMAINS,
+     "segment_not_in": [""] + MEDIUM_SITE_SECTIONS, "segment_excludes": ["."]},
+    {"label": "social_blogging_platform", "domains": MEDIUM_DOMAINS + BLOG_PLATFORM_DOMAINS},
+    {"label": "social_media_platform", "domains": KNOWN_SOCIAL_MEDIA_PLATFORMS},
+
+    # Academic publishers
+    {"label": "research_publication", "domains": KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES},
+
+    # News media
+    {"label": "news_opinion_blog_live", "domains": KNOWN_MAINSTREAM_NEWS_DOMAINS,
+     "path_contains": ["/blog", "/opinion", "/contributor", "/live/"]},
+    {"label": "news_media_mainstream", "domains": KNOWN_MAINSTREAM_NEWS_DOMAINS},
+    {"label": "news_media_alternative", "domains": ALTERNATIVE_NEWS_DOMAINS},
+
+    # Non-profits and NGOs
+    {"label": "ngo_nonprofit_publication", "host_suffixes": [".org"],
+     "path_contains": ["/blog", "/news", "/press", "/report", "/briefing", "/article", "/story"]},
+    {"label": "ngo_nonprofit_organization", "host_suffixes": [".org"],
+     "host_contains": ["foundation", "institute", "society", "association", "charity", "trust",
+                       "fund", "council", "union"]},
+    {"label": "ngo_nonprofit_general", "host_suffixes": [".org"]},
+
+    # Corporate blogs (known news domains were labelled above)
+    {"label": "corporate_blog_pr_info",
+     "path_contains": ["/blog", "/press-release", "/newsroom", "/insights", "/pr/", "/investors",
+                       "/company/about", "/about-us", "/corporate"]},
+
+    # Other news or blogs
+    {"label": "news_media_other_or_blog", "path_contains": ["/news/", "/article/", "/story/", "/post/", "/views/"],
+     "host_contains": [".com", ".net", ".info", ".co", ".online", ".io", ".news", ".press", ".report", ".blog"]},
+
+    # General websites
+    {"label": "website_general", "host_contains": GENERIC_TLD_MARKERS}
+]
+SOURCE_TYPE_DEFAULT = "unknown_other"
+# Labels that only say a host is some website; the domain reputation
+# database's source type replaces them (and any path-based label before them)
+GENERIC_SOURCE_TYPES = ["website_general", SOURCE_TYPE_DEFAULT]
+
+# Fields: url and title, both lower case
+ALTERNATIVE_TITLE_PHRASES = [
+    "what they aren't telling you", "the truth about", "what doctors won't say",
+    "doctors are silent", "big-pharma agenda", "media won't show you",
+    "the untold story of", "hidden agenda", "the great awakening", "red pill"
+]
+
+PERSPECTIVE_RULES = [
+    # Government, educational, or major health organizations
+    {"label": "mainstream", "url_contains": [".gov", ".edu", "who.int", "cdc.gov", "nih.gov", ".un.org"]},
+
+    # Major news outlets
+    {"label": "mainstream", "url_contains": [
+        "bbc.", "cnn.", "nytimes.", "washingtonpost.", "reuters.", "apnews.",
+        "nbcnews.", "abcnews.", "cbsnews.", "theguardian.", "wsj.", "economist.",
+        "npr.org", "pbs.org", "usatoday.", "bloomberg.", "forbes.", "politico.", "axios."
+    ]},
+
+    # Reference sites
+    {"label": "neutral", "url_contains": ["wikipedia.org", "britannica.com", "snopes.com", "factcheck.org"]},
+
+    # Alternative keywords
+    {"label": "alternative", "url_contains": ALTERNATIVE_KEYWORDS},
+    {"label": "alternative", "title_contains": ALTERNATIVE_KEYWORDS},
+
+    # Academic journals, unless the title flags a dispute
+    {"label": "mainstream", "url_contains": [
+        "nature.com", "science.org", "nejm.org", "bmj.com", "thelancet.com",
+        "cell.com", "pubmed", "sciencedirect", "springer", "wiley", "oxfordjournals.org",
+        "jamanetwork.com", "arxiv.org", "plos.org", "frontiersin.org"
+    ], "title_excludes": ["controversial", "disputed", "alternative view"]},
+
+    # Alternative title phrases
+    {"label": "alternative", "title_contains": ALTERNATIVE_TITLE_PHRASES},
+
+    # Mainstream patterns (titles with alternative keywords or phrases matched above)
+    {"label": "mainstream", "title_contains": [
+        "official", "report", "study", "research", "analysis", "guidelines", "statement from",
+        "university study", "government report"
+    ]}
+]
+PERSPECTIVE_DEFAULT = "neutral"
+
+# Credibility scoring (perspective_engine.services.credibility). Results take
+# their source type from SOURCE_TYPE_RULES; the tiers below only set the
+# source reputation, and unlike the rules match anywhere in the lower-cased URL.
+# (source reputation 0-10, URL substrings), first match wins
+SOURCE_REPUTATION_TIERS = [
+    # Government and educational institutions
+    (9, [".gov", ".mil", ".edu", "who.int", "un.org", "europa.eu", "nih.gov", "cdc.gov"]),
+    # Major news organizations with established fact-checking
+    (8, ["reuters.com", "apnews.com", "bloomberg.com", "economist.com"]),
+    # Established mainstream news sources
+    (7, [
+        "nytimes.com", "washingtonpost.com", "wsj.com", "bbc.", "cnn.com", "nbcnews.com",
+        "abcnews.go.com", "cbsnews.com", "nypost.com", "latimes.com", "chicagotribune.com",
+        "bostonglobe.com", "usatoday.com", "sfchronicle.com", "dallasnews.com"
+    ]),
+    # Other mainstream news sources
+    (6, [
+        "foxnews.com", "msnbc.com", "newsweek.com", "time.com", "theatlantic.com", "politico.com",
+        "axios.com", "vox.com", "huffpost.com", "businessinsider.com", "forbes.com"
+    ]),
+    # Academic publishers and encyclopedias
+    (8, [
+        "nature.com", "science.org", "jstor.org", "springer", "wikipedia.org", "britannica.com",
+        "scholarpedia.org"
+    ]),
+    # Established blogs and opinion sites
+    (4, ["medium.com", "substack.com", "wordpress.com", "blogspot.com"]),
+    # Social media platforms
+    (3, [
+        "facebook.com", "twitter.com", "instagram.com", "tiktok.com", "reddit.com", "youtube.com",
+        "linkedin.com"
+    ]),
+    # Alternative news sources
+    (4, ALTERNATIVE_NEWS_DOMAINS)
+]
+SOURCE_REPUTATION_DEFAULT = 5
+
+# Transparency 0-10 by source type: higher where authorship is usually clear
+SOURCE_TRANSPARENCY = {
+    "government": 8, "academic_institution": 8, "research_publication": 8, "encyclopedia": 8,
+    "news_media_mainstream": 8, "news_opinion_blog_live": 8, "news_media_alternative": 5,
+    "social_blogging_platform": 5, "social_blogging_platform_user_pub": 5
+}
+SOURCE_TRANSPARENCY_DEFAULT = 4
+
+# Perspective by source type. Government sources are mainstream unless their
+# URL looks academic; other types are neutral unless the text is biased or
+# uses alternative terms. Only types the rules give from a known domain are
+# listed: news_media_other_or_blog, from the path alone, stays neutral.
+MAINSTREAM_SOURCE_TYPES = ["news_media_mainstream", "news_opinion_blog_live"]
+NEUTRAL_SOURCE_TYPES = ["encyclopedia", "research_publication", "academic_institution"]
+ALTERNATIVE_SOURCE_TYPES = [
+    "social_media_platform", "social_media_platform_video", "social_media_channel_creator",
+    "social_blogging_platform", "social_blogging_platform_user_pub", "news_media_alternative"
+]
+
+# Government URLs with these are academic, so neutral rather than mainstream
+ACADEMIC_URL_MARKERS = [".edu", "university", "college", "academic"]
+
+# Evidence is counted in the snippet, bias and alternative terms in the title and snippet
+CREDIBILITY_KEYWORDS = {
+    "evidence_indicators": [
+        "according to", "study", "research", "evidence", "data", "survey", "report", "analysis",
+        "found that", "statistics", "experts say", "published in"
+    ],
+    "bias_indicators": [
+        "shocking", "outrageous", "scandal", "hoax", "conspiracy", "truth", "exposed",
+        "they don't want you to know", "mainstream media won't tell you", "wake up"
+    ],
+    "alternative_terms": ["conspiracy", "alternative", "truth movement", "cover-up", "hidden", "secret"]
+}
@@ -1,3 +1,5 @@
+import os
+
 # Domain lists for classification
 KNOWN_SOCIAL_MEDIA_PLATFORMS = [
     "x.com", "twitter.com", "instagram.com", "tiktok.com", "youtube.com", 
@@ -11,16 +13,36 @@ KNOWN_MAINSTREAM_NEWS_DOMAINS = [
     "abcnews.go.com", "cbsnews.com", "nbcnews.com", "foxnews.com", 
     "usatoday.com", "bloomberg.com", "forbes.com", "news.google.com", 
     "cnbc.com", "politico.com", "axios.com", "theatlantic.com", 
-    "newyorker.com", "time.com", "latimes.com", "chicagotribune.com", "chron.com"
+    "newyorker.com", "time.com", "latimes.com", "chicagotribune.com", "chron.com",
+    "economist.com", "bbc.co.uk", "nypost.com", "bostonglobe.com", "sfchronicle.com",
+    "dallasnews.com", "msnbc.com", "newsweek.com", "vox.com", "huffpost.com", "businessinsider.com"
 ]
 
 KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES = [
     "arxiv.org", "pubmed.ncbi.nlm.nih.gov", "nature.com", "sciencemag.org", 
     "jamanetwork.com", "thelancet.com", "ieee.org", "acm.org", "springer.com", 
     "elsevier.com", "wiley.com", "sagepub.com", "jstor.org", "plos.org", 
-    "frontiersin.org", "bmj.com", "cell.com"
+    "frontiersin.org", "bmj.com", "cell.com", "science.org"
 ]
 
+# Optional copy of the Public Suffix List (public_suffix_list.dat) for finding
+# registrable domains; a built-in list of common suffixes is used without it
+PUBLIC_SUFFIX_LIST_PATH = os.getenv("PUBLIC_SUFFIX_LIST_PATH", "")
+
+# Domain reputation database: a compiled, memory-mapped table of domains with
+# a source type, reputation (0-10) and perspective prior, shared by every
+# worker. The curated lists here and in classification_rules.py win; the
+# database covers the long tail. Build it from a CSV with
+#   python -m perspective_engine.services.domain_reputation domains.csv domain_reputation.bin
+# Empty disables it.
+DOMAIN_REPUTATION_DB_PATH = os.getenv("DOMAIN_REPUTATION_DB_PATH", "")
+# How often each worker checks the file for a new build to swap in
+DOMAIN_REPUTATION_CHECK_SECONDS = float(os.getenv("DOMAIN_REPUTATION_CHECK_SECONDS", 5))
+
+# Source type memo: hosts whose rule plan is kept in an in-process LRU, so a
+# warm host is classified without walking the rules again
+SOURCE_TYPE_MEMO_ENTRIES = int(os.getenv("SOURCE_TYPE_MEMO_ENTRIES", "20000"))
+
 # Classification keywords
 ALTERNATIVE_KEYWORDS = [
     "conspiracy", "truth", "alternative", "freedom", "patriot", "liberty",
@@ -32,6 +54,191 @@ ALTERNATIVE_KEYWORDS = [
     "plandemic", "scamdemic", "big pharma", "big tech", "hidden", "secret", "they lied"
 ]
 
+# Credibility scoring (perspective_engine.services.credibility)
+# Rule-based score: weighted sum of four 0-10 factors, so out of 100 with
+# the default weights, then a tier from the first threshold it reaches
+CREDIBILITY_WEIGHTS = {"source_reputation": 4, "evidence_quality": 3, "bias_level": 2, "transparency": 1}
+CREDIBILITY_TIERS = [("high", 75), ("medium", 50), ("low", 25)]
+CREDIBILITY_DEFAULT_TIER = "unknown"
+
+# Intrinsic score (/score and the app.py search): each component is capped,
+# and the total is clamped to 0-100
+INTRINSIC_SCORE_CAPS = {"base_trust": 60, "recency": 15, "fact_check": 20, "type_quality": 10}
+# Base trust (0-100) by source type
+SOURCE_TYPE_BASE_TRUST = {
+    "government": 85, "academic_institution": 90, "encyclopedia": 80, "research_publication": 85,
+    "news_media_mainstream": 75, "news_opinion_blog_live": 65, "ngo_nonprofit_publication": 70,
+    "ngo_nonprofit_organization": 65, "ngo_nonprofit_general": 60, "corporate_blog_pr_info": 55,
+    "news_media_other_or_blog": 50, "news_media_alternative": 40, "social_media_platform": 30,
+    "social_media_platform_video": 35, "social_media_channel_creator": 40, "social_blogging_platform_user_pub": 45,
+    "social_blogging_platform": 40, "website_general": 50, "mainstream": 75, "alternative": 40,
+    "unknown": 30, "unknown_url": 25, "unknown_other": 30, "unknown_error_parsing": 20
+}
+SOURCE_TYPE_DEFAULT_BASE_TRUST = 50
+# Type quality (-1 to 1, times the type_quality cap) by source type
+SOURCE_TYPE_QUALITY = {
+    "government": .8, "academic_institution": .9, "research_publication": .9,
+    "encyclopedia": .7, "news_media_mainstream": .6, "news_opinion_blog_live": .3,
+    "ngo_nonprofit_publication": .5, "ngo_nonprofit_organization": .4,
+    "ngo_nonprofit_general": .2, "corporate_blog_pr_info": .1,
+    "news_media_other_or_blog": -.3, "news_media_alternative": -.4,
+    "social_media_platform": -.8, "social_media_platform_video": -.7, "social_media_channel_creator": -.5,
+    "social_blogging_platform_user_pub": -.4, "social_blogging_platform": -.6,
+    "website_general": 0, "unknown_url": -.9, "unknown_other": -.9,
+    "unknown_error_parsing": -1, "mainstream": .6, "alternative": -.4, "unknown": -.7
+}
+# Points added for a fact-check verdict; unlisted verdicts add 0
+_FACT_CHECK_CAP = INTRINSIC_SCORE_CAPS["fact_check"]
+FACT_CHECK_POINTS = {
+    "verified": _FACT_CHECK_CAP, "disputed": -_FACT_CHECK_CAP, "disputed_false": -_FACT_CHECK_CAP,
+    "pending": -2, "lacks_consensus": -int(_FACT_CHECK_CAP * .4), "unverifiable": -int(_FACT_CHECK_CAP * .6),
+    "error_parsing": -5, "error": -5
+}
+
 # API configuration
 DEFAULT_PORT = 5001
 DEFAULT_HOST = "0.0.0.0"
+# SerpAPI host; point it at benchmarks/fake_serpapi.py to load test without spending quota
+SERPAPI_BASE_URL = os.getenv("SERPAPI_BASE_URL", "https://serpapi.com").rstrip("/")
+
+# Search fan-out
+# Every selected engine is queried at once on a shared, bounded thread pool.
+# Engines that have not answered by the deadline are dropped from the response.
+SEARCH_MAX_WORKERS = int(os.getenv("SEARCH_MAX_WORKERS", 8))
+SEARCH_DEADLINE_SECONDS = float(os.getenv("SEARCH_DEADLINE_SECONDS", 8.0))
+
+# SERP response cache
+# Two tiers: an in-process LRU in front of a persistent SQLite table.
+# Set SERP_CACHE_DB_PATH to an empty string to keep the cache in memory only.
+SERP_CACHE_MEMORY_ENTRIES = int(os.getenv("SERP_CACHE_MEMORY_ENTRIES", 2000))
+SERP_CACHE_DB_PATH = os.getenv("SERP_CACHE_DB_PATH", "serp_cache.db")
+SERP_CACHE_DB_MAX_ENTRIES = int(os.getenv("SERP_CACHE_DB_MAX_ENTRIES", 50000))
+# A disk hit only rewrites the row's last access time (used to pick rows to
+# evict) when the stored one is older than this, so most hits are read-only.
+SERP_CACHE_ACCESS_RESOLUTION_SECONDS = int(os.getenv("SERP_CACHE_ACCESS_RESOLUTION_SECONDS", 5 * 60))
+SERP_CACHE_DEFAULT_TTL_SECONDS = 3 * 60 * 60
+SERP_CACHE_TTL_SECONDS = {
+    "google": 3 * 60 * 60,
+    "bing": 3 * 60 * 60,
+    "duckduckgo": 6 * 60 * 60
+}
+# Expired entries younger than TTL + max staleness are still served while a
+# background refresh runs (stale-while-revalidate). 0 turns this off.
+SERP_CACHE_MAX_STALENESS_SECONDS = int(os.getenv("SERP_CACHE_MAX_STALENESS_SECONDS", 24 * 60 * 60))
+SERP_CACHE_REFRESH_WORKERS = int(os.getenv("SERP_CACHE_REFRESH_WORKERS", 2))
+
+# Hedged SerpAPI requests
+# When an engine call is slower than its recent HEDGE_PERCENTILE latency, a
+# duplicate request is sent and the first answer wins. Hedges are capped at
+# HEDGE_BUDGET_PERCENT of primary calls so quota use stays bounded.
+HEDGE_ENABLED = os.getenv("HEDGE_ENABLED", "true").lower() == "true"
+HEDGE_PERCENTILE = float(os.getenv("HEDGE_PERCENTILE", 95))
+HEDGE_BUDGET_PERCENT = float(os.getenv("HEDGE_BUDGET_PERCENT", 5))
+HEDGE_MIN_SAMPLES = int(os.getenv("HEDGE_MIN_SAMPLES", 20))
+HEDGE_MAX_WORKERS = int(os.getenv("HEDGE_MAX_WORKERS", 16))
+LATENCY_WINDOW_SIZE = 500
+LATENCY_HISTOGRAM_BUCKETS_MS = [100, 250, 500, 750, 1000, 1500, 2000, 3000, 5000, 8000]
+
+# SerpAPI circuit breaker and adaptive timeouts
+# An engine's circuit opens when too many recent calls failed or were slow,
+# and further calls are skipped until the cooldown passes and a probe succeeds.
+SERP_BREAKER_WINDOW = int(os.getenv("SERP_BREAKER_WINDOW", 20))
+SERP_BREAKER_MIN_CALLS = int(os.getenv("SERP_BREAKER_MIN_CALLS", 5))
+SERP_BREAKER_FAILURE_RATE = float(os.getenv("SERP_BREAKER_FAILURE_RATE", 0.5))
+SERP_BREAKER_COOLDOWN_SECONDS = float(os.getenv("SERP_BREAKER_COOLDOWN_SECONDS", 30))
+SERP_SLOW_CALL_SECONDS = float(os.getenv("SERP_SLOW_CALL_SECONDS", 5))
+# Timeouts follow each engine's recent p99 latency, clamped to these bounds
+SERP_TIMEOUT_DEFAULT_SECONDS = float(os.getenv("SERP_TIMEOUT_DEFAULT_SECONDS", 10))
+SERP_TIMEOUT_MIN_SECONDS = 1.5
+SERP_TIMEOUT_MAX_SECONDS = 15.0
+SERP_TIMEOUT_P99_MULTIPLIER = 2.0
+SERP_TIMEOUT_MIN_SAMPLES = 20
+
+# Pagination
+# Results requested per engine for each page of /search
+SEARCH_PAGE_SIZE = int(os.getenv("SEARCH_PAGE_SIZE", 10))
+# Most recent result ids a cursor remembers, so cursors and cache keys stay
+# bounded however many pages are loaded; older repeats are no longer dropped
+SEARCH_CURSOR_MAX_SEEN = int(os.getenv("SEARCH_CURSOR_MAX_SEEN", 100))
+
+# Rank fusion and classification budget
+# Reciprocal rank fusion constant; larger values flatten the gap between ranks
+FUSION_RRF_K = int(os.getenv("FUSION_RRF_K", 60))
+# Results per request that get AI classification; the rest get rule-based labels
+LLM_CLASSIFY_TOP_K = int(os.getenv("LLM_CLASSIFY_TOP_K", 20))
+
+# SerpAPI key pool
+# Client-side rate limit per key, so bursts queue here instead of hitting 429s
+SERP_KEY_RATE_PER_SECOND = float(os.getenv("SERP_KEY_RATE_PER_SECOND", 2.0))
+SERP_KEY_BURST = int(os.getenv("SERP_KEY_BURST", 10))
+# How long a call waits for a key with a free token before giving up
+SERP_KEY_ACQUIRE_TIMEOUT_SECONDS = float(os.getenv("SERP_KEY_ACQUIRE_TIMEOUT_SECONDS", 2.0))
+# How long a key is rested after SerpAPI answers 429
+SERP_KEY_COOLDOWN_SECONDS = int(os.getenv("SERP_KEY_COOLDOWN_SECONDS", 60))
+SERP_KEY_QUOTA_REFRESH_SECONDS = int(os.getenv("SERP_KEY_QUOTA_REFRESH_SECONDS", 60 * 60))
+SERP_KEY_MAX_USER_KEYS = int(os.getenv("SERP_KEY_MAX_USER_KEYS", 1000))
+# SerpAPI account endpoint used to read each key's remaining searches; empty disables quota checks
+SERPAPI_ACCOUNT_URL = os.getenv("SERPAPI_ACCOUNT_URL", f"{SERPAPI_BASE_URL}/account.json")
+
+# Search history
+# /search only queues its SearchHistory row; a background thread commits
+# queued rows in batches. Rows arriving while the queue is full are dropped.
+SEARCH_HISTORY_QUEUE_SIZE = int(os.getenv("SEARCH_HISTORY_QUEUE_SIZE", 10000))
+SEARCH_HISTORY_BATCH_SIZE = int(os.getenv("SEARCH_HISTORY_BATCH_SIZE", 100))
+
+# Cache warmer
+# Re-fetch popular queries from SearchHistory before their SERP cache entries expire
+CACHE_WARMER_ENABLED = os.getenv("CACHE_WARMER_ENABLED", "true").lower() == "true"
+CACHE_WARMER_INTERVAL_SECONDS = int(os.getenv("CACHE_WARMER_INTERVAL_SECONDS", 10 * 60))
+CACHE_WARMER_TOP_N = int(os.getenv("CACHE_WARMER_TOP_N", 25))
+CACHE_WARMER_LOOKBACK_HOURS = int(os.getenv("CACHE_WARMER_LOOKBACK_HOURS", 72))
+# Entries this close to their TTL are refreshed; keep above the interval so none expire between runs
+CACHE_WARMER_AHEAD_SECONDS = int(os.getenv("CACHE_WARMER_AHEAD_SECONDS", 15 * 60))
+CACHE_WARMER_RATE_PER_SECOND = float(os.getenv("CACHE_WARMER_RATE_PER_SECOND", 0.2))
+
+# Query suggestions
+# Completions kept per trie node; /suggest never returns more than this
+SUGGEST_TOP_K = int(os.getenv("SUGGEST_TOP_K", 10))
+# A search this old counts half as much as one made now
+SUGGEST_HALF_LIFE_HOURS = float(os.getenv("SUGGEST_HALF_LIFE_HOURS", 72))
+SUGGEST_MAX_QUERIES = int(os.getenv("SUGGEST_MAX_QUERIES", 100000))
+SUGGEST_MAX_QUERY_LENGTH = int(os.getenv("SUGGEST_MAX_QUERY_LENGTH", 100))
+# A query is only suggested once this many different signed-in users have
+# searched for it, so /suggest never reveals what any one person looked up
+SUGGEST_MIN_DISTINCT_USERS = int(os.getenv("SUGGEST_MIN_DISTINCT_USERS", 5))
+# Recent SearchHistory rows (and cached queries) indexed at startup
+SUGGEST_HISTORY_LIMIT = int(os.getenv("SUGGEST_HISTORY_LIMIT", 20000))
+# Weight of a query known only from the SERP cache, relative to one search
+SUGGEST_CACHED_WEIGHT = float(os.getenv("SUGGEST_CACHED_WEIGHT", 0.5))
+
+# Bulk search jobs
+# Searches run at once across all bulk jobs
+BULK_JOB_WORKERS = int(os.getenv("BULK_JOB_WORKERS", 4))
+BULK_JOB_MAX_QUERIES = int(os.getenv("BULK_JOB_MAX_QUERIES", 1000))
+# Queued or running jobs one user may have at a time
+BULK_JOB_MAX_ACTIVE_PER_USER = int(os.getenv("BULK_JOB_MAX_ACTIVE_PER_USER", 2))
+# JSONL output files are written here and deleted after the retention period
+BULK_JOB_DIR = os.getenv("BULK_JOB_DIR", "bulk_jobs")
+BULK_JOB_RETENTION_HOURS = int(os.getenv("BULK_JOB_RETENTION_HOURS", 24))
+
+# Local full-text index
+# Engine name that searches the local index instead of SerpAPI
+LOCAL_ENGINE = "local"
+# SQLite FTS5 file for seen results and page text; empty disables the index
+LOCAL_INDEX_DB_PATH = os.getenv("LOCAL_INDEX_DB_PATH", "local_index.db")
+LOCAL_INDEX_MAX_BODY_CHARS = int(os.getenv("LOCAL_INDEX_MAX_BODY_CHARS", 20000))
+
+# Request deadlines
+# Clients send deadline_ms in the body or this header to say how long they will wait
+REQUEST_DEADLINE_HEADER = "X-Request-Deadline-Ms"
+REQUEST_DEADLINE_MAX_MS = int(os.getenv("REQUEST_DEADLINE_MAX_MS", 60000))
+# Threads for stages that must be abandoned when their time runs out (AI calls, page fetches)
+REQUEST_DEADLINE_WORKERS = int(os.getenv("REQUEST_DEADLINE_WORKERS", 16))
+# How each endpoint splits its deadline: (stage, weight) in the order the stages run
+DEADLINE_STAGES = {
+    "search": [("serp", 8), ("rules", 1)],
+    "search_stream": [("serp", 6), ("ai", 4)],
+    "classify": [("ai", 9), ("rules", 1)],
+    "summarize": [("fetch", 4), ("ai", 6)],
+    "fact_check": [("fetch", 4), ("ai", 6)]
+}
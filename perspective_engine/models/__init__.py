@@ -1,3 +1,4 @@
 # Import all models here to ensure they're registered with SQLAlchemy
 from perspective_engine.models.user import User
-from perspective_engine.models.user_api_keys import UserApiKey
\ No newline at end of file
+from perspective_engine.models.user_api_keys import UserApiKey
+from perspective_engine.models.search_history import SearchHistory
@@ -0,0 +1,31 @@
+from datetime import datetime, timezone
+from sqlalchemy.orm import declared_attr
+from perspective_engine.extensions import db
+
+class SearchHistoryColumns:
+    """
+    Columns of the search_history table
+
+    Both apps map this table, each on its own SQLAlchemy instance, so they
+    share this one definition. Change it together with a migration in
+    migrations/versions.
+    """
+    __tablename__ = 'search_history'
+
+    id = db.Column(db.Integer, primary_key=True)
+    query = db.Column(db.String(500), nullable=False)
+    engines_used = db.Column(db.String(200), nullable=True)  # JSON string of engines
+    perspective = db.Column(db.String(50), nullable=True)
+    results_count = db.Column(db.Integer, default=0)
+    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc), index=True)
+
+    @declared_attr
+    def user_id(cls):
+        # Null for anonymous searches, which still count towards popular queries
+        return db.Column(db.Integer, db.ForeignKey('users.id'), nullable=True)
+
+    def __repr__(self):
+        return f'<SearchHistory {self.query[:30]}...>'
+
+class SearchHistory(SearchHistoryColumns, db.Model):
+    """A search someone ran, used to find popular queries worth keeping warm."""
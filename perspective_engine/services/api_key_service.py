@@ -27,6 +27,20 @@ def get_api_key(user_id, key_type):
     print(f"API Key Service: Falling back to server key: {'Yes' if server_key else 'No'}")
     return server_key
     
+def get_user_api_key(user_id, key_type):
+    """Get a user's own API key, without falling back to the server key"""
+    if not user_id:
+        return None
+    try:
+        user_key = UserApiKey.query.filter_by(
+            user_id=user_id, 
+            key_type=key_type
+        ).first()
+        return user_key.api_key if user_key else None
+    except Exception as e:
+        print(f"API Key Service: Error retrieving user key: {e}")
+        return None
+
 def get_server_api_key(key_type):
     """Get server API key from environment variables"""
     if key_type == 'openai':
@@ -0,0 +1,190 @@
+import json
+import os
+import threading
+import time
+import uuid
+from concurrent.futures import ThreadPoolExecutor
+from perspective_engine.config.constants import (
+    BULK_JOB_WORKERS, BULK_JOB_DIR, BULK_JOB_RETENTION_HOURS, BULK_JOB_MAX_ACTIVE_PER_USER
+)
+
+QUEUED = "queued"
+RUNNING = "running"
+DONE = "done"
+CANCELLED = "cancelled"
+
+class BulkJob:
+    """A list of queries searched in the background, with results appended to a JSONL file"""
+
+    def __init__(self, job_id, queries, engines, perspective, user_id, output_path):
+        self.id = job_id
+        self.queries = queries
+        self.engines = engines
+        self.perspective = perspective
+        self.user_id = user_id
+        self.output_path = output_path
+        self.status = QUEUED
+        self.completed = 0
+        self.failed = 0
+        self.skipped = 0
+        self.created_at = time.time()
+        self.finished_at = None
+        self._lock = threading.Lock()
+        self._output = open(output_path, "a", encoding="utf-8")
+
+    def write(self, line, failed=False):
+        """Append one result line and count it. Returns True once every query is accounted for."""
+        with self._lock:
+            self._output.write(json.dumps(line) + "\n")
+            self._output.flush()
+            self.completed += 1
+            if failed:
+                self.failed += 1
+            if self.status == QUEUED:
+                self.status = RUNNING
+            return self._finish_if_complete()
+
+    def skip(self):
+        """Count a query dropped by cancellation"""
+        with self._lock:
+            self.completed += 1
+            self.skipped += 1
+            return self._finish_if_complete()
+
+    def cancel(self):
+        with self._lock:
+            if self.status in (QUEUED, RUNNING):
+                self.status = CANCELLED
+
+    @property
+    def cancelled(self):
+        return self.status == CANCELLED
+
+    def _finish_if_complete(self):
+        """Caller holds the lock"""
+        if self.completed < len(self.queries):
+            return False
+        if self.status != CANCELLED:
+            self.status = DONE
+        self.finished_at = time.time()
+        self._output.close()
+        return True
+
+    def to_dict(self):
+        with self._lock:
+            total = len(self.queries)
+            return {
+                "job_id": self.id,
+                "status": self.status,
+                "engines": self.engines,
+                "perspective": self.perspective,
+                "total": total,
+                "completed": self.completed,
+                "failed": self.failed,
+                "skipped": self.skipped,
+                "progress": round(self.completed / total, 3) if total else 1.0,
+                "created_at": self.created_at,
+                "finished_at": self.finished_at
+            }
+
+class BulkJobManager:
+    """
+    Run bulk search jobs on one bounded worker pool
+
+    Every query of every job is a separate task, so jobs share the workers
+    fairly in submission order, and each search goes through the same SERP
+    cache, coalescing and SerpAPI key pool as interactive traffic, as long
+    as search_fn does (the /search/bulk endpoint's does). A query answered
+    with sample results or none at all is recorded as a failure. Each user
+    may have at most max_active_per_user jobs queued or running.
+    """
+
+    def __init__(self, max_workers=BULK_JOB_WORKERS, output_dir=BULK_JOB_DIR,
+                 retention_hours=BULK_JOB_RETENTION_HOURS, max_active_per_user=BULK_JOB_MAX_ACTIVE_PER_USER):
+        self.output_dir = output_dir
+        self.retention_seconds = retention_hours * 3600
+        self.max_active_per_user = max_active_per_user
+        self._executor = ThreadPoolExecutor(max_workers=max_workers, thread_name_prefix="bulk-search")
+        self._jobs = {}
+        self._lock = threading.Lock()
+        self._rejected = 0
+
+    def submit(self, queries, engines, perspective, search_fn, user_id=None):
+        """
+        Queue a job that calls search_fn(query) for each query
+
+        Returns:
+            The new BulkJob, or None when the user already has
+            max_active_per_user jobs queued or running
+        """
+        self._prune()
+        os.makedirs(self.output_dir, exist_ok=True)
+        job_id = uuid.uuid4().hex
+        with self._lock:
+            if self._active(user_id) >= self.max_active_per_user:
+                self._rejected += 1
+                return None
+            job = BulkJob(job_id, queries, engines, perspective, user_id, os.path.join(self.output_dir, f"{job_id}.jsonl"))
+            self._jobs[job.id] = job
+
+        print(f"Bulk jobs: Job {job.id} queued with {len(queries)} queries on {engines}")
+        for index, query in enumerate(queries):
+            self._executor.submit(self._run_query, job, index, query, search_fn)
+        return job
+
+    def _run_query(self, job, index, query, search_fn):
+        if job.cancelled:
+            finished = job.skip()
+        else:
+            try:
+                response = search_fn(query)
+                if response.get("is_mock") or not response.get("results"):
+                    # Sample results and empty pages are not answers to the query
+                    error = response.get("error_info") or "No results"
+                    finished = job.write({"index": index, "query": query, "error_info": error}, failed=True)
+                else:
+                    finished = job.write({"index": index, **response}, failed="error_info" in response)
+            except Exception as e:
+                print(f"Bulk jobs: Query '{query}' in job {job.id} failed: {type(e).__name__} - {e}")
+                finished = job.write({"index": index, "query": query, "error_info": str(e)}, failed=True)
+        if finished:
+            succeeded = job.completed - job.failed - job.skipped
+            print(f"Bulk jobs: Job {job.id} {job.status} ({succeeded}/{len(job.queries)} succeeded)")
+
+    def get(self, job_id):
+        with self._lock:
+            return self._jobs.get(job_id)
+
+    def _prune(self):
+        """Forget finished jobs and delete their output once they are past retention"""
+        cutoff = time.time() - self.retention_seconds
+        with self._lock:
+            expired = [job for job in self._jobs.values() if job.finished_at and job.finished_at < cutoff]
+            for job in expired:
+                del self._jobs[job.id]
+        for job in expired:
+            try:
+                os.remove(job.output_path)
+            except OSError:
+                pass
+
+    def _active(self, user_id):
+        """Jobs the user has queued or running. Caller holds the lock."""
+        return sum(
+            1 for job in self._jobs.values()
+            if str(job.user_id) == str(user_id) and job.status in (QUEUED, RUNNING)
+        )
+
+    def stats(self):
+        """Return job counts and the number of submissions turned away by the per-user limit"""
+        with self._lock:
+            jobs = list(self._jobs.values())
+            rejected = self._rejected
+        return {
+            "jobs": len(jobs),
+            "active": sum(1 for job in jobs if job.status in (QUEUED, RUNNING)),
+            "users": len({str(job.user_id) for job in jobs if job.status in (QUEUED, RUNNING)}),
+            "rejected": rejected
+        }
+
+bulk_jobs = BulkJobManager()
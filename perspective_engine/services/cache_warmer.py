@@ -0,0 +1,109 @@
+import threading
+import time
+from datetime import datetime, timezone
+from perspective_engine.config.constants import (
+    CACHE_WARMER_INTERVAL_SECONDS, CACHE_WARMER_AHEAD_SECONDS, CACHE_WARMER_RATE_PER_SECOND,
+    SEARCH_PAGE_SIZE
+)
+from perspective_engine.services.search_history import popular_queries
+from perspective_engine.services.serp_cache import serp_cache, make_cache_key
+from perspective_engine.services.serp_key_pool import TokenBucket, serp_key_pool
+
+# How long to wait for interactive SerpAPI calls to finish before warming the next query
+_YIELD_SECONDS = 1.0
+
+class CacheWarmer:
+    """
+    Keep popular queries in the SERP cache by re-fetching them before they expire
+
+    Runs on a background thread every interval_seconds. Warming fetches go
+    one at a time through their own token bucket, use server keys only, and
+    wait while any interactive SerpAPI call is in flight.
+    """
+
+    def __init__(self, interval_seconds=CACHE_WARMER_INTERVAL_SECONDS,
+                 ahead_seconds=CACHE_WARMER_AHEAD_SECONDS, rate_per_second=CACHE_WARMER_RATE_PER_SECOND):
+        self.interval_seconds = interval_seconds
+        self.ahead_seconds = ahead_seconds
+        self.bucket = TokenBucket(rate_per_second, 1)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {
+            "runs": 0,
+            "warmed": 0,
+            "still_fresh": 0,
+            "failed": 0,
+            "last_run_at": None
+        }
+
+    def start(self, app):
+        """Start warming in the background for a Flask app. Safe to call more than once."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, args=(app,), name="serp-cache-warmer", daemon=True)
+            self._thread.start()
+        print(f"Cache warmer: Started, warming every {self.interval_seconds}s")
+
+    def _run(self, app):
+        while True:
+            time.sleep(self.interval_seconds)
+            try:
+                with app.app_context():
+                    pairs = popular_queries()
+                self.warm(pairs)
+            except Exception as e:
+                print(f"Cache warmer: Run failed: {type(e).__name__} - {e}")
+
+    def needs_warming(self, query, engine_name):
+        """True if the first page for a query is missing or about to expire"""
+        age = serp_cache.age(make_cache_key(query, engine_name, SEARCH_PAGE_SIZE))
+        return age is None or age >= serp_cache.ttl_for(engine_name) - self.ahead_seconds
+
+    def warm(self, pairs):
+        """Refresh the first results page of each (query, engines) pair that needs it"""
+        from perspective_engine.services.search_service import fetch_results_via_serpapi
+
+        warmed = 0
+        for query, engines in pairs:
+            for engine in engines:
+                if not self.needs_warming(query, engine):
+                    self._count("still_fresh")
+                    continue
+                self._wait_for_turn()
+                if fetch_results_via_serpapi.refresh(query, engine, None, SEARCH_PAGE_SIZE):
+                    warmed += 1
+                    self._count("warmed")
+                else:
+                    self._count("failed")
+
+        with self._lock:
+            self._stats["runs"] += 1
+            self._stats["last_run_at"] = datetime.now(timezone.utc).isoformat()
+        print(f"Cache warmer: Warmed {warmed} entries for {len(pairs)} popular queries")
+
+    def _wait_for_turn(self):
+        """Block until the warmer's rate allows a fetch and no interactive call is running"""
+        while True:
+            now = time.monotonic()
+            wait = self.bucket.wait_time(now)
+            if wait > 0:
+                time.sleep(wait)
+                continue
+            if serp_key_pool.in_flight():
+                time.sleep(_YIELD_SECONDS)
+                continue
+            self.bucket.take(time.monotonic())
+            return
+
+    def _count(self, name):
+        with self._lock:
+            self._stats[name] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["running"] = self._thread is not None
+            return stats
+
+cache_warmer = CacheWarmer()
@@ -0,0 +1,131 @@
+import threading
+import time
+from collections import deque
+from perspective_engine.config.constants import (
+    SERP_BREAKER_WINDOW, SERP_BREAKER_MIN_CALLS, SERP_BREAKER_FAILURE_RATE,
+    SERP_BREAKER_COOLDOWN_SECONDS, SERP_SLOW_CALL_SECONDS,
+    SERP_TIMEOUT_DEFAULT_SECONDS, SERP_TIMEOUT_MIN_SECONDS, SERP_TIMEOUT_MAX_SECONDS,
+    SERP_TIMEOUT_P99_MULTIPLIER, SERP_TIMEOUT_MIN_SAMPLES
+)
+from perspective_engine.services.latency import serp_latency
+
+CLOSED = "closed"
+OPEN = "open"
+HALF_OPEN = "half_open"
+
+class CircuitBreaker:
+    """
+    Closed / open / half-open breaker driven by a window of recent call outcomes
+
+    A call counts as failed if it raised, returned an upstream error status,
+    or took longer than slow_call_seconds.
+    """
+
+    def __init__(self, name, window=SERP_BREAKER_WINDOW, min_calls=SERP_BREAKER_MIN_CALLS,
+                 failure_rate=SERP_BREAKER_FAILURE_RATE, cooldown_seconds=SERP_BREAKER_COOLDOWN_SECONDS,
+                 slow_call_seconds=SERP_SLOW_CALL_SECONDS):
+        self.name = name
+        self.min_calls = min_calls
+        self.failure_rate = failure_rate
+        self.cooldown_seconds = cooldown_seconds
+        self.slow_call_seconds = slow_call_seconds
+
+        self._outcomes = deque(maxlen=window)
+        self._state = CLOSED
+        self._opened_at = 0.0
+        self._probe_in_flight = False
+        self._lock = threading.Lock()
+        self._skipped = 0
+
+    @property
+    def state(self):
+        with self._lock:
+            return self._current_state()
+
+    def allow_request(self):
+        """Return True if a call may go upstream right now"""
+        with self._lock:
+            state = self._current_state()
+            if state == CLOSED:
+                return True
+            if state == HALF_OPEN and not self._probe_in_flight:
+                # Let exactly one probe through to test the upstream
+                self._probe_in_flight = True
+                return True
+            self._skipped += 1
+            return False
+
+    def record_success(self, latency_seconds):
+        if latency_seconds > self.slow_call_seconds:
+            self.record_failure()
+            return
+        with self._lock:
+            if self._current_state() == HALF_OPEN:
+                print(f"Circuit breaker: {self.name} recovered, closing circuit")
+                self._state = CLOSED
+                self._outcomes.clear()
+            self._probe_in_flight = False
+            self._outcomes.append(False)
+
+    def record_failure(self):
+        with self._lock:
+            self._outcomes.append(True)
+            state = self._current_state()
+            self._probe_in_flight = False
+            if state == HALF_OPEN:
+                self._trip()
+            elif state == CLOSED and len(self._outcomes) >= self.min_calls:
+                if sum(self._outcomes) / len(self._outcomes) >= self.failure_rate:
+                    self._trip()
+
+    def stats(self):
+        with self._lock:
+            calls = len(self._outcomes)
+            return {
+                "state": self._current_state(),
+                "recent_calls": calls,
+                "recent_failure_rate": round(sum(self._outcomes) / calls, 2) if calls else 0.0,
+                "skipped_calls": self._skipped
+            }
+
+    def _trip(self):
+        """Open the circuit. Caller holds the lock."""
+        print(f"Circuit breaker: {self.name} failing, opening circuit for {self.cooldown_seconds}s")
+        self._state = OPEN
+        self._opened_at = time.monotonic()
+
+    def _current_state(self):
+        """Move from open to half-open once the cooldown has passed. Caller holds the lock."""
+        if self._state == OPEN and time.monotonic() - self._opened_at >= self.cooldown_seconds:
+            self._state = HALF_OPEN
+            self._probe_in_flight = False
+        return self._state
+
+class BreakerRegistry:
+    """One breaker per engine, created on first use"""
+
+    def __init__(self):
+        self._breakers = {}
+        self._lock = threading.Lock()
+
+    def get(self, engine_name):
+        engine_name = (engine_name or "").lower()
+        with self._lock:
+            breaker = self._breakers.get(engine_name)
+            if breaker is None:
+                breaker = self._breakers[engine_name] = CircuitBreaker(engine_name)
+            return breaker
+
+    def stats(self):
+        with self._lock:
+            breakers = dict(self._breakers)
+        return {name: breaker.stats() for name, breaker in breakers.items()}
+
+serp_breakers = BreakerRegistry()
+
+def serp_timeout_for(engine_name):
+    """Pick a request timeout from the engine's recent p99 latency"""
+    if serp_latency.count(engine_name) < SERP_TIMEOUT_MIN_SAMPLES:
+        return SERP_TIMEOUT_DEFAULT_SECONDS
+    p99 = serp_latency.percentile(engine_name, 99)
+    return min(SERP_TIMEOUT_MAX_SECONDS, max(SERP_TIMEOUT_MIN_SECONDS, p99 * SERP_TIMEOUT_P99_MULTIPLIER))
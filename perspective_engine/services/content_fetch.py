@@ -1,6 +1,7 @@
 import requests
 from bs4 import BeautifulSoup
 from urllib.parse import urlparse
+from perspective_engine.services.local_index import local_index
 
 def fetch_text_from_url(url):
     """Extract main text content from a URL"""
@@ -59,7 +60,10 @@ def fetch_text_from_url(url):
                              if line.strip() and len(line.strip().split()) > 2])
             
             print(f"Extracted ~{len(text)} chars from {url}")
-            return text if len(text) > 150 else None
+            if len(text) <= 150:
+                return None
+            local_index.add_page(url, text)
+            return text
             
         return None
         
@@ -0,0 +1,187 @@
+import numpy as np
+
+from perspective_engine.config.classification_rules import (
+    SOURCE_REPUTATION_TIERS, SOURCE_REPUTATION_DEFAULT, SOURCE_TRANSPARENCY,
+    SOURCE_TRANSPARENCY_DEFAULT, MAINSTREAM_SOURCE_TYPES, NEUTRAL_SOURCE_TYPES,
+    ALTERNATIVE_SOURCE_TYPES, ACADEMIC_URL_MARKERS, CREDIBILITY_KEYWORDS
+)
+from perspective_engine.config.constants import (
+    CREDIBILITY_WEIGHTS, CREDIBILITY_TIERS, CREDIBILITY_DEFAULT_TIER, INTRINSIC_SCORE_CAPS,
+    SOURCE_TYPE_QUALITY, FACT_CHECK_POINTS
+)
+from perspective_engine.services.classification import classify_source_type
+from perspective_engine.services.domain_reputation import domain_reputation
+from perspective_engine.services.keyword_scanner import KeywordScanner
+from perspective_engine.services.search_result import CredibilityFactors
+
+# Reputation tier of each URL substring; the first tier listing it wins
+_DOMAIN_TIER = {}
+for _tier, (_, _domains) in enumerate(SOURCE_REPUTATION_TIERS):
+    for _domain in _domains:
+        _DOMAIN_TIER.setdefault(_domain.lower(), _tier)
+_ACADEMIC_MARKERS = frozenset(marker.lower() for marker in ACADEMIC_URL_MARKERS)
+_EVIDENCE, _BIAS, _ALTERNATIVE = (
+    frozenset(keyword.lower() for keyword in CREDIBILITY_KEYWORDS[name])
+    for name in ("evidence_indicators", "bias_indicators", "alternative_terms")
+)
+
+# One pass over the URL finds every reputation domain and academic marker,
+# and one pass each over the title and snippet every credibility keyword
+url_keywords = KeywordScanner({"reputation_domains": list(_DOMAIN_TIER), "academic_markers": ACADEMIC_URL_MARKERS})
+credibility_keywords = KeywordScanner(CREDIBILITY_KEYWORDS)
+
+# Per reputation tier, with the default tier last
+_TIER_COUNT = len(SOURCE_REPUTATION_TIERS)
+_TIER_REPUTATION = np.array([reputation for reputation, _ in SOURCE_REPUTATION_TIERS] + [SOURCE_REPUTATION_DEFAULT])
+
+def credibility_features(result):
+    """
+    The text features score_results needs from one result
+
+    Returns:
+        (reputation tier index, evidence keyword count, bias keyword count,
+         1 if an alternative term appears else 0, 1 if the URL looks academic else 0)
+    """
+    url_found = url_keywords.find(result.get('link') or '')
+    tier = min((_DOMAIN_TIER[keyword] for keyword in url_found if keyword in _DOMAIN_TIER), default=_TIER_COUNT)
+
+    snippet_found = credibility_keywords.find(result.get('snippet') or '')
+    text_found = credibility_keywords.find(result.get('title') or '') | snippet_found
+    return (
+        tier,
+        len(snippet_found & _EVIDENCE),
+        len(text_found & _BIAS),
+        0 if text_found.isdisjoint(_ALTERNATIVE) else 1,
+        0 if url_found.isdisjoint(_ACADEMIC_MARKERS) else 1
+    )
+
+def score_results(results):
+    """
+    Add source type, credibility score and perspective to a list of results
+
+    The source type is classify_source_type's, so it matches every other
+    endpoint; the reputation tiers only set the source reputation. Text
+    features are read per result; the factors, weighted scores, tiers and
+    perspectives are then computed for the whole list with array
+    operations. Results are updated in place.
+
+    Results under none of the reputation tier domains whose source type
+    came from the domain reputation database take their reputation from it
+    too, and its perspective prior, if any, as their perspective.
+
+    Returns:
+        results
+    """
+    if not results:
+        return results
+    tier, evidence_count, bias_count, alternative, academic = np.array(
+        [credibility_features(result) for result in results], dtype=np.int64
+    ).T
+
+    # ===== CREDIBILITY FACTORS =====
+    labels = np.array([classify_source_type(result.get('link')) for result in results], dtype=object)
+    source_reputation = _TIER_REPUTATION[tier]
+    evidence_quality = np.minimum(8, evidence_count * 2 + 2)  # Base of 2, max of 8
+    bias_level = np.maximum(0, 10 - bias_count * 2)  # Higher score means less bias
+    transparency = np.array([SOURCE_TRANSPARENCY.get(label, SOURCE_TRANSPARENCY_DEFAULT) for label in labels])
+    listed = {}
+    if domain_reputation.enabled:
+        for index in np.flatnonzero(tier == _TIER_COUNT).tolist():
+            entry = domain_reputation.lookup(results[index].get('link'))
+            # Otherwise the rules labelled the host and the entry is not used
+            if entry is not None and entry.source_type == labels[index]:
+                listed[index] = entry
+    for index, entry in listed.items():
+        source_reputation[index] = entry.reputation
+
+    # ===== OVERALL CREDIBILITY SCORE =====
+    weighted = (
+        source_reputation * CREDIBILITY_WEIGHTS["source_reputation"] +
+        evidence_quality * CREDIBILITY_WEIGHTS["evidence_quality"] +
+        bias_level * CREDIBILITY_WEIGHTS["bias_level"] +
+        transparency * CREDIBILITY_WEIGHTS["transparency"]
+    )
+    scores = np.trunc(weighted).astype(np.int64)
+    credibility = np.select(
+        [scores >= threshold for _, threshold in CREDIBILITY_TIERS],
+        [tier_name for tier_name, _ in CREDIBILITY_TIERS],
+        CREDIBILITY_DEFAULT_TIER
+    )
+
+    # ===== PERSPECTIVE =====
+    government = labels == "government"
+    perspectives = np.select([
+        # All mainstream news sources are mainstream
+        np.isin(labels, MAINSTREAM_SOURCE_TYPES),
+        # Encyclopedias, academic sources and academic government sources are neutral
+        np.isin(labels, NEUTRAL_SOURCE_TYPES) | (government & (academic == 1)),
+        government,
+        # Platforms, blogs, biased language or alternative terms
+        np.isin(labels, ALTERNATIVE_SOURCE_TYPES) | (bias_level <= 5) | (alternative == 1)
+    ], ["mainstream", "neutral", "mainstream", "alternative"], "neutral")
+
+    perspectives = perspectives.tolist()
+    for index, entry in listed.items():
+        if entry.perspective:
+            perspectives[index] = entry.perspective
+
+    for result, label, score, level, perspective, factors in zip(
+        results, labels.tolist(), scores.tolist(), credibility.tolist(), perspectives,
+        zip(source_reputation.tolist(), evidence_quality.tolist(), bias_level.tolist(), transparency.tolist())
+    ):
+        result['source_type_label'] = label
+        result['intrinsic_credibility_score'] = score
+        result['source_credibility'] = level
+        result['perspective'] = perspective
+        result['credibility_factors'] = CredibilityFactors(*factors)
+    return results
+
+def intrinsic_scores(source_types, base_trusts, recency_boosts, verdicts=None):
+    """
+    Intrinsic credibility scores for many results at once
+
+    Args:
+        source_types: Source type label of each result
+        base_trusts: Base trust of each result, 0-100
+        recency_boosts: Recency boost of each result, 0-100
+        verdicts: Fact-check verdict of each result, or None when nothing
+            has been fact-checked yet (no fact-check points at all)
+
+    Returns:
+        (scores, factors): an int array of 0-100 scores and {factor name: array}
+    """
+    caps = INTRINSIC_SCORE_CAPS
+    base_trust = np.clip(np.asarray(base_trusts, dtype=float) / 100 * caps["base_trust"], 0, caps["base_trust"])
+    recency = np.clip(np.asarray(recency_boosts, dtype=float) / 100 * caps["recency"], 0, caps["recency"])
+    if verdicts is None:
+        fact_check = np.zeros(len(base_trust), dtype=np.int64)
+    else:
+        fact_check = np.array([FACT_CHECK_POINTS.get(verdict, 0) for verdict in verdicts], dtype=np.int64)
+    type_quality = np.array(
+        [SOURCE_TYPE_QUALITY.get(source_type, 0.) for source_type in source_types], dtype=float
+    ) * caps["type_quality"]
+
+    scores = np.rint(np.clip(base_trust + recency + fact_check + type_quality, 0, 100)).astype(np.int64)
+    return scores, {
+        "base_trust_contribution": base_trust,
+        "recency_contribution": recency,
+        "fact_check_contribution": fact_check,
+        "type_quality_adjustment": type_quality
+    }
+
+def intrinsic_score(source_type, base_trust, recency_boost, verdict):
+    """
+    Intrinsic credibility score of one result, as /score returns it
+
+    Returns:
+        (score, {factor name: contribution rounded to 2 places})
+    """
+    caps = INTRINSIC_SCORE_CAPS
+    contributions = {
+        "base_trust_contribution": min(max(base_trust / 100 * caps["base_trust"], 0), caps["base_trust"]),
+        "recency_contribution": min(max(recency_boost / 100 * caps["recency"], 0), caps["recency"]),
+        "fact_check_contribution": FACT_CHECK_POINTS.get(verdict, 0),
+        "type_quality_adjustment": SOURCE_TYPE_QUALITY.get(source_type, 0.) * caps["type_quality"]
+    }
+    score = int(round(min(max(sum(contributions.values()), 0), 100)))
+    return score, {name: round(value, 2) for name, value in contributions.items()}
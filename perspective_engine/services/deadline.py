@@ -0,0 +1,118 @@
+import math
+import time
+from concurrent.futures import ThreadPoolExecutor, TimeoutError as FutureTimeoutError
+from flask import current_app, has_app_context, request
+from perspective_engine.config.constants import (
+    REQUEST_DEADLINE_HEADER, REQUEST_DEADLINE_MAX_MS, REQUEST_DEADLINE_WORKERS, DEADLINE_STAGES
+)
+
+# Stages that overrun keep running here after the request has moved on
+_executor = ThreadPoolExecutor(max_workers=REQUEST_DEADLINE_WORKERS, thread_name_prefix="deadline-stage")
+
+class Deadline:
+    """
+    Time a client is willing to wait for a request, shared out across its stages
+
+    stages is a list of (name, weight) pairs in the order the stages run. When
+    a stage starts it gets the time left in proportion to its weight among
+    itself and the stages after it, so time an early stage leaves unused
+    flows on to later ones. A Deadline without a budget never runs out.
+    """
+
+    def __init__(self, budget_ms=None, stages=()):
+        self.budget_ms = budget_ms
+        self.expires_at = time.monotonic() + budget_ms / 1000.0 if budget_ms is not None else None
+        self.stages = list(stages)
+        self.cut_short = []
+
+    @property
+    def bounded(self):
+        return self.expires_at is not None
+
+    def remaining(self):
+        """Seconds left, or infinity without a budget"""
+        if not self.bounded:
+            return math.inf
+        return max(0.0, self.expires_at - time.monotonic())
+
+    @property
+    def expired(self):
+        return self.remaining() <= 0
+
+    def stage(self, name):
+        """Seconds the named stage may use, starting now"""
+        remaining = self.remaining()
+        if not self.bounded:
+            return remaining
+        names = [stage for stage, _ in self.stages]
+        weights = [weight for _, weight in self.stages[names.index(name):]]
+        return remaining * weights[0] / sum(weights)
+
+    def cut(self, name):
+        """Record that a stage stopped early or fell back to a cheaper answer"""
+        if name not in self.cut_short:
+            self.cut_short.append(name)
+            print(f"Deadline: Stage '{name}' cut short with {self.remaining():.2f}s left")
+
+    def report(self):
+        """Fields for a response body; empty when the client sent no deadline"""
+        if not self.bounded:
+            return {}
+        return {"deadline_ms": self.budget_ms, "cut_short": list(self.cut_short)}
+
+def deadline_for(deadline_ms, stages):
+    """
+    Build a Deadline from a client's deadline_ms value
+
+    Raises:
+        ValueError: if deadline_ms is given but is not a positive integer
+    """
+    if deadline_ms is None or deadline_ms == "":
+        return Deadline(stages=stages)
+    try:
+        deadline_ms = int(deadline_ms)
+    except (TypeError, ValueError):
+        raise ValueError("deadline_ms must be a positive integer")
+    if deadline_ms <= 0:
+        raise ValueError("deadline_ms must be a positive integer")
+    return Deadline(min(deadline_ms, REQUEST_DEADLINE_MAX_MS), stages)
+
+def request_deadline(data, endpoint):
+    """
+    Read the current request's deadline from its body or header, split by the endpoint's stages
+
+    Raises:
+        ValueError: if the deadline is malformed
+    """
+    deadline_ms = (data or {}).get("deadline_ms", request.headers.get(REQUEST_DEADLINE_HEADER))
+    return deadline_for(deadline_ms, DEADLINE_STAGES[endpoint])
+
+def run_stage(deadline, name, fn, *args, fallback=None):
+    """
+    Call fn(*args) within the named stage's share of the deadline
+
+    If it has not returned in time the stage is marked as cut short and
+    fallback() is returned instead (None without a fallback). The call itself
+    is left to finish in the background. Exceptions from fn are raised as usual.
+    """
+    budget = deadline.stage(name)
+    if budget == math.inf:
+        return fn(*args)
+    if budget <= 0:
+        deadline.cut(name)
+        return fallback() if fallback else None
+
+    app = current_app._get_current_object() if has_app_context() else None
+
+    def call():
+        if app is None:
+            return fn(*args)
+        with app.app_context():
+            return fn(*args)
+
+    future = _executor.submit(call)
+    try:
+        return future.result(timeout=budget)
+    except FutureTimeoutError:
+        deadline.cut(name)
+        return fallback() if fallback else None
@@ -0,0 +1,103 @@
+import hashlib
+from urllib.parse import urlsplit, urlunsplit, parse_qsl, urlencode
+from perspective_engine.services.search_result import SearchResult
+
+# Query parameters that only track where a click came from
+_TRACKING_PARAMS = {
+    "fbclid", "gclid", "dclid", "msclkid", "yclid", "igshid", "mc_cid", "mc_eid",
+    "_ga", "_gl", "ref", "ref_src", "cmpid", "s_cid", "amp", "outputtype"
+}
+_TRACKING_PREFIXES = ("utm_",)
+
+# Host prefixes for mobile and AMP copies of the same site
+_HOST_PREFIXES = ("www.", "m.", "mobile.", "amp.")
+
+def canonicalize_url(link):
+    """
+    Reduce a result link to the form shared by all its variants
+
+    http/https, www./mobile/AMP hosts, AMP paths, tracking parameters,
+    parameter order, fragments and trailing slashes are all normalized away.
+    """
+    if not link:
+        return ""
+    try:
+        parts = urlsplit(link.strip())
+        port = parts.port
+    except ValueError:
+        return link.strip().lower()
+
+    host = (parts.hostname or "").lower()
+    stripped = True
+    while stripped:
+        stripped = False
+        for prefix in _HOST_PREFIXES:
+            if host.startswith(prefix) and host.count(".") > 1:
+                host = host[len(prefix):]
+                stripped = True
+    if port and port not in (80, 443):
+        host = f"{host}:{port}"
+
+    path = parts.path or ""
+    if path.startswith("/amp/"):
+        path = path[4:]
+    path = path.rstrip("/")
+    if path.endswith("/amp"):
+        path = path[:-4]
+    elif path.endswith(".amp.html"):
+        path = path[:-9] + ".html"
+
+    query = sorted(
+        (key, value) for key, value in parse_qsl(parts.query, keep_blank_values=True)
+        if key.lower() not in _TRACKING_PARAMS and not key.lower().startswith(_TRACKING_PREFIXES)
+    )
+    return urlunsplit(("https", host, path, urlencode(query), ""))
+
+def content_id(link):
+    """Stable identifier for a result, the same in every process and for every URL variant"""
+    return hashlib.sha1(canonicalize_url(link).encode("utf-8")).hexdigest()[:16]
+
+def dedupe_results(results, seen_ids=None):
+    """
+    Merge results that point at the same canonical URL
+
+    The first copy keeps its place in the list. Later copies only add their
+    engine, rank and query type to its provenance.
+
+    Args:
+        results: Result dicts with a link, and optionally source_engine,
+            position and perspective_query_type
+        seen_ids: Optional set of content ids already returned. Matching
+            results are dropped, and the ids kept are added to it.
+
+    Returns:
+        New SearchResults with content_id, canonical_url, engines and provenance
+    """
+    merged = {}
+    for result in results:
+        link = result.get("link")
+        result_id = content_id(link)
+        if seen_ids is not None and result_id in seen_ids and result_id not in merged:
+            continue
+
+        entry = merged.get(result_id)
+        if entry is None:
+            entry = merged[result_id] = SearchResult(result)
+            entry.content_id = result_id
+            entry.canonical_url = canonicalize_url(link)
+            entry.engines = []
+            entry.provenance = []
+
+        engine = result.get("source_engine")
+        source = {
+            "engine": engine,
+            "rank": result.get("position"),
+            "query_type": result.get("perspective_query_type")
+        }
+        entry.provenance.append({key: value for key, value in source.items() if value is not None})
+        if engine and engine not in entry.engines:
+            entry.engines.append(engine)
+
+    if seen_ids is not None:
+        seen_ids.update(merged)
+    return list(merged.values())
@@ -0,0 +1,158 @@
+from perspective_engine.config.constants import PUBLIC_SUFFIX_LIST_PATH
+
+# Multi-label public suffixes we see in results. Any other host is treated as
+# having a one-label suffix. Set PUBLIC_SUFFIX_LIST_PATH to a copy of
+# https://publicsuffix.org/list/public_suffix_list.dat for the full list.
+# Hosting platforms (blogspot.com, substack.com, ...) are left out on purpose:
+# we classify them as platforms, so they must stay registrable domains.
+_DEFAULT_SUFFIX_RULES = [
+    "co.uk", "org.uk", "ac.uk", "gov.uk", "ltd.uk", "plc.uk", "me.uk", "nhs.uk", "police.uk",
+    "com.au", "net.au", "org.au", "edu.au", "gov.au", "asn.au", "id.au",
+    "co.nz", "org.nz", "govt.nz", "ac.nz",
+    "co.jp", "ne.jp", "or.jp", "ac.jp", "go.jp",
+    "co.in", "net.in", "org.in", "gov.in", "ac.in", "nic.in",
+    "co.za", "org.za", "gov.za", "ac.za",
+    "com.br", "gov.br", "org.br", "com.cn", "gov.cn", "edu.cn", "com.mx", "gob.mx",
+    "com.sg", "gov.sg", "edu.sg", "com.hk", "gov.hk", "co.kr", "go.kr", "ac.kr",
+    "gc.ca", "gov.ie"
+]
+
+class PublicSuffixes:
+    """
+    Public Suffix List rules: plain suffixes, *.wildcards and !exceptions
+
+    A host's public suffix is its longest matching rule; the registrable
+    domain is that suffix plus one more label.
+    """
+
+    def __init__(self, rules):
+        self._exact = set()
+        self._wildcards = set()
+        self._exceptions = set()
+        # Domains that some rule reaches below, e.g. "amazonaws.com" for "s3.amazonaws.com"
+        self._extended = set()
+        for rule in rules:
+            rule = rule.strip().lower()
+            if not rule or rule.startswith("//"):
+                continue
+            rule = rule.split()[0]
+            if rule.startswith("!"):
+                rule = rule[1:]
+                self._exceptions.add(rule)
+            elif rule.startswith("*."):
+                rule = rule[2:]
+                self._wildcards.add(rule)
+                self._extended.add(rule)
+            else:
+                self._exact.add(rule)
+            while "." in rule:
+                rule = rule.split(".", 1)[1]
+                self._extended.add(rule)
+
+    @classmethod
+    def load(cls, path=PUBLIC_SUFFIX_LIST_PATH):
+        """Read a public_suffix_list.dat file, or use the built-in rules without one"""
+        if path:
+            try:
+                with open(path, encoding="utf-8") as f:
+                    return cls(f)
+            except OSError as e:
+                print(f"Domain index: Could not read public suffix list {path}: {e}")
+        return cls(_DEFAULT_SUFFIX_RULES)
+
+    def suffix_length(self, labels):
+        """Number of trailing labels that form the public suffix"""
+        for index in range(len(labels)):
+            candidate = ".".join(labels[index:])
+            if candidate in self._exceptions:
+                return len(labels) - index - 1
+            if candidate in self._exact:
+                return len(labels) - index
+            if index + 1 < len(labels) and ".".join(labels[index + 1:]) in self._wildcards:
+                return len(labels) - index
+        return 1
+
+    def covers(self, domain):
+        """
+        True if every host under domain has a registrable domain at or below it
+
+        That holds when domain is not itself a public suffix and no rule
+        reaches below it, so a lookup that lands on it needs no further check.
+        """
+        return domain not in self._extended and self.registrable_domain(domain) is not None
+
+    def registrable_domain(self, host):
+        """e.g. "news.bbc.co.uk" -> "bbc.co.uk"; None for a bare public suffix"""
+        labels = [label for label in (host or "").lower().strip(".").split(".") if label]
+        keep = self.suffix_length(labels) + 1
+        if len(labels) < keep:
+            return None
+        return ".".join(labels[-keep:])
+
+public_suffixes = PublicSuffixes.load()
+
+def normalize_host(url_or_host):
+    """Lower-cased host of a URL or bare host name, without port, trailing dot or www."""
+    host = url_or_host.lower()
+    if "//" in host:
+        host = host.split("//", 1)[1]
+    host = host.split("/", 1)[0].split("?", 1)[0].split("#", 1)[0]
+    host = host.rsplit("@", 1)[-1].split(":", 1)[0].strip(".")
+    if host.startswith("www."):
+        host = host[4:]
+    return host
+
+class DomainIndex:
+    """
+    Labels for known domains, found by walking a host's suffixes
+
+    A lookup tries the host itself, then drops one label at a time down to its
+    registrable domain, so "edition.cnn.com" finds "cnn.com" but "notcnn.com"
+    and "cnn.com.evil.net" do not. Each step is one dict lookup, so the cost
+    depends on the host's label count, not on how many domains are indexed.
+    """
+
+    def __init__(self, suffixes=public_suffixes):
+        self.suffixes = suffixes
+        self._labels = {}
+        # Indexed domains that are always a valid match (see PublicSuffixes.covers)
+        self._covered = set()
+        # Bumped on every add, so anything derived from lookups can tell it is out of date
+        self.version = 0
+
+    def add(self, domain, label):
+        """Index a domain (or a subdomain, like "news.google.com") under a label. Earlier adds win."""
+        domain = normalize_host(domain)
+        self._labels.setdefault(domain, label)
+        self.version += 1
+        if self.suffixes.covers(domain):
+            self._covered.add(domain)
+
+    def add_all(self, domains, label):
+        for domain in domains:
+            self.add(domain, label)
+
+    def __len__(self):
+        return len(self._labels)
+
+    def lookup(self, host):
+        """
+        Find the most specific indexed domain that host belongs to
+
+        Returns:
+            (label, matched_domain), or (None, None) if no indexed domain covers host
+        """
+        host = normalize_host(host or "")
+        candidate = host
+        while candidate:
+            label = self._labels.get(candidate)
+            if label is not None:
+                if candidate in self._covered:
+                    return label, candidate
+                # Public suffixes are never matched, even if indexed
+                registrable = self.suffixes.registrable_domain(host)
+                if registrable is None or len(candidate) < len(registrable):
+                    return None, None
+                return label, candidate
+            candidate = candidate.partition(".")[2]
+        return None, None
@@ -0,0 +1,302 @@
+import argparse
+import csv
+import hashlib
+import json
+import mmap
+import os
+import struct
+import tempfile
+import threading
+import time
+from collections import namedtuple
+from perspective_engine.config.constants import DOMAIN_REPUTATION_DB_PATH, DOMAIN_REPUTATION_CHECK_SECONDS
+from perspective_engine.services.domain_index import normalize_host, public_suffixes
+
+# File layout, little-endian:
+#   header    magic, format version, slot count, entry count, metadata length
+#   metadata  JSON with the source type and perspective names the slots refer to
+#   slots     open-addressing hash table at most half full, probed linearly
+#   strings   the domains, UTF-8, at the offsets the slots give
+_MAGIC = b"PRDB"
+_FORMAT_VERSION = 1
+_HEADER = struct.Struct("<4sHxxIII")
+# Domain hash (0 marks an empty slot), string offset, string length,
+# source type index, reputation, perspective index
+_SLOT = struct.Struct("<QIBBBB")
+
+ReputationEntry = namedtuple("ReputationEntry", ["domain", "source_type", "reputation", "perspective"])
+
+def _domain_hash(key):
+    """64-bit hash of an encoded domain; stable across processes, never 0"""
+    return int.from_bytes(hashlib.blake2b(key, digest_size=8).digest(), "little") or 1
+
+def read_reputation_csv(path):
+    """
+    Yield (domain, source_type, reputation, perspective) rows from a CSV file
+
+    Raises:
+        ValueError: on a row without a domain or source type, or with a
+            reputation that is not an integer from 0 to 10
+    """
+    with open(path, newline="", encoding="utf-8") as f:
+        for line, row in enumerate(csv.DictReader(f), start=2):
+            domain = normalize_host((row.get("domain") or "").strip())
+            source_type = (row.get("source_type") or "").strip()
+            if not domain or not source_type:
+                raise ValueError(f"{path}:{line}: domain and source_type are required")
+            try:
+                reputation = int(row.get("reputation") or "")
+            except ValueError:
+                reputation = -1
+            if not 0 <= reputation <= 10:
+                raise ValueError(f"{path}:{line}: reputation must be an integer from 0 to 10")
+            yield domain, source_type, reputation, (row.get("perspective") or "").strip()
+
+def compile_reputation_db(rows, output_path):
+    """
+    Write rows to a database file, replacing any previous file atomically
+
+    The file is built next to output_path and renamed over it, so a worker
+    opening the path sees either the old file or the new one, never a mix.
+    The first row for a domain wins.
+
+    Returns:
+        Number of domains written
+    """
+    source_types, perspectives = [], [""]
+    type_ids, perspective_ids = {}, {"": 0}
+    entries = {}
+    for domain, source_type, reputation, perspective in rows:
+        key = normalize_host(domain).encode("utf-8")
+        if not key or len(key) > 255 or key in entries:
+            continue
+        if source_type not in type_ids:
+            type_ids[source_type] = len(source_types)
+            source_types.append(source_type)
+        if perspective not in perspective_ids:
+            perspective_ids[perspective] = len(perspectives)
+            perspectives.append(perspective)
+        entries[key] = (type_ids[source_type], reputation, perspective_ids[perspective])
+    if len(source_types) > 256 or len(perspectives) > 256:
+        raise ValueError("At most 256 source types and 256 perspectives are supported")
+
+    slot_count = 8
+    while slot_count < len(entries) * 2:
+        slot_count *= 2
+    mask = slot_count - 1
+    slots = bytearray(slot_count * _SLOT.size)
+    strings = bytearray()
+    for key, (type_id, reputation, perspective_id) in entries.items():
+        key_hash = _domain_hash(key)
+        index = key_hash & mask
+        while _SLOT.unpack_from(slots, index * _SLOT.size)[0]:
+            index = (index + 1) & mask
+        _SLOT.pack_into(slots, index * _SLOT.size, key_hash, len(strings), len(key), type_id, reputation, perspective_id)
+        strings += key
+    metadata = json.dumps({"source_types": source_types, "perspectives": perspectives}).encode("utf-8")
+
+    directory = os.path.dirname(os.path.abspath(output_path))
+    fd, temp_path = tempfile.mkstemp(dir=directory, prefix=".domain_reputation-")
+    try:
+        with os.fdopen(fd, "wb") as f:
+            f.write(_HEADER.pack(_MAGIC, _FORMAT_VERSION, slot_count, len(entries), len(metadata)))
+            f.write(metadata)
+            f.write(slots)
+            f.write(strings)
+            f.flush()
+            os.fsync(f.fileno())
+        os.replace(temp_path, output_path)
+    except BaseException:
+        os.unlink(temp_path)
+        raise
+    return len(entries)
+
+class ReputationTable:
+    """
+    One compiled database file, memory-mapped read-only
+
+    The pages belong to the OS page cache, so every worker process shares
+    them and a worker's own memory does not grow with the number of domains.
+    A lookup hashes the domain and reads a slot or two.
+
+    Every slot is checked once when the file is opened, so lookups can
+    trust what they read: a corrupt file raises ValueError here instead of
+    failing or looping forever in get().
+    """
+
+    def __init__(self, path):
+        with open(path, "rb") as f:
+            stat = os.fstat(f.fileno())
+            self.file_id = (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size)
+            if stat.st_size < _HEADER.size:
+                raise ValueError(f"{path} is not a domain reputation database")
+            self._map = mmap.mmap(f.fileno(), 0, access=mmap.ACCESS_READ)
+        try:
+            self._load(path)
+        except BaseException:
+            self._map.close()
+            raise
+
+    def _load(self, path):
+        magic, version, slot_count, self.entries, metadata_length = _HEADER.unpack_from(self._map, 0)
+        if magic != _MAGIC or version != _FORMAT_VERSION:
+            raise ValueError(f"{path} is not a version {_FORMAT_VERSION} domain reputation database")
+        # At most half full, so a probe always reaches an empty slot
+        if (not slot_count or slot_count & (slot_count - 1) or self.entries * 2 > slot_count or
+                len(self._map) < _HEADER.size + metadata_length + slot_count * _SLOT.size):
+            raise ValueError(f"{path} is truncated or corrupt")
+        metadata = json.loads(self._map[_HEADER.size:_HEADER.size + metadata_length])
+        if not isinstance(metadata, dict):
+            raise ValueError(f"{path} has corrupt metadata")
+        self.source_types = metadata.get("source_types")
+        self.perspectives = metadata.get("perspectives")
+        for names in (self.source_types, self.perspectives):
+            if not isinstance(names, list) or not all(isinstance(name, str) for name in names):
+                raise ValueError(f"{path} has corrupt metadata")
+        self._slots_at = _HEADER.size + metadata_length
+        self._strings_at = self._slots_at + slot_count * _SLOT.size
+        self._mask = slot_count - 1
+
+        strings_size = len(self._map) - self._strings_at
+        occupied = 0
+        slots = memoryview(self._map)[self._slots_at:self._strings_at]
+        try:
+            for slot_hash, offset, length, type_id, reputation, perspective_id in _SLOT.iter_unpack(slots):
+                if not slot_hash:
+                    continue
+                occupied += 1
+                if (type_id >= len(self.source_types) or perspective_id >= len(self.perspectives) or
+                        reputation > 10 or offset + length > strings_size):
+                    raise ValueError(f"{path} has a corrupt slot")
+        finally:
+            slots.release()
+        if occupied != self.entries:
+            raise ValueError(f"{path} lists {self.entries} domains but holds {occupied}")
+
+    def __len__(self):
+        return self.entries
+
+    def get(self, domain):
+        """Entry for exactly this (normalized) domain, or None"""
+        key = domain.encode("utf-8")
+        key_hash = _domain_hash(key)
+        index = key_hash & self._mask
+        while True:
+            slot_hash, offset, length, type_id, reputation, perspective_id = _SLOT.unpack_from(
+                self._map, self._slots_at + index * _SLOT.size
+            )
+            if not slot_hash:
+                return None
+            if slot_hash == key_hash and length == len(key):
+                start = self._strings_at + offset
+                if self._map[start:start + length] == key:
+                    return ReputationEntry(
+                        domain, self.source_types[type_id], reputation, self.perspectives[perspective_id] or None
+                    )
+            index = (index + 1) & self._mask
+
+class DomainReputationDB:
+    """
+    The reputation database at a path, reloaded when the file is replaced
+
+    At most every check_seconds a lookup stats the file; when a new build
+    has been renamed over it, the new file is mapped and swapped in with a
+    single assignment. Lookups already running keep the table they started
+    with, and the old mapping is closed once nothing refers to it. A file
+    that fails to open is reported and the current table stays in use.
+
+    Only ever replace the file by renaming a new build over it, as
+    compile_reputation_db does; writing into it in place changes pages the
+    workers have mapped.
+    """
+
+    def __init__(self, path=DOMAIN_REPUTATION_DB_PATH, check_seconds=DOMAIN_REPUTATION_CHECK_SECONDS):
+        self.path = path
+        self.check_seconds = check_seconds
+        # Bumped on every swap, so anything derived from lookups can tell it is out of date
+        self.version = 0
+        self._table = None
+        self._next_check = 0.0
+        self._lock = threading.Lock()
+        self._stats = {"reloads": 0, "reload_errors": 0}
+        self.refresh()
+
+    @property
+    def enabled(self):
+        return bool(self.path)
+
+    def refresh(self):
+        """Swap in a new build of the file if one is due to be checked and has appeared"""
+        if not self.path or time.monotonic() < self._next_check:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if now < self._next_check:
+                return
+            self._next_check = now + self.check_seconds
+            try:
+                stat = os.stat(self.path)
+            except OSError as e:
+                if self._table is None:
+                    print(f"Domain reputation: Could not read {self.path}: {e}")
+                return
+            current = self._table
+            if current is not None and current.file_id == (stat.st_dev, stat.st_ino, stat.st_mtime_ns, stat.st_size):
+                return
+            try:
+                table = ReputationTable(self.path)
+            except (OSError, ValueError, KeyError) as e:
+                self._stats["reload_errors"] += 1
+                print(f"Domain reputation: Could not load {self.path}: {e}")
+                return
+            self._table = table
+            self.version += 1
+            self._stats["reloads"] += 1
+            print(f"Domain reputation: Loaded {len(table)} domains from {self.path}")
+
+    def lookup(self, url_or_host):
+        """
+        Entry for the most specific listed domain a host belongs to
+
+        Tries the host itself, then drops one label at a time, as
+        DomainIndex.lookup does: a listed domain above the host's registrable
+        domain (a public suffix, say) never matches.
+
+        Returns:
+            A ReputationEntry, or None when the host is not listed
+        """
+        self.refresh()
+        table = self._table
+        if table is None:
+            return None
+        host = normalize_host(url_or_host or "")
+        candidate = host
+        while "." in candidate:
+            entry = table.get(candidate)
+            if entry is not None:
+                if public_suffixes.covers(candidate):
+                    return entry
+                registrable = public_suffixes.registrable_domain(host)
+                return entry if registrable is not None and len(candidate) >= len(registrable) else None
+            candidate = candidate.partition(".")[2]
+        return None
+
+    def stats(self):
+        """Return reload counters and the size of the loaded table"""
+        with self._lock:
+            stats = dict(self._stats)
+        table = self._table
+        stats["enabled"] = self.enabled
+        stats["version"] = self.version
+        stats["domains"] = len(table) if table is not None else 0
+        return stats
+
+domain_reputation = DomainReputationDB()
+
+if __name__ == "__main__":
+    parser = argparse.ArgumentParser(description="Compile a domain reputation CSV into a database file")
+    parser.add_argument("source", help="CSV with domain, source_type, reputation and perspective columns")
+    parser.add_argument("output", help="Database file to write (replaced atomically)")
+    args = parser.parse_args()
+    count = compile_reputation_db(read_reputation_csv(args.source), args.output)
+    print(f"Domain reputation: Wrote {count} domains to {args.output}")
@@ -0,0 +1,40 @@
+from perspective_engine.config.constants import FUSION_RRF_K, LLM_CLASSIFY_TOP_K
+
+def rrf_score(provenance, k=FUSION_RRF_K):
+    """Reciprocal rank fusion score: the sum of 1 / (k + rank) over every list a result appeared in"""
+    return sum(1.0 / (k + source["rank"]) for source in provenance if source.get("rank"))
+
+def fuse_results(results, k=FUSION_RRF_K):
+    """
+    Order deduplicated results by reciprocal rank fusion across engines and query types
+
+    Results found by several engines, or near the top of one, come first.
+    Ties keep their incoming order.
+
+    Args:
+        results: SearchResults from dedupe_results, each with a provenance list
+
+    Returns:
+        The same results, sorted, each with a fusion_score
+    """
+    for result in results:
+        result["fusion_score"] = round(rrf_score(result.get("provenance") or [], k), 6)
+    return sorted(results, key=lambda result: result["fusion_score"], reverse=True)
+
+def classify_within_budget(ranked_results, classify_fn, fallback_fn, top_k=LLM_CLASSIFY_TOP_K):
+    """
+    Send only the top_k ranked results to an expensive classifier
+
+    Args:
+        ranked_results: Results in display order
+        classify_fn: Classifier for the head, e.g. an LLM call
+        fallback_fn: Cheap classifier for the tail, e.g. rule-based labels
+
+    Returns:
+        Classified head followed by the classified tail
+    """
+    head, tail = ranked_results[:top_k], ranked_results[top_k:]
+    if not tail:
+        return classify_fn(head)
+    print(f"Fusion: AI classification for top {len(head)} of {len(ranked_results)} results, rules for the rest")
+    return list(classify_fn(head)) + list(fallback_fn(tail))
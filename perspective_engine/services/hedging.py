@@ -0,0 +1,117 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from functools import wraps
+from perspective_engine.config.constants import (
+    HEDGE_ENABLED, HEDGE_PERCENTILE, HEDGE_BUDGET_PERCENT, HEDGE_MIN_SAMPLES, HEDGE_MAX_WORKERS
+)
+from perspective_engine.services.latency import serp_latency
+
+_executor = ThreadPoolExecutor(max_workers=HEDGE_MAX_WORKERS, thread_name_prefix="serp-hedge")
+
+class HedgeBudget:
+    """
+    Allow hedges up to a percentage of primary calls
+
+    Every primary call earns budget_percent / 100 of a token and every hedge
+    spends one, so over time hedges never exceed that share of traffic.
+    """
+
+    def __init__(self, budget_percent=HEDGE_BUDGET_PERCENT, max_tokens=10.0):
+        self.ratio = budget_percent / 100.0
+        self.max_tokens = max_tokens
+        self._tokens = 0.0
+        self._lock = threading.Lock()
+        self._stats = {
+            "primary_calls": 0,
+            "hedges_sent": 0,
+            "hedges_won": 0,
+            "hedges_denied": 0
+        }
+
+    def record_primary(self):
+        with self._lock:
+            self._stats["primary_calls"] += 1
+            self._tokens = min(self.max_tokens, self._tokens + self.ratio)
+
+    def try_spend(self):
+        """Take one token for a hedge, returning False if the budget is used up"""
+        with self._lock:
+            if self._tokens >= 1.0:
+                self._tokens -= 1.0
+                self._stats["hedges_sent"] += 1
+                return True
+            self._stats["hedges_denied"] += 1
+            return False
+
+    def record_win(self):
+        with self._lock:
+            self._stats["hedges_won"] += 1
+
+    def stats(self):
+        with self._lock:
+            stats = dict(self._stats)
+            stats["tokens"] = round(self._tokens, 2)
+            return stats
+
+hedge_budget = HedgeBudget()
+
+def _timed_call(engine_name, fn):
+    """Run fn and record its latency when it returns results"""
+    start = time.monotonic()
+    results = fn()
+    # Empty lists are how the fetchers report errors, so keep them out of the latency window
+    if results:
+        serp_latency.record(engine_name, time.monotonic() - start)
+    return results
+
+def hedged_call(engine_name, fn):
+    """
+    Call fn, sending a duplicate if it runs past the engine's observed p95 latency
+
+    The first call to return results wins. The slower call cannot be
+    interrupted, so its answer is simply ignored.
+    """
+    hedge_budget.record_primary()
+    # Calls run in the caller's context so they keep its fan-out deadline
+    primary = _executor.submit(contextvars.copy_context().run, _timed_call, engine_name, fn)
+
+    threshold = None
+    if HEDGE_ENABLED and serp_latency.count(engine_name) >= HEDGE_MIN_SAMPLES:
+        threshold = serp_latency.percentile(engine_name, HEDGE_PERCENTILE)
+    if threshold is None:
+        return primary.result()
+
+    done, _ = wait([primary], timeout=threshold)
+    if done or not hedge_budget.try_spend():
+        return primary.result()
+
+    print(f"Hedging: {engine_name} slower than p{int(HEDGE_PERCENTILE)} ({int(threshold * 1000)}ms), sending duplicate")
+    hedge = _executor.submit(contextvars.copy_context().run, _timed_call, engine_name, fn)
+    pending = {primary, hedge}
+    results = []
+    while pending:
+        done, pending = wait(pending, return_when=FIRST_COMPLETED)
+        for future in done:
+            try:
+                results = future.result()
+            except Exception as e:
+                print(f"Hedging: {engine_name} call failed: {type(e).__name__} - {e}")
+                results = []
+            if results:
+                if future is hedge:
+                    hedge_budget.record_win()
+                return results
+    return results
+
+def hedged_serp_fetch(fetch_fn):
+    """Hedge slow calls to a fetch_results_via_serpapi implementation"""
+    @wraps(fetch_fn)
+    def wrapper(query, engine_name, api_key, num_results=10, start=0):
+        return hedged_call(
+            (engine_name or "").lower(),
+            lambda: fetch_fn(query, engine_name, api_key, num_results, start)
+        )
+
+    return wrapper
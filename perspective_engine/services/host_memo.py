@@ -0,0 +1,91 @@
+import threading
+from collections import OrderedDict
+from perspective_engine.config.constants import SOURCE_TYPE_MEMO_ENTRIES
+
+class HostRuleMemo:
+    """
+    Bounded LRU of a RuleSet's plan for each host
+
+    Results come from a few thousand hosts, so the plan for a host
+    (RuleSet.specialize) is built once and reused. Entries are keyed by the
+    URL authority as written ("www.bbc.co.uk", "example.com:8080"), which
+    host_of turns into the host only on a miss. When the host alone decides
+    the label, a warm host costs one dict lookup; otherwise only the checks
+    on path features that can still change the label are left to run.
+
+    With a reputation database, a host takes the database's source type when
+    it has one and the rules would only give it one of fallback_labels (by
+    default just the rule set's default), whatever its path. Labels the
+    rules give from the host, such as a known domain or a .gov suffix, win.
+    Everything is dropped when the rule set's known domains change or a new
+    database build is swapped in.
+    """
+
+    def __init__(self, rules, host_of, reputation=None, fallback_labels=None, max_entries=SOURCE_TYPE_MEMO_ENTRIES):
+        self.rules = rules
+        self.host_of = host_of
+        self.reputation = reputation
+        self.fallback_labels = frozenset(fallback_labels or [rules.default])
+        self.max_entries = max_entries
+        self._plans = OrderedDict()
+        self._version = self._current_version()
+        self._lock = threading.Lock()
+        self._stats = {"hits": 0, "misses": 0, "evictions": 0, "invalidations": 0}
+
+    def plan(self, authority):
+        """The rule plan for the host of a URL authority, built on first use"""
+        version = self._current_version()
+        with self._lock:
+            if version != self._version:
+                self._invalidate(version)
+            plan = self._plans.get(authority)
+            if plan is not None:
+                self._plans.move_to_end(authority)
+                self._stats["hits"] += 1
+                return plan
+            self._stats["misses"] += 1
+
+        plan = self._build(self.host_of(authority))
+        # Skip the store if the domains changed while the plan was built
+        if self._current_version() == version:
+            with self._lock:
+                if self._version == version:
+                    self._plans[authority] = plan
+                    while len(self._plans) > self.max_entries:
+                        self._plans.popitem(last=False)
+                        self._stats["evictions"] += 1
+        return plan
+
+    def clear(self):
+        with self._lock:
+            self._plans.clear()
+
+    def stats(self):
+        """Return hit/miss/eviction counters and the number of hosts held"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["entries"] = len(self._plans)
+            lookups = stats["hits"] + stats["misses"]
+            stats["hit_rate"] = round(stats["hits"] / lookups, 4) if lookups else 0.0
+            return stats
+
+    def _current_version(self):
+        if self.reputation is None:
+            return self.rules.version
+        self.reputation.refresh()
+        return self.rules.version, self.reputation.version
+
+    def _build(self, host):
+        plan = self.rules.specialize({"host": host})
+        # The last entry is the label once no path check holds
+        if self.reputation is not None and plan[-1][0] in self.fallback_labels:
+            entry = self.reputation.lookup(host)
+            if entry is not None:
+                return ((entry.source_type, ()),)
+        return plan
+
+    def _invalidate(self, version):
+        """Drop plans built against older domain lists. Caller holds the lock."""
+        self._plans.clear()
+        self._version = version
+        self._stats["invalidations"] += 1
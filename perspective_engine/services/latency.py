@@ -0,0 +1,67 @@
+import bisect
+import threading
+from collections import deque
+from perspective_engine.config.constants import LATENCY_WINDOW_SIZE, LATENCY_HISTOGRAM_BUCKETS_MS
+
+class LatencyTracker:
+    """Rolling per-engine latency samples with percentile and histogram views"""
+
+    def __init__(self, window_size=LATENCY_WINDOW_SIZE, buckets_ms=None):
+        self.window_size = window_size
+        self.buckets_ms = LATENCY_HISTOGRAM_BUCKETS_MS if buckets_ms is None else buckets_ms
+        self._samples = {}
+        self._lock = threading.Lock()
+
+    def record(self, engine_name, seconds):
+        """Record how long one call to an engine took"""
+        engine_name = (engine_name or "").lower()
+        with self._lock:
+            samples = self._samples.get(engine_name)
+            if samples is None:
+                samples = self._samples[engine_name] = deque(maxlen=self.window_size)
+            samples.append(seconds)
+
+    def count(self, engine_name):
+        """Return how many samples are in the window for an engine"""
+        with self._lock:
+            return len(self._samples.get((engine_name or "").lower(), ()))
+
+    def percentile(self, engine_name, pct):
+        """Return the pct-th percentile latency in seconds, or None without samples"""
+        with self._lock:
+            samples = sorted(self._samples.get((engine_name or "").lower(), ()))
+        if not samples:
+            return None
+        index = min(len(samples) - 1, max(0, int(round(pct / 100.0 * len(samples))) - 1))
+        return samples[index]
+
+    def histogram(self, engine_name):
+        """Return sample counts per latency bucket, keyed by the bucket's upper bound"""
+        with self._lock:
+            samples = list(self._samples.get((engine_name or "").lower(), ()))
+        counts = [0] * (len(self.buckets_ms) + 1)
+        for seconds in samples:
+            counts[bisect.bisect_left(self.buckets_ms, seconds * 1000)] += 1
+        labels = [f"<={bound}ms" for bound in self.buckets_ms] + [f">{self.buckets_ms[-1]}ms"]
+        return dict(zip(labels, counts))
+
+    def snapshot(self):
+        """Return p50/p95/p99 and the histogram for every engine seen so far"""
+        with self._lock:
+            engines = list(self._samples)
+        snapshot = {}
+        for engine_name in engines:
+            snapshot[engine_name] = {
+                "samples": self.count(engine_name),
+                "p50_ms": _to_ms(self.percentile(engine_name, 50)),
+                "p95_ms": _to_ms(self.percentile(engine_name, 95)),
+                "p99_ms": _to_ms(self.percentile(engine_name, 99)),
+                "histogram": self.histogram(engine_name)
+            }
+        return snapshot
+
+def _to_ms(seconds):
+    return None if seconds is None else int(seconds * 1000)
+
+# Shared by every SerpAPI call in the process
+serp_latency = LatencyTracker()
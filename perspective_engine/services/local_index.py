@@ -0,0 +1,182 @@
+import re
+import sqlite3
+import threading
+import time
+from collections.abc import Mapping
+from concurrent.futures import ThreadPoolExecutor
+from perspective_engine.config.constants import LOCAL_INDEX_DB_PATH, LOCAL_INDEX_MAX_BODY_CHARS
+from perspective_engine.services.dedup import content_id
+
+_SCHEMA = [
+    """CREATE TABLE IF NOT EXISTS documents (
+        id INTEGER PRIMARY KEY,
+        content_id TEXT UNIQUE NOT NULL,
+        link TEXT,
+        title TEXT,
+        snippet TEXT,
+        body TEXT,
+        perspective TEXT,
+        source_type_label TEXT,
+        updated_at REAL
+    )""",
+    """CREATE VIRTUAL TABLE IF NOT EXISTS documents_fts USING fts5(
+        title, snippet, body, content='documents', content_rowid='id', tokenize='porter unicode61'
+    )""",
+    """CREATE TRIGGER IF NOT EXISTS documents_ai AFTER INSERT ON documents BEGIN
+        INSERT INTO documents_fts(rowid, title, snippet, body) VALUES (new.id, new.title, new.snippet, new.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documents_ad AFTER DELETE ON documents BEGIN
+        INSERT INTO documents_fts(documents_fts, rowid, title, snippet, body) VALUES ('delete', old.id, old.title, old.snippet, old.body);
+    END""",
+    """CREATE TRIGGER IF NOT EXISTS documents_au AFTER UPDATE ON documents BEGIN
+        INSERT INTO documents_fts(documents_fts, rowid, title, snippet, body) VALUES ('delete', old.id, old.title, old.snippet, old.body);
+        INSERT INTO documents_fts(rowid, title, snippet, body) VALUES (new.id, new.title, new.snippet, new.body);
+    END"""
+]
+
+# New values win, but a missing value never erases one we already have. The
+# first link seen is kept, since later ones may be a tracking-laden variant.
+_UPSERT = """
+    INSERT INTO documents (content_id, link, title, snippet, body, perspective, source_type_label, updated_at)
+    VALUES (?, ?, ?, ?, ?, ?, ?, ?)
+    ON CONFLICT(content_id) DO UPDATE SET
+        link = COALESCE(link, excluded.link),
+        title = COALESCE(excluded.title, title),
+        snippet = COALESCE(excluded.snippet, snippet),
+        body = COALESCE(excluded.body, body),
+        perspective = COALESCE(excluded.perspective, perspective),
+        source_type_label = COALESCE(excluded.source_type_label, source_type_label),
+        updated_at = excluded.updated_at
+"""
+
+# Title matches count most, then snippets, then extracted page text
+_SEARCH = """
+    SELECT d.link, d.title, d.snippet, d.perspective, d.source_type_label,
+           snippet(documents_fts, 2, '', '', '...', 32)
+    FROM documents_fts JOIN documents d ON d.id = documents_fts.rowid
+    WHERE documents_fts MATCH ?
+    ORDER BY bm25(documents_fts, 10.0, 4.0, 1.0)
+    LIMIT ? OFFSET ?
+"""
+
+_WORD = re.compile(r"\w+", re.UNICODE)
+
+def to_fts_query(query, operator="AND"):
+    """Turn free text into an FTS5 query of quoted terms, so user input is never parsed as syntax"""
+    return f" {operator} ".join(f'"{word}"' for word in _WORD.findall(query.lower()))
+
+class LocalIndex:
+    """
+    SQLite FTS5 index of every result and page text the app has seen
+
+    Writes go through one background thread so requests never wait on them.
+    Searches use their own connection and run alongside writes under WAL.
+    """
+
+    def __init__(self, db_path=LOCAL_INDEX_DB_PATH):
+        self._writer = None
+        self._reader = None
+        self._read_lock = threading.Lock()
+        self._executor = None
+        if not db_path:
+            return
+        try:
+            self._writer = sqlite3.connect(db_path, check_same_thread=False)
+            self._writer.execute("PRAGMA journal_mode=WAL")
+            for statement in _SCHEMA:
+                self._writer.execute(statement)
+            self._writer.commit()
+            self._reader = sqlite3.connect(db_path, check_same_thread=False)
+            self._executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="local-index")
+        except sqlite3.Error as e:
+            print(f"Local index: Disabled, could not open {db_path}: {e}")
+            self._writer = self._reader = None
+
+    @property
+    def enabled(self):
+        return self._reader is not None
+
+    def add_results(self, results):
+        """Index search results, with any labels they carry, in the background"""
+        if not self.enabled:
+            return
+        now = time.time()
+        rows = [(
+            content_id(result.get("link")),
+            result.get("link"),
+            result.get("title"),
+            result.get("snippet"),
+            None,
+            result.get("perspective"),
+            result.get("source_type_label"),
+            now
+        ) for result in results if isinstance(result, Mapping) and result.get("link")]
+        if rows:
+            self._executor.submit(self._write, rows)
+
+    def add_page(self, url, text):
+        """Index the text extracted from a page in the background"""
+        if not self.enabled or not url or not text:
+            return
+        row = (content_id(url), url, None, None, text[:LOCAL_INDEX_MAX_BODY_CHARS], None, None, time.time())
+        self._executor.submit(self._write, [row])
+
+    def _write(self, rows):
+        try:
+            self._writer.executemany(_UPSERT, rows)
+            self._writer.commit()
+        except sqlite3.Error as e:
+            print(f"Local index: Write error: {e}")
+            self._writer.rollback()
+
+    def search(self, query, num_results=10, start=0):
+        """
+        Search the local index, best matches first
+
+        Every term must match; if that finds nothing, any term may.
+
+        Returns:
+            Result dicts shaped like fetch_results_via_serpapi's, from the "Local" engine
+        """
+        if not self.enabled:
+            return []
+        rows = []
+        for operator in ("AND", "OR"):
+            fts_query = to_fts_query(query, operator)
+            if not fts_query:
+                return []
+            try:
+                with self._read_lock:
+                    rows = self._reader.execute(_SEARCH, (fts_query, num_results, start)).fetchall()
+            except sqlite3.Error as e:
+                print(f"Local index: Search error: {e}")
+                return []
+            if rows:
+                break
+
+        results = []
+        for link, title, snippet, perspective, source_type_label, body_snippet in rows:
+            result = {
+                "title": title or link,
+                "link": link,
+                "snippet": snippet or body_snippet or "No snippet.",
+                "source_engine": "Local"
+            }
+            if perspective:
+                result["perspective"] = perspective
+            if source_type_label:
+                result["source_type_label"] = source_type_label
+            results.append(result)
+        print(f"Local index: Found {len(results)} results for '{query}'")
+        return results
+
+    def stats(self):
+        if not self.enabled:
+            return {"enabled": False}
+        with self._read_lock:
+            documents, pages = self._reader.execute(
+                "SELECT COUNT(*), COUNT(body) FROM documents"
+            ).fetchone()
+        return {"enabled": True, "documents": documents, "pages": pages}
+
+local_index = LocalIndex()
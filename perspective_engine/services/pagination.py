@@ -0,0 +1,82 @@
+import base64
+import json
+
+from perspective_engine.config.constants import SEARCH_CURSOR_MAX_SEEN
+
+# SerpAPI names the result offset differently per engine; Bing's is 1-based
+_OFFSET_PARAMS = {
+    "bing": ("first", 1)
+}
+
+def serp_page_params(engine_name, start):
+    """Return the SerpAPI parameters that ask an engine for results from an offset"""
+    if not start:
+        return {}
+    name, base = _OFFSET_PARAMS.get((engine_name or "").lower(), ("start", 0))
+    return {name: int(start) + base}
+
+def encode_cursor(query, engines, perspective, offsets, seen_ids):
+    """
+    Build an opaque cursor for the next page of a search
+
+    Args:
+        offsets: {engine: next result offset} for engines that may have more results
+        seen_ids: content_id of results already returned, oldest first. Only
+            the last SEARCH_CURSOR_MAX_SEEN are kept.
+    """
+    state = {
+        "q": query,
+        "e": list(engines),
+        "p": perspective,
+        "o": offsets,
+        "s": recent_seen_ids(seen_ids)
+    }
+    raw = json.dumps(state, separators=(",", ":")).encode("utf-8")
+    return base64.urlsafe_b64encode(raw).decode("ascii").rstrip("=")
+
+def recent_seen_ids(seen_ids):
+    """The last SEARCH_CURSOR_MAX_SEEN distinct ids, oldest first"""
+    return list(dict.fromkeys(seen_ids))[-SEARCH_CURSOR_MAX_SEEN:] if SEARCH_CURSOR_MAX_SEEN > 0 else []
+
+def decode_cursor(cursor):
+    """
+    Unpack a cursor made by encode_cursor
+
+    Returns:
+        dict with query, engines, perspective, offsets and seen_ids (a list,
+        oldest first)
+
+    Raises:
+        ValueError: if the cursor is malformed
+    """
+    try:
+        padded = cursor + "=" * (-len(cursor) % 4)
+        state = json.loads(base64.urlsafe_b64decode(padded.encode("ascii")))
+        return {
+            "query": str(state["q"]),
+            "engines": [str(engine) for engine in state["e"]],
+            "perspective": state.get("p", "balanced"),
+            "offsets": {str(engine): int(start) for engine, start in state["o"].items()},
+            "seen_ids": recent_seen_ids(str(result_id) for result_id in state.get("s", []))
+        }
+    except (ValueError, TypeError, KeyError, AttributeError) as e:
+        raise ValueError(f"Invalid cursor: {e}")
+
+def next_page_cursor(query, engines, perspective, offsets, fetched_counts, timed_out_engines, seen_ids, page_size):
+    """
+    Build the cursor for the page after this one, or None when every engine is exhausted
+
+    Engines that returned results move on by one page, engines that timed out
+    retry the same page, and engines that returned nothing are dropped.
+    """
+    next_offsets = {}
+    for engine in engines:
+        if engine not in offsets:
+            continue
+        if engine in timed_out_engines:
+            next_offsets[engine] = offsets[engine]
+        elif fetched_counts.get(engine, 0) > 0:
+            next_offsets[engine] = offsets[engine] + page_size
+    if not next_offsets:
+        return None
+    return encode_cursor(query, engines, perspective, next_offsets, seen_ids)
@@ -0,0 +1,146 @@
+from perspective_engine.services.domain_index import DomainIndex, normalize_host
+from perspective_engine.services.keyword_scanner import KeywordScanner
+
+# Condition tests, see perspective_engine/config/classification_rules.py.
+# "not_in" comes before "in" so "segment_not_in" is not read as "segment_not" + "in".
+TESTS = ("contains", "excludes", "prefixes", "suffixes", "not_in", "in")
+
+def split_condition(key):
+    """e.g. "path_contains" -> ("path", "contains")"""
+    for test in TESTS:
+        if key.endswith("_" + test):
+            return key[:-len(test) - 1], test
+    raise ValueError(f"Unknown rule condition '{key}'")
+
+class RuleSet:
+    """
+    An ordered, declarative rule table compiled for matching
+
+    At build time every domain condition goes into one DomainIndex and every
+    contains/excludes string of a field into one KeywordScanner for that
+    field. For each set of rules a known domain can satisfy, the rules left
+    to try are listed up front, so matching costs one domain lookup, one scan
+    per field, and set and tuple tests on the remaining rules in order.
+    """
+
+    def __init__(self, rules, default):
+        self.default = default
+        self._rules = []
+        self._domains = DomainIndex()
+        substrings = {}
+        domain_rules = {}
+
+        for rule_id, rule in enumerate(rules):
+            checks = []
+            for key, values in rule.items():
+                if key == "label":
+                    continue
+                if key == "domains":
+                    for domain in values:
+                        domain_rules.setdefault(normalize_host(domain), set()).add(rule_id)
+                    continue
+
+                field, test = split_condition(key)
+                if test in ("contains", "excludes"):
+                    values = frozenset(value.lower() for value in values)
+                    substrings.setdefault(field, set()).update(values)
+                elif test in ("prefixes", "suffixes"):
+                    values = tuple(values)
+                else:
+                    values = frozenset(values)
+                checks.append((test, field, values))
+            self._rules.append((rule["label"], tuple(checks), "domains" in rule))
+
+        # Rules to try for a host under no known domain (key None), and for
+        # each set of rules whose domain condition a known domain satisfies
+        self._plans = {None: [(label, checks) for label, checks, has_domains in self._rules if not has_domains]}
+        for domain, rule_ids in domain_rules.items():
+            rule_ids = frozenset(rule_ids)
+            self._domains.add(domain, rule_ids)
+            if rule_ids not in self._plans:
+                self._plans[rule_ids] = [
+                    (label, checks) for rule_id, (label, checks, has_domains) in enumerate(self._rules)
+                    if not has_domains or rule_id in rule_ids
+                ]
+        self._scanners = {
+            field: KeywordScanner({field: sorted(strings)}) for field, strings in substrings.items()
+        }
+
+    def __len__(self):
+        return len(self._rules)
+
+    @property
+    def version(self):
+        """Changes whenever the known domains change"""
+        return self._domains.version
+
+    def knows_domain(self, host):
+        """True if host is under one of the domains some rule lists"""
+        return self._domains.lookup(host)[0] is not None
+
+    def match(self, fields):
+        """
+        Label of the first rule that holds for fields
+
+        Args:
+            fields: {field name: lower-cased string}, e.g. {"host": ..., "path": ...}
+
+        Returns:
+            The rule's label, or the default when no rule holds
+        """
+        return self.match_plan(self._plans[self._domains.lookup(fields.get("host"))[0]], fields)
+
+    def specialize(self, fields):
+        """
+        The rules left to try once some fields, including the host, are known
+
+        Checks on the known fields are settled now. The plan keeps each rule
+        that may still hold, with only its checks on other fields, and stops
+        at the first rule with none left (the default when no rule is left).
+
+        Returns:
+            A plan for match_plan. A plan of one entry, (label, ()), means
+            the known fields alone decide the label.
+        """
+        plan = []
+        found = {}
+        for label, checks in self._plans[self._domains.lookup(fields.get("host"))[0]]:
+            rest = []
+            for check in checks:
+                if check[1] not in fields:
+                    rest.append(check)
+                elif not self._holds(check, fields, found):
+                    break
+            else:
+                plan.append((label, tuple(rest)))
+                if not rest:
+                    return tuple(plan)
+        plan.append((self.default, ()))
+        return tuple(plan)
+
+    def match_plan(self, plan, fields):
+        """Label of the first rule in plan (from specialize, or a domain plan) that holds for fields"""
+        # Each field is scanned once, when a rule first needs it
+        found = {}
+        for label, checks in plan:
+            for check in checks:
+                if not self._holds(check, fields, found):
+                    break
+            else:
+                return label
+        return self.default
+
+    def _holds(self, check, fields, found):
+        test, field, values = check
+        if test == "contains" or test == "excludes":
+            keywords = found.get(field)
+            if keywords is None:
+                keywords = found[field] = self._scanners[field].find(fields.get(field))
+            return keywords.isdisjoint(values) != (test == "contains")
+        if test == "prefixes":
+            return (fields.get(field) or "").startswith(values)
+        if test == "suffixes":
+            return (fields.get(field) or "").endswith(values)
+        if test == "in":
+            return fields.get(field, "") in values
+        return fields.get(field, "") not in values  # not_in
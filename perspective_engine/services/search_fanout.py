@@ -0,0 +1,114 @@
+import contextvars
+import threading
+import time
+from concurrent.futures import ThreadPoolExecutor, wait, FIRST_COMPLETED
+from perspective_engine.config.constants import SEARCH_MAX_WORKERS, SEARCH_DEADLINE_SECONDS
+
+# Shared across requests so the number of concurrent SerpAPI calls stays bounded
+_executor = ThreadPoolExecutor(max_workers=SEARCH_MAX_WORKERS, thread_name_prefix="serp-fanout")
+
+# Monotonic time by which the fan-out needs the engine call running in this context
+_call_deadline = contextvars.ContextVar("serp_call_deadline", default=None)
+
+_stats_lock = threading.Lock()
+_stats = {"calls": 0, "timed_out": 0, "cancelled": 0, "timed_out_running": 0}
+
+def call_time_left(limit):
+    """
+    Seconds an engine call may still take: limit, or less when the call runs
+    under a fan-out whose deadline is sooner
+
+    Fetchers use this as their HTTP timeout, so a call the fan-out has given
+    up on ends at the deadline instead of holding a worker for its full
+    timeout. Returns 0 when the deadline has already passed.
+    """
+    deadline = _call_deadline.get()
+    if deadline is None:
+        return limit
+    return max(0.0, min(limit, deadline - time.monotonic()))
+
+def _bounded_call(deadline, fetch_fn, query, engine):
+    token = _call_deadline.set(deadline)
+    try:
+        return fetch_fn(query, engine)
+    finally:
+        _call_deadline.reset(token)
+
+def _timed_out_call_done(future):
+    with _stats_lock:
+        _stats["timed_out_running"] -= 1
+
+def fanout_stats():
+    """Return call counters, including timed-out calls still holding a worker"""
+    with _stats_lock:
+        return dict(_stats)
+
+def iter_engine_results(query, engines, fetch_fn, deadline_seconds=SEARCH_DEADLINE_SECONDS):
+    """
+    Query every engine at once and yield results as each engine finishes
+
+    Args:
+        query: Search query string
+        engines: List of search engines to use (e.g., ['google', 'bing'])
+        fetch_fn: Callable taking (query, engine) and returning a list of results
+        deadline_seconds: Time budget shared by all engines
+
+    Yields:
+        (engine, results) tuples in completion order. Engines still running
+        when the deadline passes are yielded last as (engine, None).
+    """
+    engines = list(dict.fromkeys(engines))
+    deadline = time.monotonic() + deadline_seconds
+    pending = {_executor.submit(_bounded_call, deadline, fetch_fn, query, engine): engine for engine in engines}
+    with _stats_lock:
+        _stats["calls"] += len(pending)
+
+    while pending:
+        remaining = deadline - time.monotonic()
+        if remaining <= 0:
+            break
+
+        done, _ = wait(pending, timeout=remaining, return_when=FIRST_COMPLETED)
+        for future in done:
+            engine = pending.pop(future)
+            try:
+                yield engine, future.result() or []
+            except Exception as e:
+                print(f"Search fan-out: Error fetching results from {engine}: {type(e).__name__} - {e}")
+                yield engine, []
+
+    for future, engine in pending.items():
+        # A call that has started cannot be cancelled; its HTTP timeout ends it soon after the deadline
+        with _stats_lock:
+            _stats["timed_out"] += 1
+            if future.cancel():
+                _stats["cancelled"] += 1
+            else:
+                _stats["timed_out_running"] += 1
+                future.add_done_callback(_timed_out_call_done)
+        print(f"Search fan-out: {engine} missed the {deadline_seconds}s deadline")
+        yield engine, None
+
+def fetch_engines_concurrently(query, engines, fetch_fn, deadline_seconds=SEARCH_DEADLINE_SECONDS):
+    """
+    Query every engine at once and merge the results in the order engines were given
+
+    Returns:
+        (results, timed_out_engines) - the merged result list and the engines
+        that did not answer before the deadline
+    """
+    engines = list(dict.fromkeys(engines))
+    by_engine = {}
+    timed_out = []
+
+    for engine, engine_results in iter_engine_results(query, engines, fetch_fn, deadline_seconds):
+        if engine_results is None:
+            timed_out.append(engine)
+        else:
+            by_engine[engine] = engine_results
+
+    results = []
+    for engine in engines:
+        results.extend(by_engine.get(engine, []))
+
+    return results, timed_out
@@ -0,0 +1,129 @@
+import json
+import queue
+import threading
+from datetime import datetime, timedelta, timezone
+from perspective_engine.config.constants import (
+    CACHE_WARMER_TOP_N, CACHE_WARMER_LOOKBACK_HOURS, SEARCH_HISTORY_QUEUE_SIZE, SEARCH_HISTORY_BATCH_SIZE
+)
+from perspective_engine.services.suggest import query_suggester
+
+class SearchHistoryWriter:
+    """
+    Save searches to SearchHistory on a background thread
+
+    Searches only put their row on a bounded queue; the writer commits what
+    has queued up in batches of up to batch_size. When the database is slow
+    or down and the queue fills, new rows are dropped and counted rather
+    than holding up searches.
+    """
+
+    def __init__(self, max_queued=SEARCH_HISTORY_QUEUE_SIZE, batch_size=SEARCH_HISTORY_BATCH_SIZE):
+        self.batch_size = batch_size
+        self._queue = queue.Queue(maxsize=max_queued)
+        self._thread = None
+        self._lock = threading.Lock()
+        self._stats = {"written": 0, "dropped": 0, "failed": 0}
+
+    def start(self, app):
+        """Start writing in the background for a Flask app. Safe to call more than once."""
+        with self._lock:
+            if self._thread is not None:
+                return
+            self._thread = threading.Thread(target=self._run, args=(app,), name="search-history-writer", daemon=True)
+            self._thread.start()
+        print("Search history: Writer started")
+
+    def enqueue(self, row):
+        """Queue a dict of SearchHistory columns, returning False if it was dropped"""
+        try:
+            self._queue.put_nowait(row)
+            return True
+        except queue.Full:
+            self._count("dropped")
+            return False
+
+    def write(self, rows):
+        """Commit rows to SearchHistory. Needs an app context; errors are logged."""
+        from perspective_engine.extensions import db
+        from perspective_engine.models import SearchHistory
+
+        try:
+            db.session.add_all([SearchHistory(**row) for row in rows])
+            db.session.commit()
+            self._count("written", len(rows))
+        except Exception as e:
+            print(f"Search history: Error saving {len(rows)} searches: {e}")
+            db.session.rollback()
+            self._count("failed", len(rows))
+
+    def stats(self):
+        """Return written/dropped/failed row counts and the queue length"""
+        with self._lock:
+            stats = dict(self._stats)
+        stats["queued"] = self._queue.qsize()
+        return stats
+
+    def _run(self, app):
+        while True:
+            rows = [self._queue.get()]
+            while len(rows) < self.batch_size:
+                try:
+                    rows.append(self._queue.get_nowait())
+                except queue.Empty:
+                    break
+            try:
+                with app.app_context():
+                    self.write(rows)
+            except Exception as e:
+                print(f"Search history: Writer failed: {type(e).__name__} - {e}")
+
+    def _count(self, name, amount=1):
+        with self._lock:
+            self._stats[name] += amount
+
+search_history_writer = SearchHistoryWriter()
+
+def record_search(query, engines, perspective, results_count, user_id=None):
+    """Queue a search to be saved to SearchHistory. Never blocks on the database."""
+    search_history_writer.enqueue({
+        "user_id": user_id,
+        "query": query[:500],
+        "engines_used": json.dumps(list(engines)),
+        "perspective": perspective,
+        "results_count": results_count,
+        "created_at": datetime.now(timezone.utc)
+    })
+    
+    query_suggester.add(query, user=user_id)
+
+def popular_queries(top_n=CACHE_WARMER_TOP_N, lookback_hours=CACHE_WARMER_LOOKBACK_HOURS):
+    """
+    Find the most searched queries in SearchHistory over the lookback window
+
+    Returns:
+        List of (query, engines) pairs, most frequent first, ties broken by
+        the most recent search
+    """
+    from sqlalchemy import func
+    from perspective_engine.extensions import db
+    from perspective_engine.models import SearchHistory
+
+    since = datetime.now(timezone.utc) - timedelta(hours=lookback_hours)
+    normalized_query = func.lower(SearchHistory.query)
+    rows = (
+        db.session.query(normalized_query, SearchHistory.engines_used)
+        .filter(SearchHistory.created_at >= since)
+        .group_by(normalized_query, SearchHistory.engines_used)
+        .order_by(func.count(SearchHistory.id).desc(), func.max(SearchHistory.created_at).desc())
+        .limit(top_n)
+        .all()
+    )
+
+    popular = []
+    for query, engines_used in rows:
+        try:
+            engines = json.loads(engines_used) if engines_used else ["google"]
+        except ValueError:
+            engines = ["google"]
+        popular.append((query, engines))
+    return popular
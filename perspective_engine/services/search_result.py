@@ -0,0 +1,131 @@
+from collections import namedtuple
+from collections.abc import MutableMapping
+from enum import Enum
+from perspective_engine.config.classification_rules import SOURCE_TYPE_RULES, SOURCE_TYPE_DEFAULT
+
+# Every label classify_source_type gives: the rule labels, the default, and
+# its labels for a missing or unparseable URL
+_SOURCE_TYPE_LABELS = dict.fromkeys(
+    [rule["label"] for rule in SOURCE_TYPE_RULES] + [SOURCE_TYPE_DEFAULT, "unknown_url", "unknown_error_parsing"]
+)
+SourceType = Enum("SourceType", [(label.upper(), label) for label in _SOURCE_TYPE_LABELS], module=__name__, type=str)
+
+class Perspective(str, Enum):
+    MAINSTREAM = "mainstream"
+    ALTERNATIVE = "alternative"
+    NEUTRAL = "neutral"
+
+class Credibility(str, Enum):
+    HIGH = "high"
+    MEDIUM = "medium"
+    LOW = "low"
+    UNKNOWN = "unknown"
+
+CredibilityFactors = namedtuple(
+    "CredibilityFactors", ["source_reputation", "evidence_quality", "bias_level", "transparency"]
+)
+
+# Label strings are swapped for the shared enum member; values outside the
+# enum (e.g. a reputation database source type or an unexpected LLM label)
+# are kept as they are
+_LABELS = {
+    "source_type_label": SourceType._value2member_map_,
+    "perspective": Perspective._value2member_map_,
+    "source_credibility": Credibility._value2member_map_
+}
+
+_FIELDS = (
+    "title", "link", "snippet", "source_engine", "position", "perspective_query_type",
+    "content_id", "canonical_url", "engines", "provenance", "fusion_score",
+    "source_type_label", "source_credibility", "intrinsic_credibility_score",
+    "credibility_factors", "perspective"
+)
+_FIELD_SET = frozenset(_FIELDS)
+
+class SearchResult(MutableMapping):
+    """
+    One search result on its way through dedup, fusion and scoring
+
+    Known fields live in slots rather than a per-result dict, labels are
+    interned enum members and credibility factors are a tuple. It still reads
+    and writes like a dict, so scoring and classification code is unchanged.
+    Use to_dict() where results leave the process.
+    """
+
+    __slots__ = _FIELDS + ("_extra",)
+
+    def __init__(self, values=None):
+        # Keys without a slot, created on first use
+        self._extra = None
+        if values:
+            for key, value in values.items():
+                self[key] = value
+
+    def __getitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                return getattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+        if self._extra is not None and key in self._extra:
+            return self._extra[key]
+        raise KeyError(key)
+
+    def get(self, key, default=None):
+        if key in _FIELD_SET:
+            return getattr(self, key, default)
+        return self._extra.get(key, default) if self._extra is not None else default
+
+    def __setitem__(self, key, value):
+        if key in _FIELD_SET:
+            labels = _LABELS.get(key)
+            if labels is not None and isinstance(value, str):
+                value = labels.get(value, value)
+            elif key == "credibility_factors" and isinstance(value, dict):
+                value = CredibilityFactors(**value)
+            setattr(self, key, value)
+            return
+        if self._extra is None:
+            self._extra = {}
+        self._extra[key] = value
+
+    def __delitem__(self, key):
+        if key in _FIELD_SET:
+            try:
+                delattr(self, key)
+            except AttributeError:
+                raise KeyError(key) from None
+            return
+        if self._extra is None or key not in self._extra:
+            raise KeyError(key)
+        del self._extra[key]
+
+    def __contains__(self, key):
+        if key in _FIELD_SET:
+            return hasattr(self, key)
+        return self._extra is not None and key in self._extra
+
+    def __iter__(self):
+        for key in _FIELDS:
+            if hasattr(self, key):
+                yield key
+        if self._extra is not None:
+            yield from self._extra
+
+    def __len__(self):
+        return sum(1 for _ in self)
+
+    def to_dict(self):
+        """Plain JSON-ready dict, as results looked before this type existed"""
+        data = {}
+        for key in self:
+            value = self[key]
+            if isinstance(value, Enum):
+                value = value.value
+            elif isinstance(value, CredibilityFactors):
+                value = value._asdict()
+            data[key] = value
+        return data
+
+    def __repr__(self):
+        return f"SearchResult({self.to_dict()!r})"
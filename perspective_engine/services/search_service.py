@@ -1,5 +1,13 @@
-from serpapi import SerpApiClient
-import os
+import time
+from perspective_engine.services.circuit_breaker import serp_breakers, serp_timeout_for
+from perspective_engine.services.dedup import dedupe_results
+from perspective_engine.services.pagination import serp_page_params
+from perspective_engine.services.search_fanout import fetch_engines_concurrently, call_time_left
+from perspective_engine.services.hedging import hedged_serp_fetch
+from perspective_engine.services.serp_cache import cached_serp_fetch
+from perspective_engine.services.serp_key_pool import pooled_serp_key, serp_key_pool
+from perspective_engine.services.api_key_service import get_user_api_key
+from perspective_engine.services.serp_payload import SERP_JSON_RESTRICTOR, parse_serp_payload, make_serp_client
 
 def search(query, engines, user_id=None):
     """
@@ -13,31 +21,44 @@ def search(query, engines, user_id=None):
     Returns:
         List of search results with classification
     """
-    # Use hardcoded API key
-    serpapi_key = os.getenv("SERPAPI_KEY", "YOUR_SERPAPI_KEY_HERE")
+    # The key pool supplies server keys; the user's own key joins it if they have one
+    serpapi_key = get_user_api_key(user_id, "serpapi")
     
-    print(f"Search service: Using hardcoded API key")
+    print(f"Search service: Using {'user' if serpapi_key else 'server'} SerpAPI key pool")
     
     all_results = []
     
-    # Collect results from each selected engine
-    for engine in engines:
-        try:
-            engine_results = fetch_results_via_serpapi(query, engine, serpapi_key)
-            all_results.extend(engine_results)
-            print(f"Got {len(engine_results)} results from {engine}")
-        except Exception as e:
-            print(f"Error fetching results from {engine}: {e}")
+    # Collect results from all selected engines at once
+    all_results, timed_out_engines = fetch_engines_concurrently(
+        query,
+        engines,
+        lambda q, engine: fetch_results_via_serpapi(q, engine, serpapi_key)
+    )
+    all_results = dedupe_results(all_results)
+    print(f"Got {len(all_results)} results from {len(engines) - len(timed_out_engines)} engines")
     
     # If no results from API, use mock results
     if not all_results:
         print("No results from SerpAPI, using mock results")
         all_results = get_mock_results(query)
-def fetch_results_via_serpapi(query, engine_name, api_key, num_results=10):
-    """Fetch search results from SerpAPI"""
+@cached_serp_fetch
+@hedged_serp_fetch
+@pooled_serp_key
+def fetch_results_via_serpapi(query, engine_name, api_key, num_results=10, start=0):
+    """
+    Fetch search results from SerpAPI
+
+    The one implementation behind the search service, /search and the cache
+    warmer, wrapped in the SERP cache, hedging and the key pool.
+    """
     if not api_key:
         print(f"No API key for {engine_name}")
         return []
+    
+    breaker = serp_breakers.get(engine_name)
+    if not breaker.allow_request():
+        print(f"SerpApi: Circuit open for {engine_name}, skipping")
+        return []
         
     params = {
         "q": query,
@@ -45,18 +66,32 @@ def fetch_results_via_serpapi(query, engine_name, api_key, num_results=10):
         "api_key": api_key,
         "num": num_results,
         "hl": "en",
-        "gl": "us"
+        "gl": "us",
+        "json_restrictor": SERP_JSON_RESTRICTOR
     }
+    params.update(serp_page_params(engine_name, start))
     
-    print(f"SerpApi: Querying {engine_name} for '{query}' (num:{num_results})")
+    # Never wait past the fan-out deadline for an answer nobody will read
+    timeout = call_time_left(serp_timeout_for(engine_name))
+    if timeout <= 0:
+        print(f"SerpApi: No time left to query {engine_name} for '{query}'")
+        return []
+    print(f"SerpApi: Querying {engine_name} for '{query}' (num:{num_results}, start:{start}, timeout:{timeout:.1f}s)")
     
+    started = time.monotonic()
     try:
-        s_client = SerpApiClient(params)
-        r_data = s_client.get_dict()
-        o_results = r_data.get("organic_results", [])
+        s_client = make_serp_client(params, timeout)
+        response = s_client.get_response()
+        serp_key_pool.record_status(api_key, response.status_code)
+        if response.status_code == 429 or response.status_code >= 500:
+            breaker.record_failure()
+            print(f"SerpApi: {engine_name} returned HTTP {response.status_code}")
+            return []
+        o_results, error = parse_serp_payload(response.content)
+        breaker.record_success(time.monotonic() - started)
         
         if not o_results:
-            print(f"SerpApi: No organic_results for '{query}' on {engine_name}. Response: {r_data.get('error', 'Unknown')}")
+            print(f"SerpApi: No organic_results for '{query}' on {engine_name}. Response: {error or 'Unknown'}")
             return []
             
         p_results = [{
@@ -70,6 +105,7 @@ def fetch_results_via_serpapi(query, engine_name, api_key, num_results=10):
         return p_results
         
     except Exception as e:
+        breaker.record_failure()
         print(f"SerpApi: Error {engine_name}: {type(e).__name__} - {e}")
         return []
 
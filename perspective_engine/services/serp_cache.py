@@ -0,0 +1,350 @@
+import json
+import sqlite3
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+from perspective_engine.config.constants import (
+    SERP_CACHE_MEMORY_ENTRIES, SERP_CACHE_DB_PATH, SERP_CACHE_DB_MAX_ENTRIES,
+    SERP_CACHE_DEFAULT_TTL_SECONDS, SERP_CACHE_TTL_SECONDS,
+    SERP_CACHE_MAX_STALENESS_SECONDS, SERP_CACHE_REFRESH_WORKERS, SERP_CACHE_ACCESS_RESOLUTION_SECONDS
+)
+
+# Prune the SQLite tier every N writes rather than on every insert
+_PRUNE_EVERY = 50
+
+def make_cache_key(query, engine_name, num_results=10, hl="en", gl="us", start=0):
+    """Build a cache key from normalized search parameters"""
+    normalized_query = " ".join((query or "").lower().split())
+    return "|".join([
+        normalized_query,
+        (engine_name or "").lower(),
+        str(int(num_results)),
+        (hl or "").lower(),
+        (gl or "").lower(),
+        str(int(start or 0))
+    ])
+
+def _copy_results(results):
+    """Copy result dicts so callers can annotate them without touching the cache"""
+    return [dict(result) for result in results]
+
+class SerpCache:
+    """
+    Two-tier SERP response cache: in-process LRU backed by SQLite
+
+    The memory tier and counters are guarded by _lock and the SQLite
+    connection by its own _db_lock, so a memory hit never waits behind
+    disk I/O.
+    """
+
+    def __init__(self, memory_entries=SERP_CACHE_MEMORY_ENTRIES, db_path=SERP_CACHE_DB_PATH,
+                 db_max_entries=SERP_CACHE_DB_MAX_ENTRIES, ttls=None,
+                 default_ttl=SERP_CACHE_DEFAULT_TTL_SECONDS,
+                 max_staleness=SERP_CACHE_MAX_STALENESS_SECONDS,
+                 access_resolution=SERP_CACHE_ACCESS_RESOLUTION_SECONDS):
+        self.memory_entries = memory_entries
+        self.db_max_entries = db_max_entries
+        self.ttls = SERP_CACHE_TTL_SECONDS if ttls is None else ttls
+        self.default_ttl = default_ttl
+        self.max_staleness = max_staleness
+        self.access_resolution = access_resolution
+
+        self._memory = OrderedDict()
+        self._lock = threading.Lock()
+        self._db_lock = threading.Lock()
+        self._writes_since_prune = 0
+        self._stats = {
+            "memory_hits": 0,
+            "disk_hits": 0,
+            "misses": 0,
+            "stale_hits": 0,
+            "stores": 0,
+            "memory_evictions": 0,
+            "disk_evictions": 0
+        }
+
+        self._db = None
+        if db_path:
+            try:
+                self._db = sqlite3.connect(db_path, check_same_thread=False)
+                self._db.execute(
+                    "CREATE TABLE IF NOT EXISTS serp_cache ("
+                    "key TEXT PRIMARY KEY, engine TEXT NOT NULL, results TEXT NOT NULL, "
+                    "stored_at REAL NOT NULL, last_access REAL NOT NULL)"
+                )
+                self._db.execute(
+                    "CREATE INDEX IF NOT EXISTS ix_serp_cache_last_access ON serp_cache (last_access)"
+                )
+                self._db.commit()
+            except sqlite3.Error as e:
+                print(f"SERP cache: SQLite tier disabled ({e})")
+                self._db = None
+
+    def ttl_for(self, engine_name):
+        """Return the time-to-live in seconds for an engine"""
+        return self.ttls.get((engine_name or "").lower(), self.default_ttl)
+
+    def get(self, key, engine_name):
+        """Return cached results for a key, or None if missing or expired"""
+        entry = self.get_entry(key, engine_name, max_staleness=0)
+        return entry[0] if entry else None
+
+    def get_entry(self, key, engine_name, max_staleness=None):
+        """
+        Look up a key, allowing entries up to max_staleness seconds past their TTL
+
+        Returns:
+            (results, age_seconds, is_stale) or None if missing or too old
+        """
+        ttl = self.ttl_for(engine_name)
+        if max_staleness is None:
+            max_staleness = self.max_staleness
+        max_age = ttl + max(0, min(max_staleness, self.max_staleness))
+        now = time.time()
+
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                if now - entry[0] < max_age:
+                    self._memory.move_to_end(key)
+                    return self._hit("memory_hits", entry[0], entry[1], now, ttl)
+                if now - entry[0] >= ttl + self.max_staleness:
+                    del self._memory[key]
+            if self._db is None:
+                self._stats["misses"] += 1
+                return None
+
+        row = None
+        with self._db_lock:
+            try:
+                row = self._db.execute(
+                    "SELECT results, stored_at, last_access FROM serp_cache WHERE key = ?", (key,)
+                ).fetchone()
+                if row and now - row[1] < max_age and now - row[2] >= self.access_resolution:
+                    self._db.execute(
+                        "UPDATE serp_cache SET last_access = ? WHERE key = ?", (now, key)
+                    )
+                    self._db.commit()
+            except sqlite3.Error as e:
+                print(f"SERP cache: SQLite read error: {e}")
+        if row and now - row[1] < max_age:
+            results = json.loads(row[0])
+        else:
+            row = None
+
+        with self._lock:
+            if row is None:
+                self._stats["misses"] += 1
+                return None
+            self._remember(key, row[1], results)
+            return self._hit("disk_hits", row[1], results, now, ttl)
+
+    def age(self, key):
+        """Seconds since a key was stored, or None if it is not cached. Does not count as a hit."""
+        with self._lock:
+            entry = self._memory.get(key)
+            if entry is not None:
+                return time.time() - entry[0]
+        if self._db is None:
+            return None
+        with self._db_lock:
+            try:
+                row = self._db.execute("SELECT stored_at FROM serp_cache WHERE key = ?", (key,)).fetchone()
+            except sqlite3.Error as e:
+                print(f"SERP cache: SQLite read error: {e}")
+                return None
+        return time.time() - row[0] if row else None
+
+    def memory_ages(self, keys):
+        """Seconds since each key was stored, for the keys in the memory tier. Never reads SQLite."""
+        now = time.time()
+        with self._lock:
+            return {key: now - self._memory[key][0] for key in keys if key in self._memory}
+
+    def cached_queries(self, limit):
+        """Return (query, stored_at) for up to limit cached first pages, newest first"""
+        with self._lock:
+            entries = [(key, entry[0]) for key, entry in self._memory.items()]
+        if self._db is not None:
+            with self._db_lock:
+                try:
+                    entries += self._db.execute(
+                        "SELECT key, stored_at FROM serp_cache ORDER BY stored_at DESC LIMIT ?", (limit,)
+                    ).fetchall()
+                except sqlite3.Error as e:
+                    print(f"SERP cache: SQLite read error: {e}")
+
+        queries = {}
+        for key, stored_at in entries:
+            # Keys end in engine, num, hl, gl and start; the query may contain "|"
+            parts = key.rsplit("|", 5)
+            if len(parts) == 6 and parts[5] == "0":
+                queries[parts[0]] = max(stored_at, queries.get(parts[0], 0))
+        return sorted(queries.items(), key=lambda item: item[1], reverse=True)[:limit]
+
+    def set(self, key, engine_name, results):
+        """Store results in both tiers"""
+        now = time.time()
+        results = _copy_results(results)
+
+        with self._lock:
+            self._remember(key, now, results)
+            self._stats["stores"] += 1
+        if self._db is None:
+            return
+
+        evicted = 0
+        with self._db_lock:
+            try:
+                self._db.execute(
+                    "INSERT OR REPLACE INTO serp_cache (key, engine, results, stored_at, last_access) "
+                    "VALUES (?, ?, ?, ?, ?)",
+                    (key, (engine_name or "").lower(), json.dumps(results), now, now)
+                )
+                self._db.commit()
+                self._writes_since_prune += 1
+                if self._writes_since_prune >= _PRUNE_EVERY:
+                    evicted = self._prune_disk()
+            except sqlite3.Error as e:
+                print(f"SERP cache: SQLite write error: {e}")
+        if evicted:
+            with self._lock:
+                self._stats["disk_evictions"] += evicted
+
+    def clear(self):
+        """Drop every entry from both tiers"""
+        with self._lock:
+            self._memory.clear()
+        if self._db is not None:
+            with self._db_lock:
+                try:
+                    self._db.execute("DELETE FROM serp_cache")
+                    self._db.commit()
+                except sqlite3.Error as e:
+                    print(f"SERP cache: SQLite clear error: {e}")
+
+    def stats(self):
+        """Return hit/miss counters and tier sizes"""
+        with self._lock:
+            stats = dict(self._stats)
+            stats["memory_entries"] = len(self._memory)
+            lookups = stats["memory_hits"] + stats["disk_hits"] + stats["misses"]
+            stats["hit_rate"] = round((stats["memory_hits"] + stats["disk_hits"]) / lookups, 4) if lookups else 0.0
+            return stats
+
+    def _hit(self, tier, stored_at, results, now, ttl):
+        """Count a hit and build get_entry's return value. Caller holds the lock."""
+        age = now - stored_at
+        is_stale = age >= ttl
+        self._stats[tier] += 1
+        if is_stale:
+            self._stats["stale_hits"] += 1
+        return _copy_results(results), age, is_stale
+
+    def _remember(self, key, stored_at, results):
+        """Insert into the memory tier, evicting least recently used entries. Caller holds the lock."""
+        current = self._memory.get(key)
+        # A newer store may have landed while a disk row was being read
+        if current is not None and current[0] > stored_at:
+            return
+        self._memory[key] = (stored_at, results)
+        self._memory.move_to_end(key)
+        while len(self._memory) > self.memory_entries:
+            self._memory.popitem(last=False)
+            self._stats["memory_evictions"] += 1
+
+    def _prune_disk(self):
+        """
+        Drop expired rows and keep the SQLite tier under its size bound.
+        Caller holds the database lock.
+
+        Returns:
+            Number of rows dropped
+        """
+        self._writes_since_prune = 0
+        oldest_allowed = time.time() - max([self.default_ttl] + list(self.ttls.values())) - self.max_staleness
+        expired = self._db.execute("DELETE FROM serp_cache WHERE stored_at < ?", (oldest_allowed,)).rowcount
+        overflow = self._db.execute(
+            "DELETE FROM serp_cache WHERE key IN ("
+            "SELECT key FROM serp_cache ORDER BY last_access DESC LIMIT -1 OFFSET ?)",
+            (self.db_max_entries,)
+        ).rowcount
+        self._db.commit()
+        return max(expired, 0) + max(overflow, 0)
+
+serp_cache = SerpCache()
+
+# Background refreshes for stale entries, deduplicated by cache key
+_refresh_executor = ThreadPoolExecutor(max_workers=SERP_CACHE_REFRESH_WORKERS, thread_name_prefix="serp-refresh")
+_refreshing = set()
+_refreshing_lock = threading.Lock()
+
+def _schedule_refresh(key, fetch_fn, query, engine_name, api_key, num_results, start):
+    """Re-fetch a stale entry in the background unless a refresh is already running"""
+    with _refreshing_lock:
+        if key in _refreshing:
+            return
+        _refreshing.add(key)
+
+    def refresh():
+        try:
+            results = fetch_fn(query, engine_name, api_key, num_results, start)
+            if results:
+                serp_cache.set(key, engine_name, results)
+                print(f"SERP cache: Refreshed '{query}' on {engine_name}")
+        except Exception as e:
+            print(f"SERP cache: Refresh failed for '{query}' on {engine_name}: {type(e).__name__} - {e}")
+        finally:
+            with _refreshing_lock:
+                _refreshing.discard(key)
+
+    _refresh_executor.submit(refresh)
+
+def fetch_with_freshness(fetch_fn, query, engine_name, api_key, num_results=10, start=0, max_staleness=None):
+    """
+    Serve from the SERP cache, falling back to fetch_fn on a miss
+
+    Stale entries are returned immediately and refreshed in the background.
+
+    Returns:
+        (results, freshness) where freshness is a dict with "status"
+        ("fresh", "stale" or "live") and "age_seconds"
+    """
+    key = make_cache_key(query, engine_name, num_results, start=start)
+    entry = serp_cache.get_entry(key, engine_name, max_staleness=max_staleness)
+    if entry is not None:
+        results, age, is_stale = entry
+        if is_stale:
+            print(f"SERP cache: Serving stale results for '{query}' on {engine_name} ({int(age)}s old)")
+            _schedule_refresh(key, fetch_fn, query, engine_name, api_key, num_results, start)
+        else:
+            print(f"SERP cache: Hit for '{query}' on {engine_name}")
+        return results, {"status": "stale" if is_stale else "fresh", "age_seconds": int(age)}
+
+    results = fetch_fn(query, engine_name, api_key, num_results, start)
+    # Empty lists are how the fetchers report errors, so never cache them
+    if results:
+        serp_cache.set(key, engine_name, results)
+    return results, {"status": "live", "age_seconds": 0}
+
+def cached_serp_fetch(fetch_fn):
+    """Put the shared SERP cache in front of a fetch_results_via_serpapi implementation"""
+    @wraps(fetch_fn)
+    def wrapper(query, engine_name, api_key, num_results=10, start=0):
+        return fetch_with_freshness(fetch_fn, query, engine_name, api_key, num_results, start)[0]
+
+    def with_freshness(query, engine_name, api_key, num_results=10, start=0, max_staleness=None):
+        return fetch_with_freshness(fetch_fn, query, engine_name, api_key, num_results, start, max_staleness)
+
+    def refresh(query, engine_name, api_key, num_results=10, start=0):
+        """Fetch live and overwrite the cached entry, e.g. to warm it before it expires"""
+        results = fetch_fn(query, engine_name, api_key, num_results, start)
+        if results:
+            serp_cache.set(make_cache_key(query, engine_name, num_results, start=start), engine_name, results)
+        return results
+
+    wrapper.with_freshness = with_freshness
+    wrapper.refresh = refresh
+    return wrapper
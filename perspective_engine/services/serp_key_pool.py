@@ -0,0 +1,263 @@
+import os
+import threading
+import time
+from collections import OrderedDict
+from concurrent.futures import ThreadPoolExecutor
+from functools import wraps
+import requests
+from perspective_engine.config.constants import (
+    SERP_KEY_RATE_PER_SECOND, SERP_KEY_BURST, SERP_KEY_ACQUIRE_TIMEOUT_SECONDS,
+    SERP_KEY_COOLDOWN_SECONDS, SERP_KEY_QUOTA_REFRESH_SECONDS, SERP_KEY_MAX_USER_KEYS,
+    SERPAPI_ACCOUNT_URL
+)
+from perspective_engine.services.search_fanout import call_time_left
+
+_quota_executor = ThreadPoolExecutor(max_workers=1, thread_name_prefix="serp-quota")
+
+class TokenBucket:
+    """Allow rate_per_second calls on average, with bursts of up to capacity"""
+
+    def __init__(self, rate_per_second, capacity):
+        self.rate = rate_per_second
+        self.capacity = capacity
+        self._tokens = float(capacity)
+        self._updated = time.monotonic()
+
+    def _refill(self, now):
+        self._tokens = min(self.capacity, self._tokens + (now - self._updated) * self.rate)
+        self._updated = now
+
+    def available(self, now):
+        self._refill(now)
+        return self._tokens
+
+    def take(self, now):
+        self._refill(now)
+        self._tokens -= 1.0
+
+    def drain(self, now):
+        self._refill(now)
+        self._tokens = 0.0
+
+    def wait_time(self, now):
+        """Seconds until a whole token is available"""
+        self._refill(now)
+        if self._tokens >= 1.0:
+            return 0.0
+        return (1.0 - self._tokens) / self.rate if self.rate > 0 else float("inf")
+
+class PooledKey:
+    """One SerpAPI key with its limiter, load and quota. Caller holds the pool lock."""
+
+    def __init__(self, api_key, label, rate_per_second, burst):
+        self.api_key = api_key
+        self.label = label
+        self.bucket = TokenBucket(rate_per_second, burst)
+        self.in_flight = 0
+        self.calls = 0
+        self.rate_limited = 0
+        self.quota_remaining = None
+        self.quota_checked_at = None
+        self.cooldown_until = 0.0
+
+    def usable(self, now):
+        if now < self.cooldown_until:
+            return False
+        return self.quota_remaining is None or self.quota_remaining > 0
+
+    def load(self, now):
+        """Sort key for picking a key: fewest calls in flight, then most tokens and quota left"""
+        quota = self.quota_remaining if self.quota_remaining is not None else float("inf")
+        return (self.in_flight, -self.bucket.available(now), -quota)
+
+    def stats(self, now):
+        return {
+            "in_flight": self.in_flight,
+            "calls": self.calls,
+            "rate_limited": self.rate_limited,
+            "tokens": round(self.bucket.available(now), 2),
+            "quota_remaining": self.quota_remaining,
+            "cooling_down": now < self.cooldown_until
+        }
+
+class SerpKeyPool:
+    """
+    Spread SerpAPI calls over every key we may use
+
+    Server keys come from SERPAPI_KEYS (comma separated) and SERPAPI_KEY.
+    A user's own key is only ever used for that user's requests. Each key has
+    a token bucket so bursts queue briefly on our side instead of turning into
+    429s, and its remaining monthly searches are read from SerpAPI's account
+    endpoint and counted down locally between refreshes.
+    """
+
+    def __init__(self, rate_per_second=SERP_KEY_RATE_PER_SECOND, burst=SERP_KEY_BURST,
+                 acquire_timeout=SERP_KEY_ACQUIRE_TIMEOUT_SECONDS):
+        self.rate_per_second = rate_per_second
+        self.burst = burst
+        self.acquire_timeout = acquire_timeout
+        self._server_keys = None
+        self._user_keys = OrderedDict()
+        self._by_api_key = {}
+        self._lock = threading.Condition()
+
+    def _load_server_keys(self):
+        """Read server keys from the environment on first use. Caller holds the lock."""
+        if self._server_keys is not None:
+            return
+        raw_keys = os.getenv("SERPAPI_KEYS", "").split(",") + [os.getenv("SERPAPI_KEY", "")]
+        self._server_keys = []
+        for api_key in dict.fromkeys(key.strip() for key in raw_keys if key.strip()):
+            pooled = PooledKey(api_key, f"server-{len(self._server_keys) + 1}", self.rate_per_second, self.burst)
+            self._server_keys.append(pooled)
+            self._by_api_key[api_key] = pooled
+        print(f"SerpAPI key pool: {len(self._server_keys)} server key(s) loaded")
+
+    def _user_key(self, api_key):
+        """Find or register a key that is not a server key. Caller holds the lock."""
+        pooled = self._by_api_key.get(api_key)
+        if pooled is not None:
+            if api_key in self._user_keys:
+                self._user_keys.move_to_end(api_key)
+            return pooled
+        pooled = PooledKey(api_key, f"user-...{api_key[-4:]}", self.rate_per_second, self.burst)
+        self._user_keys[api_key] = self._by_api_key[api_key] = pooled
+        while len(self._user_keys) > SERP_KEY_MAX_USER_KEYS:
+            old_key, old = next(iter(self._user_keys.items()))
+            if old.in_flight:
+                break
+            del self._user_keys[old_key]
+            del self._by_api_key[old_key]
+        return pooled
+
+    def acquire(self, user_api_key=None, timeout=None):
+        """
+        Take a token from the least-loaded usable key, waiting briefly if all are busy
+
+        Args:
+            user_api_key: The requesting user's own key, if they have one
+
+        Returns:
+            PooledKey to pass to release(), or None if no key could be used in time
+        """
+        timeout = self.acquire_timeout if timeout is None else timeout
+        deadline = time.monotonic() + timeout
+        with self._lock:
+            self._load_server_keys()
+            candidates = list(self._server_keys)
+            if user_api_key:
+                user_key = self._user_key(user_api_key)
+                if user_key not in candidates:
+                    candidates.append(user_key)
+            if not candidates:
+                return None
+
+            while True:
+                now = time.monotonic()
+                usable = [key for key in candidates if key.usable(now)]
+                if not usable:
+                    return None
+                ready = [key for key in usable if key.bucket.available(now) >= 1.0]
+                if ready:
+                    pooled = min(ready, key=lambda key: key.load(now))
+                    pooled.bucket.take(now)
+                    pooled.in_flight += 1
+                    pooled.calls += 1
+                    break
+                wait = min(key.bucket.wait_time(now) for key in usable)
+                if now + wait > deadline:
+                    return None
+                self._lock.wait(wait)
+
+        self._maybe_refresh_quota(pooled)
+        return pooled
+
+    def release(self, pooled):
+        with self._lock:
+            pooled.in_flight = max(0, pooled.in_flight - 1)
+            self._lock.notify_all()
+
+    def record_status(self, api_key, status_code):
+        """Update a key's quota or back off from it after an upstream response"""
+        with self._lock:
+            pooled = self._by_api_key.get(api_key)
+            if pooled is None:
+                return
+            now = time.monotonic()
+            if status_code == 429:
+                pooled.rate_limited += 1
+                pooled.bucket.drain(now)
+                pooled.cooldown_until = now + SERP_KEY_COOLDOWN_SECONDS
+                print(f"SerpAPI key pool: {pooled.label} rate limited, resting it for {SERP_KEY_COOLDOWN_SECONDS}s")
+            elif status_code == 200 and pooled.quota_remaining is not None:
+                pooled.quota_remaining = max(0, pooled.quota_remaining - 1)
+
+    def _maybe_refresh_quota(self, pooled):
+        """Re-read a key's quota in the background when it is unknown or out of date"""
+        if not SERPAPI_ACCOUNT_URL:
+            return
+        with self._lock:
+            now = time.monotonic()
+            if pooled.quota_checked_at is not None and now - pooled.quota_checked_at < SERP_KEY_QUOTA_REFRESH_SECONDS:
+                return
+            pooled.quota_checked_at = now
+        _quota_executor.submit(self._refresh_quota, pooled)
+
+    def _refresh_quota(self, pooled):
+        try:
+            response = requests.get(SERPAPI_ACCOUNT_URL, params={"api_key": pooled.api_key}, timeout=10)
+            response.raise_for_status()
+            account = response.json()
+        except Exception as e:
+            print(f"SerpAPI key pool: Quota check for {pooled.label} failed: {type(e).__name__} - {e}")
+            return
+
+        searches_left = account.get("total_searches_left", account.get("plan_searches_left"))
+        hourly_limit = account.get("account_rate_limit_per_hour")
+        with self._lock:
+            if searches_left is not None:
+                pooled.quota_remaining = int(searches_left)
+            if hourly_limit:
+                # Never run a key faster than its plan allows
+                pooled.bucket.rate = min(self.rate_per_second, int(hourly_limit) / 3600.0)
+            self._lock.notify_all()
+        print(f"SerpAPI key pool: {pooled.label} has {searches_left} searches left this month")
+
+    def in_flight(self):
+        """Calls currently holding a key"""
+        with self._lock:
+            return sum(key.in_flight for key in self._by_api_key.values())
+
+    def stats(self):
+        with self._lock:
+            self._load_server_keys()
+            now = time.monotonic()
+            keys = self._server_keys + list(self._user_keys.values())
+            return {
+                "server_keys": len(self._server_keys),
+                "user_keys": len(self._user_keys),
+                "keys": {key.label: key.stats(now) for key in keys}
+            }
+
+serp_key_pool = SerpKeyPool()
+
+def pooled_serp_key(fetch_fn):
+    """
+    Run a fetch_results_via_serpapi implementation with a key from the pool
+
+    The api_key argument is the user's own key, if any; the key actually
+    used may be any server key or that one. Waiting for a key counts against
+    the fan-out deadline, like the HTTP call itself.
+    """
+    @wraps(fetch_fn)
+    def wrapper(query, engine_name, api_key, num_results=10, start=0):
+        pooled = serp_key_pool.acquire(api_key, timeout=call_time_left(serp_key_pool.acquire_timeout))
+        if pooled is None:
+            print(f"SerpAPI key pool: No key available for {engine_name}, skipping")
+            return []
+        try:
+            return fetch_fn(query, engine_name, pooled.api_key, num_results, start)
+        finally:
+            serp_key_pool.release(pooled)
+
+    return wrapper
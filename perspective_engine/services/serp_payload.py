@@ -0,0 +1,31 @@
+import json
+from perspective_engine.config.constants import SERPAPI_BASE_URL
+
+# Ask SerpAPI for only the fields the result pipeline reads. Knowledge graph,
+# ads, related searches and per-result extras are dropped server-side.
+SERP_JSON_RESTRICTOR = "organic_results[].{title,link,snippet},error"
+_ORGANIC_FIELDS = ("title", "link", "snippet")
+
+def parse_serp_payload(content):
+    """
+    Parse a SerpAPI JSON body into organic results and an error message
+
+    Works on the raw response bytes so requests never has to guess the
+    charset and build a decoded copy of the body first.
+
+    Returns:
+        (organic_results, error) where organic_results only carries
+        title, link and snippet
+    """
+    data = json.loads(content)
+    organic = data.get("organic_results") or []
+    return [{
+        field: item[field] for field in _ORGANIC_FIELDS if field in item
+    } for item in organic if isinstance(item, dict)], data.get("error")
+
+def make_serp_client(params, timeout):
+    """Build a SerpApiClient that talks to SERPAPI_BASE_URL"""
+    from serpapi import SerpApiClient
+    client = SerpApiClient(params, timeout=timeout)
+    client.BACKEND = SERPAPI_BASE_URL
+    return client
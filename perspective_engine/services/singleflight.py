@@ -0,0 +1,57 @@
+import threading
+from concurrent.futures import Future
+
+class SingleFlight:
+    """
+    Coalesce concurrent calls that share a key
+
+    The first caller for a key runs the work; callers that arrive while it is
+    running wait on the same future and receive the same result object, so
+    results must be treated as read-only.
+    """
+
+    def __init__(self):
+        self._calls = {}
+        self._lock = threading.Lock()
+        self._stats = {
+            "executed": 0,
+            "coalesced": 0,
+            "in_flight": 0
+        }
+
+    def do(self, key, fn):
+        """Run fn for key, or wait for the call already in flight for it"""
+        with self._lock:
+            future = self._calls.get(key)
+            if future is not None:
+                self._stats["coalesced"] += 1
+                is_leader = False
+            else:
+                future = Future()
+                self._calls[key] = future
+                self._stats["executed"] += 1
+                self._stats["in_flight"] += 1
+                is_leader = True
+
+        if not is_leader:
+            return future.result()
+
+        try:
+            result = fn()
+            future.set_result(result)
+            return result
+        except BaseException as e:
+            future.set_exception(e)
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+                self._stats["in_flight"] -= 1
+
+    def stats(self):
+        """Return how many calls ran and how many were collapsed onto them"""
+        with self._lock:
+            stats = dict(self._stats)
+            total = stats["executed"] + stats["coalesced"]
+            stats["coalesced_ratio"] = round(stats["coalesced"] / total, 4) if total else 0.0
+            return stats
@@ -0,0 +1,148 @@
+import math
+import threading
+import time
+from datetime import timezone
+from perspective_engine.config.constants import (
+    SUGGEST_TOP_K, SUGGEST_HALF_LIFE_HOURS, SUGGEST_MAX_QUERIES, SUGGEST_MAX_QUERY_LENGTH,
+    SUGGEST_HISTORY_LIMIT, SUGGEST_CACHED_WEIGHT, SUGGEST_MIN_DISTINCT_USERS
+)
+
+# Scores are log(sum of 2 ** ((t - _EPOCH) / half_life)) over every search of a
+# query. Measuring from a fixed epoch means old scores never need decaying:
+# a newer search simply adds a larger term.
+_EPOCH = 1_700_000_000
+
+def normalize_query(query):
+    return " ".join((query or "").lower().split())
+
+def _log_add(a, b):
+    """log(exp(a) + exp(b)) without overflow"""
+    if a is None:
+        return b
+    high, low = max(a, b), min(a, b)
+    return high + math.log1p(math.exp(low - high))
+
+class _TrieNode:
+    __slots__ = ("children", "top")
+
+    def __init__(self):
+        self.children = {}
+        # Best (score, query) pairs under this prefix, highest score first
+        self.top = []
+
+class QuerySuggester:
+    """
+    Prefix trie of past queries, ranked by frequency with exponential recency decay
+
+    Every node keeps its top_k completions, so a lookup is one walk down the
+    prefix. Scores only ever grow, which keeps those lists exact as searches
+    are added one at a time.
+
+    A query enters the trie only once min_users different users have
+    searched for it; until then its score is kept along with the users seen
+    so far. Anonymous searches and cached queries add to the score but not
+    to the user count.
+    """
+
+    def __init__(self, top_k=SUGGEST_TOP_K, half_life_hours=SUGGEST_HALF_LIFE_HOURS,
+                 max_queries=SUGGEST_MAX_QUERIES, min_users=SUGGEST_MIN_DISTINCT_USERS):
+        self.top_k = top_k
+        self.scale = math.log(2) / (half_life_hours * 3600.0)
+        self.max_queries = max_queries
+        self.min_users = min_users
+        self._root = _TrieNode()
+        self._scores = {}
+        # Users seen for each query not yet searched by min_users of them
+        self._users = {}
+        self._lock = threading.Lock()
+
+    def add(self, query, timestamp=None, weight=1.0, user=None):
+        """Count one search of a query made at timestamp (seconds since the epoch) by user, if known"""
+        query = normalize_query(query)[:SUGGEST_MAX_QUERY_LENGTH]
+        if not query or weight <= 0:
+            return
+        timestamp = time.time() if timestamp is None else timestamp
+        term = (timestamp - _EPOCH) * self.scale + math.log(weight)
+
+        with self._lock:
+            previous = self._scores.get(query)
+            if previous is None:
+                if len(self._scores) >= self.max_queries:
+                    return
+                self._users[query] = set()
+            score = self._scores[query] = _log_add(previous, term)
+
+            users = self._users.get(query)
+            if users is not None:
+                if user is not None:
+                    users.add(str(user))
+                if len(users) < self.min_users:
+                    return
+                del self._users[query]
+
+            node = self._root
+            self._offer(node, query, score)
+            for char in query:
+                child = node.children.get(char)
+                if child is None:
+                    child = node.children[char] = _TrieNode()
+                node = child
+                self._offer(node, query, score)
+
+    def _offer(self, node, query, score):
+        """Put query into a node's top list if it now ranks there. Caller holds the lock."""
+        top = node.top
+        for index, (_, existing) in enumerate(top):
+            if existing == query:
+                del top[index]
+                break
+        if len(top) >= self.top_k and score <= top[-1][0]:
+            return
+        position = len(top)
+        while position > 0 and top[position - 1][0] < score:
+            position -= 1
+        top.insert(position, (score, query))
+        del top[self.top_k:]
+
+    def suggest(self, prefix, limit=None):
+        """Return up to limit past queries starting with prefix, best first"""
+        prefix = normalize_query(prefix)
+        limit = self.top_k if limit is None else min(limit, self.top_k)
+        with self._lock:
+            node = self._root
+            for char in prefix:
+                node = node.children.get(char)
+                if node is None:
+                    return []
+            return [query for _, query in node.top[:limit]]
+
+    def __len__(self):
+        """Number of queries in the trie, i.e. searched by enough users to be suggested"""
+        return len(self._scores) - len(self._users)
+
+    def load_history(self, limit=SUGGEST_HISTORY_LIMIT):
+        """Index the most recent searches from SearchHistory and the SERP cache. Needs an app context."""
+        from perspective_engine.extensions import db
+        from perspective_engine.models import SearchHistory
+        from perspective_engine.services.serp_cache import serp_cache
+
+        # SearchHistory.query is the column, so go through the session
+        rows = (
+            db.session.query(SearchHistory.query, SearchHistory.created_at, SearchHistory.user_id)
+            .order_by(SearchHistory.created_at.desc())
+            .limit(limit)
+            .all()
+        )
+        for query, created_at, user_id in rows:
+            if created_at is not None and created_at.tzinfo is None:
+                # SQLite hands back naive datetimes for the UTC values we store
+                created_at = created_at.replace(tzinfo=timezone.utc)
+            self.add(query, created_at.timestamp() if created_at else None, user=user_id)
+
+        # Queries that are only in the cache still deserve a mention, at a lower weight
+        cached = serp_cache.cached_queries(limit)
+        for query, stored_at in cached:
+            self.add(query, stored_at, weight=SUGGEST_CACHED_WEIGHT)
+        return len(rows) + len(cached)
+
+query_suggester = QuerySuggester()
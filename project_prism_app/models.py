@@ -2,6 +2,7 @@ from datetime import datetime, timezone
 from flask_login import UserMixin
 from . import db
 from sqlalchemy import Column, String, Integer
+from perspective_engine.models.search_history import SearchHistoryColumns
 
 class User(UserMixin, db.Model):
     """
@@ -27,21 +28,10 @@ class User(UserMixin, db.Model):
     def __repr__(self):
         return f'<User {self.email}>'
 
-class SearchHistory(db.Model):
-    __tablename__ = 'search_history'
-    
-    id = db.Column(db.Integer, primary_key=True)
-    user_id = db.Column(db.Integer, db.ForeignKey('users.id'), nullable=False)
-    query = db.Column(db.String(500), nullable=False)
-    engines_used = db.Column(db.String(200), nullable=True)  # JSON string of engines
-    results_count = db.Column(db.Integer, default=0)
-    created_at = db.Column(db.DateTime, default=lambda: datetime.now(timezone.utc))
-    
+class SearchHistory(SearchHistoryColumns, db.Model):
+    # Columns are shared with perspective_engine's SearchHistory
     user = db.relationship('User', backref=db.backref('searches', lazy=True))
 
-    def __repr__(self):
-        return f'<SearchHistory {self.query[:30]}...>'
-
 class APIKey(db.Model):
     __tablename__ = 'api_keys'
 
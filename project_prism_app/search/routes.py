@@ -4,8 +4,10 @@ from serpapi import SerpApiClient
 import os
 import json
 from flask_jwt_extended import jwt_required
+from perspective_engine.services.dedup import dedupe_results
+from perspective_engine.services.fusion import classify_within_budget, fuse_results
+from perspective_engine.services.classification import infer_perspective_from_url_and_title
 from .utils import (
-    infer_perspective_from_url_and_title,
     perform_fact_check,
     perform_summarization,
     calculate_intrinsic_score
@@ -97,44 +99,6 @@ def classify_with_gemini(results, api_key):
         for result in results
     ]
 
-def infer_perspective_from_url_and_title(url, title):
-    """Simple rule-based fallback classifier"""
-    url = url.lower() if url else ''
-    title = title.lower() if title else ''
-    
-    # Government, educational, or major health organizations
-    if any(domain in url for domain in ['.gov', '.edu', 'who.int', 'cdc.gov', 'nih.gov', '.un.org']):
-        return 'mainstream'
-    
-    # Major news outlets
-    mainstream_news_domains = [
-        'bbc.', 'cnn.', 'nytimes.', 'washingtonpost.', 'reuters.', 'apnews.', 
-        'nbcnews.', 'abcnews.', 'cbsnews.', 'theguardian.', 'wsj.', 'economist.',
-        'npr.org', 'pbs.org', 'usatoday.', 'bloomberg.', 'forbes.', 'politico.', 'axios.'
-    ]
-    if any(outlet in url for outlet in mainstream_news_domains):
-        return 'mainstream'
-    
-    # Wikipedia and similar reference sites
-    if 'wikipedia.org' in url or 'britannica.com' in url:
-        return 'neutral'
-    
-    # Keywords suggesting alternative perspectives
-    alternative_keywords = [
-        'conspiracy', 'truth', 'alternative', 'freedom', 'patriot', 'liberty',
-        'exposed', 'reveal', 'scandal', 'coverup', 'natural news', 'infowars',
-        'shocking', 'they don\'t want you to know', 'banned', 'censored',
-        'holistic approach', 'natural immunity', 'medical freedom', 'health freedom',
-        'suppressed science', 'the real story', 'unreported', 'controversial study',
-        'uncensored', 'deep state', 'globalist', 'great reset', 'agenda 21', 'agenda 2030',
-        'plandemic', 'scamdemic', 'big pharma', 'big tech', 'hidden', 'secret'
-    ]
-    if any(term in url or term in title for term in alternative_keywords):
-        return 'alternative'
-    
-    # Default to neutral if no clear signals
-    return 'neutral'
-
 @search_bp.route('/search', methods=['POST'])
 @jwt_required(optional=True)
 def search():
@@ -158,7 +122,6 @@ def search():
         "fringe_fetch": f"{original_query} (forum OR discussion OR \"alternative take\" OR \"uncensored views\" OR \"independent report\" OR blog OR \"citizen journalist\" OR \"controversial study\" OR \"what they don't want you to know\" OR \"hidden truth\" OR \"unconventional analysis\") -site:wikipedia.org -site:britannica.com -site:*.gov -site:*.mil -site:who.int -site:nih.gov -site:cdc.gov -site:*.edu -site:*.un.org -site:apnews.com -site:reuters.com -site:bbc.com -site:cnn.com -site:nytimes.com -site:washingtonpost.com -site:theguardian.com -site:wsj.com -site:npr.org"
     }
     all_fetched_results = []
-    processed_links = set()
     
     results_per_engine_query = 15
 
@@ -202,9 +165,8 @@ def search():
                     title = res.get("title") or res.get("name")
                     snippet = res.get("snippet")
 
-                    if link and link not in processed_links:
+                    if link:
                         all_fetched_results.append({
-                            "id": f"{engine}-{perspective_type}-{res_idx}-{hash(link)}-{len(all_fetched_results)}",
                             "title": title,
                             "link": link,
                             "snippet": snippet,
@@ -213,7 +175,6 @@ def search():
                             "displayed_url": res.get("displayed_link") or res.get("displayUrl"),
                             "position": res.get("position", res_idx + 1)
                         })
-                        processed_links.add(link)
             except Exception as e:
                 print(f"Error querying {engine} for '{perspective_type}': {e}")
 
@@ -221,41 +182,57 @@ def search():
         print("Search BP: No results fetched.")
         return jsonify([])
 
+    # Merge copies of the same article found by several engines or queries,
+    # then rank them by reciprocal rank fusion
+    fetched_count = len(all_fetched_results)
+    all_fetched_results = [
+        {**res.to_dict(), "id": res.content_id} for res in fuse_results(dedupe_results(all_fetched_results))
+    ]
+    print(f"Search BP: {fetched_count} fetched results merged into {len(all_fetched_results)} unique results.")
+
     # AI Classification
     ai_provider = data.get('ai_provider_override', os.getenv('DEFAULT_AI_PROVIDER', 'openai')).lower()
     openai_api_key = os.getenv("OPENAI_API_KEY")
     gemini_api_key = os.getenv("GEMINI_API_KEY")
 
-    classified_results = []
-    ai_key_to_use = None
-
-    if ai_provider == 'openai' and openai_api_key:
-        ai_key_to_use = openai_api_key
-        print(f"Search BP: Classifying {len(all_fetched_results)} results with OpenAI...")
-        try:
-            classified_results = classify_with_openai(all_fetched_results, ai_key_to_use)
-        except Exception as e:
-            print(f"Search BP: OpenAI classification error: {e}. Falling back.")
-            ai_key_to_use = None
-    elif ai_provider == 'gemini' and gemini_api_key:
-        ai_key_to_use = gemini_api_key
-        print(f"Search BP: Classifying {len(all_fetched_results)} results with Gemini...")
-        try:
-            classified_results = classify_with_gemini(all_fetched_results, ai_key_to_use)
-        except Exception as e:
-            print(f"Search BP: Gemini classification error: {e}. Falling back.")
-            ai_key_to_use = None
-    
-    if not ai_key_to_use or not classified_results:
-        if not ai_key_to_use:
-            print("Search BP: AI provider key not available. Using rule-based classification.")
-        else:
-            print("Search BP: AI classification failed. Using rule-based classification.")
-        classified_results = [
+    def classify_with_rules(batch):
+        return [
             {**res, "perspective": infer_perspective_from_url_and_title(res.get("link"), res.get("title"))}
-            for res in all_fetched_results
+            for res in batch
         ]
 
+    def classify_with_ai(llm_batch):
+        classified_results = []
+        ai_key_to_use = None
+
+        if ai_provider == 'openai' and openai_api_key:
+            ai_key_to_use = openai_api_key
+            print(f"Search BP: Classifying {len(llm_batch)} results with OpenAI...")
+            try:
+                classified_results = classify_with_openai(llm_batch, ai_key_to_use)
+            except Exception as e:
+                print(f"Search BP: OpenAI classification error: {e}. Falling back.")
+                ai_key_to_use = None
+        elif ai_provider == 'gemini' and gemini_api_key:
+            ai_key_to_use = gemini_api_key
+            print(f"Search BP: Classifying {len(llm_batch)} results with Gemini...")
+            try:
+                classified_results = classify_with_gemini(llm_batch, ai_key_to_use)
+            except Exception as e:
+                print(f"Search BP: Gemini classification error: {e}. Falling back.")
+                ai_key_to_use = None
+        
+        if not ai_key_to_use or not classified_results:
+            if not ai_key_to_use:
+                print("Search BP: AI provider key not available. Using rule-based classification.")
+            else:
+                print("Search BP: AI classification failed. Using rule-based classification.")
+            return classify_with_rules(llm_batch)
+        return classified_results
+
+    # Only the top ranked results are worth an LLM call; the tail gets rule-based labels
+    classified_results = classify_within_budget(all_fetched_results, classify_with_ai, classify_with_rules)
+
     # Ensure all results have a perspective
     final_results = []
     for res in classified_results:
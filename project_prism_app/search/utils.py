@@ -5,15 +5,15 @@ import requests
 from bs4 import BeautifulSoup
 import google.generativeai as genai
 from openai import OpenAI
-from urllib.parse import urlparse
 from serpapi import GoogleSearch as SerpApiClient
 from flask import jsonify
 import ast
-
-# Domain lists can stay here or be moved to a shared constants file later
-KNOWN_SOCIAL_MEDIA_PLATFORMS = [ "x.com", "twitter.com", "instagram.com", "tiktok.com", "youtube.com", "youtu.be", "facebook.com", "reddit.com", "linkedin.com", "pinterest.com", "tumblr.com", "medium.com", "quora.com", "threads.net" ]
-KNOWN_MAINSTREAM_NEWS_DOMAINS = [ "nytimes.com", "bbc.com", "cnn.com", "reuters.com", "apnews.com", "washingtonpost.com", "wsj.com", "theguardian.com", "npr.org", "abcnews.go.com", "cbsnews.com", "nbcnews.com", "foxnews.com", "usatoday.com", "bloomberg.com", "forbes.com", "news.google.com", "cnbc.com", "politico.com", "axios.com", "theatlantic.com", "newyorker.com", "time.com", "latimes.com", "chicagotribune.com", "chron.com"  ]
-KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES = [ "arxiv.org", "pubmed.ncbi.nlm.nih.gov", "nature.com", "sciencemag.org", "jamanetwork.com", "thelancet.com", "ieee.org", "acm.org", "springer.com", "elsevier.com", "wiley.com", "sagepub.com", "jstor.org", "plos.org", "frontiersin.org", "bmj.com", "cell.com" ]
+from perspective_engine.services.serp_cache import cached_serp_fetch
+from perspective_engine.services.serp_payload import SERP_JSON_RESTRICTOR
+from perspective_engine.services.pagination import serp_page_params
+from perspective_engine.services.serp_key_pool import pooled_serp_key
+from perspective_engine.services.classification import classify_source_type, infer_perspective_from_url_and_title
+from perspective_engine.services.credibility import intrinsic_score
 
 
 def fetch_text_from_url(url):
@@ -52,36 +52,6 @@ def fetch_text_from_url(url):
     except requests.exceptions.RequestException as e: print(f"Request error URL {url}: {e}"); return None
     except Exception as e: print(f"Parsing error URL {url}: {type(e).__name__} - {e}"); return None
 
-def classify_source_type(result_url, source_engine_name=None):
-    # ... (Exact same as the last working version) ...
-    if not result_url: return "unknown_url"
-    try:
-        parsed_url = urlparse(result_url); netloc = parsed_url.netloc.lower(); path = parsed_url.path.lower()
-        if netloc.startswith("www."): netloc = netloc[4:]
-        if netloc.endswith((".gov",".mil")) or ".gov." in netloc or ".mil." in netloc: return "government"
-        if netloc.endswith(".edu"): return "academic_institution"
-        if "wikipedia.org" in netloc: return "encyclopedia"
-        for domain in KNOWN_SOCIAL_MEDIA_PLATFORMS:
-            if domain == netloc or netloc.endswith("."+domain) or domain in netloc:
-                if (domain == "youtube.com" or "youtube.com" in netloc or "youtu.be" in netloc) and ("/channel/" in path or "/c/" in path or "/user/" in path or path.startswith("/@")): return "social_media_channel_creator"
-                if ("youtube.com" in netloc or "youtu.be" in netloc): return "social_media_platform_video"
-                if "medium.com" in netloc: p_parts=[p for p in path.split('/') if p]; return p_parts and (p_parts[0].startswith('@')or(not'.'in p_parts[0]and p_parts[0]not in['search','tag','topic','collections','about','jobs','policy','help','settings','explore','me','new-story']))and"social_blogging_platform_user_pub"or"social_blogging_platform"
-                return "social_media_platform"
-        for domain in KNOWN_ACADEMIC_PUBLISHERS_AND_REPOSITORIES:
-            if domain in netloc: return "research_publication"
-        for domain in KNOWN_MAINSTREAM_NEWS_DOMAINS:
-            if domain == netloc or netloc.endswith("."+domain): return any(p in path for p in ["/blog","/opinion","/contributor","/live/"])and"news_opinion_blog_live"or"news_media_mainstream"
-        if netloc.endswith(".org"):
-            if any(p in path for p in ["/blog","/news","/press","/report","/briefing","/article","/story"]): return "ngo_nonprofit_publication"
-            if any(p in netloc for p in ["foundation","institute","society","association","charity","trust","fund","council","union"]): return "ngo_nonprofit_organization"
-            return "ngo_nonprofit_general"
-        if any(p in path for p in ["/blog","/press-release","/newsroom","/insights","/pr/","/investors","/company/about","/about-us","/corporate"]):
-            if not any(n_dom in netloc for n_dom in KNOWN_MAINSTREAM_NEWS_DOMAINS): return "corporate_blog_pr_info"
-        if any(p in path for p in ["/news/","/article/","/story/","/post/","/views/"]) and any(tld in netloc for tld in [".com",".net",".info",".co",".online",".io",".news",".press",".report",".blog"]): return "news_media_other_or_blog"
-        if any(tld in netloc for tld in [".com",".net",".biz",".info",".org",".co",".io",".app",".site",".online",".me",".tv",".news",".blog",".press",".report"]): return "website_general"
-        return "unknown_other"
-    except Exception as e: print(f"Error classifying URL '{result_url}': {type(e).__name__} - {e}"); return "unknown_error_parsing"
-
 def get_sentiment_and_bias(text_content, ai_provider='openai', user_openai_key=None, user_gemini_key=None, server_openai_key=None):
     # Modified to accept specific keys
     if not text_content: return {"score": 0.0, "label": "neutral_no_content"}, {"score": 0.0, "label": "neutral_no_content"}
@@ -119,10 +89,13 @@ def get_sentiment_and_bias(text_content, ai_provider='openai', user_openai_key=N
             except Exception as e_fb: print(f"Error Gemini sentiment util fallback: {type(e_fb).__name__}-{e_fb}"); return {"score":0.0,"label":"neutral_gemini_error"},{"score":0.0,"label":"neutral_gemini_error"}
     return {"score":0.0,"label":"neutral_provider_unknown"},{"score":0.0,"label":"neutral_provider_unknown"}
 
-def fetch_results_via_serpapi(query, engine_name, api_key_to_use, num_results=10):
+@cached_serp_fetch
+@pooled_serp_key
+def fetch_results_via_serpapi(query, engine_name, api_key_to_use, num_results=10, start=0):
     # ... (Exact same as the last working version) ...
     if not api_key_to_use: print(f"SerpApi Util: No API key for {engine_name}."); return []
-    params = {"q":query,"engine":engine_name.lower(),"api_key":api_key_to_use,"num":num_results,"hl":"en","gl":"us"}
+    params = {"q":query,"engine":engine_name.lower(),"api_key":api_key_to_use,"num":num_results,"hl":"en","gl":"us","json_restrictor":SERP_JSON_RESTRICTOR}
+    params.update(serp_page_params(engine_name, start))
     print(f"SerpApi Util: Querying {engine_name} for '{query}' (num:{num_results})")
     try:
         s_client = SerpApiClient(params); r_data = s_client.get_dict(); o_results = r_data.get("organic_results",[])
@@ -222,64 +195,9 @@ def perform_fact_check(data, user_openai_key=None, server_openai_key=None, user_
     except Exception as e:print(f"Error {provider} fact-checking util: {type(e).__name__}-{e}");return jsonify({"error":f"Fact-check failed ({provider}):{type(e).__name__}","claim":p_claim}),500
 
 def calculate_intrinsic_score(data):
-    # ... (Paste the exact intrinsic score calculation logic from the last working /score endpoint here)
     if not data: return jsonify({"error": "Invalid JSON payload for score util"}), 400
-    s_type=data.get('source_type','unknown').lower();b_trust=float(data.get('base_trust',50));r_boost=float(data.get('recency_boost',0));fc_v=data.get('factcheckVerdict','pending').lower();BTS_MAX=60;RMS_MAX=15;FCS_MAX=20;ITA_MAX=10;bts=min(max(b_trust/100*BTS_MAX,0),BTS_MAX);rs=min(max(r_boost/100*RMS_MAX,0),RMS_MAX);fcs_map={"verified":FCS_MAX,"neutral":0,"disputed":-FCS_MAX,"disputed_false":-FCS_MAX,"pending":-2,"lacks_consensus":-int(FCS_MAX*.4),"needs_context":0,"needs_context_format_error":0,"needs_context_ast_eval":0,"needs_context_fallback":0,"service_unavailable":0,"unverifiable":-int(FCS_MAX*.6),"error_parsing":-5,"neutral_unavailable":0,"neutral_parsing_error":0,"neutral_error":0,"error":-5};fcs=fcs_map.get(fc_v,0);itq_map={"government":.8,"academic_institution":.9,"research_publication":.9,"encyclopedia":.7,"news_media_mainstream":.6,"news_opinion_blog_live":.3,"ngo_nonprofit_publication":.5,"ngo_nonprofit_organization":.4,"ngo_nonprofit_general":.2,"corporate_blog_pr_info":.1,"news_media_other_or_blog":-.3,"social_media_platform":-.8,"social_media_platform_video":-.7,"social_media_channel_creator":-.5,"social_blogging_platform_user_pub":-.4,"social_blogging_platform":-.6,"website_general":0,"unknown_url":-.9,"unknown_other":-.9,"unknown_error_parsing":-1,"mainstream":.6,"alternative":-.4,"unknown":-.7};tqv=itq_map.get(s_type,0.);ita=tqv*ITA_MAX;tis=bts+rs+fcs+ita;fs=int(round(min(max(tis,0),100)));return jsonify({"intrinsic_credibility_score":fs,"factors":{"base_trust_contribution":round(bts,2),"recency_contribution":round(rs,2),"fact_check_contribution":round(fcs,2),"type_quality_adjustment":round(ita,2)}})
-
-def infer_perspective_from_url_and_title(url, title):
-    """Simple rule-based classifier for perspective"""
-    url = url.lower() if url else ''
-    title = title.lower() if title else ''
-    
-    # Government, educational, or major health organizations
-    if any(domain in url for domain in ['.gov', '.edu', 'who.int', 'cdc.gov', 'nih.gov', '.un.org']):
-        return 'mainstream'
-    
-    # Major news outlets
-    mainstream_news_domains = [
-        'bbc.', 'cnn.', 'nytimes.', 'washingtonpost.', 'reuters.', 'apnews.', 
-        'nbcnews.', 'abcnews.', 'cbsnews.', 'theguardian.', 'wsj.', 'economist.',
-        'npr.org', 'pbs.org', 'usatoday.', 'bloomberg.', 'forbes.', 'politico.', 'axios.'
-    ]
-    if any(outlet in url for outlet in mainstream_news_domains):
-        return 'mainstream'
-    
-    # Reference sites
-    if 'wikipedia.org' in url or 'britannica.com' in url or 'snopes.com' in url or 'factcheck.org' in url:
-        return 'neutral'
-    
-    # Alternative keywords
-    alternative_keywords = [
-        'conspiracy', 'truth', 'alternative', 'freedom', 'patriot', 'liberty', 
-        'globalist', 'deep state', 'awakening', 'coverup', 'hoax', 'exposed'
-    ]
-    if any(term in url or term in title for term in alternative_keywords):
-        return 'alternative'
-    
-    # Academic journals
-    academic_journal_domains = [
-        'nature.com', 'science.org', 'nejm.org', 'bmj.com', 'thelancet.com',
-        'cell.com', 'pubmed', 'sciencedirect', 'springer', 'wiley', 'oxfordjournals.org',
-        'jamanetwork.com', 'arxiv.org', 'plos.org', 'frontiersin.org'
-    ]
-    if any(term in url for term in academic_journal_domains):
-        if not any(alt_kw in title for alt_kw in ['controversial', 'disputed', 'alternative view']):
-             return 'mainstream'
-    
-    # Alternative title phrases
-    alternative_title_phrases = [
-        'what they aren\'t telling you', 'the truth about', 'what doctors won\'t say',
-        'doctors are silent', 'big-pharma agenda', 'media won\'t show you',
-        'the untold story of', 'hidden agenda', 'the great awakening', 'red pill'
-    ]
-    if any(phrase in title for phrase in alternative_title_phrases):
-        return 'alternative'
-    
-    # Mainstream patterns
-    import re
-    if re.search(r'official|report|study|research|analysis|guidelines|statement from|university study|government report', 
-                title, re.I) and not any(alt_kw in title for alt_kw in alternative_keywords + alternative_title_phrases):
-        return 'mainstream'
-    
-    # Default
-    return 'neutral'
+    score, factors = intrinsic_score(
+        data.get('source_type', 'unknown').lower(), float(data.get('base_trust', 50)),
+        float(data.get('recency_boost', 0)), data.get('factcheckVerdict', 'pending').lower()
+    )
+    return jsonify({"intrinsic_credibility_score": score, "factors": factors})
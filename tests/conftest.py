@@ -0,0 +1,29 @@
+import pytest
+
+# URLs covering every source type rule and the URL shapes the memoized
+# classifier parses specially (ports, queries, fragments, other schemes)
+URLS = [
+    "https://www.cdc.gov/flu", "https://data.gov.uk/x", "https://www.who.int/news/item",
+    "https://ec.europa.eu/info", "https://www.mit.edu/research", "https://en.wikipedia.org/wiki/Solar",
+    "https://www.youtube.com/channel/abc", "https://www.youtube.com/@creator", "https://youtu.be/xyz",
+    "https://medium.com/@writer/post", "https://medium.com/some-publication/post", "https://medium.com/tag/ai",
+    "https://medium.com/", "https://foo.substack.com/p/post", "https://www.reddit.com/r/science",
+    "https://www.nature.com/articles/1", "https://link.springer.com/article/1",
+    "https://www.nytimes.com/2024/opinion/x.html", "https://www.bbc.co.uk/news/world",
+    "https://www.breitbart.com/politics/x", "https://www.greenpeace.org/news/x",
+    "https://www.gatesfoundation.org/about", "https://www.wikimedia.org", "https://acme.com/blog/launch",
+    "https://smallpaper.com/news/local", "https://example.com", "https://example.xyz/page",
+    "HTTPS://WWW.CDC.GOV/Flu", "https://example.com:8080/news/a", "https://example.com/a?next=/news/x",
+    "https://example.com/a#/news/x", "http://example.com/a;params/news/", "ftp://files.example.com/blog/",
+    "//example.org/news/x", "https://user@example.org/press"
+]
+
+@pytest.fixture(params=URLS)
+def url(request):
+    """Each of the classification URLs in turn"""
+    return request.param
+
+@pytest.fixture
+def urls():
+    """All of the classification URLs"""
+    return list(URLS)
@@ -0,0 +1,153 @@
+import json
+import threading
+import time
+
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from flask_restful import Api
+
+from perspective_engine.api import bulk as bulk_api
+from perspective_engine.api import search
+from perspective_engine.services.bulk_jobs import BulkJobManager, CANCELLED, DONE
+
+def wait_for(job, seconds=5):
+    stop = time.monotonic() + seconds
+    while job.finished_at is None and time.monotonic() < stop:
+        time.sleep(0.01)
+    return job
+
+def read_lines(job):
+    with open(job.output_path, encoding="utf-8") as f:
+        return sorted((json.loads(line) for line in f), key=lambda line: line["index"])
+
+def fake_search(query):
+    if query == "mock":
+        return {"query": query, "results": [{"link": "https://www.cdc.gov"}], "is_mock": True,
+                "error_info": search.MOCK_RESULTS_NOTICE}
+    if query == "empty":
+        return {"query": query, "results": [], "cut_short": ["serp"]}
+    if query == "broken":
+        raise RuntimeError("upstream down")
+    return {"query": query, "results": [{"link": f"https://example.com/{query}"}]}
+
+def test_mock_empty_and_failed_queries_are_failures(tmp_path):
+    manager = BulkJobManager(max_workers=2, output_dir=str(tmp_path))
+    job = wait_for(manager.submit(["solar", "mock", "empty", "broken"], ["google"], "balanced", fake_search))
+
+    assert job.to_dict()["status"] == DONE
+    assert (job.completed, job.failed) == (4, 3)
+    lines = read_lines(job)
+    assert lines[0]["results"] == [{"link": "https://example.com/solar"}]
+    assert lines[1] == {"index": 1, "query": "mock", "error_info": search.MOCK_RESULTS_NOTICE}
+    assert lines[2] == {"index": 2, "query": "empty", "error_info": "No results"}
+    assert lines[3] == {"index": 3, "query": "broken", "error_info": "upstream down"}
+
+def test_cancelled_job_skips_remaining_queries(tmp_path):
+    manager = BulkJobManager(max_workers=1, output_dir=str(tmp_path))
+    release = threading.Event()
+
+    def blocking_search(query):
+        release.wait(2)
+        return fake_search(query)
+
+    job = manager.submit(["a", "b", "c"], ["google"], "balanced", blocking_search)
+    job.cancel()
+    release.set()
+    wait_for(job)
+
+    assert job.status == CANCELLED
+    assert job.skipped >= 2 and job.completed == 3
+
+def test_bulk_queries_coalesce_with_identical_searches(monkeypatch):
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def run_search(query, engines, perspective, max_staleness=None, page=None, api_key=None, deadline=None):
+        calls.append(query)
+        started.set()
+        release.wait(2)
+        return {"query": query, "results": []}
+
+    monkeypatch.setattr(search, "run_search", run_search)
+    coalesced = search.search_flight.stats()["coalesced"]
+    responses = []
+    threads = [threading.Thread(target=lambda: responses.append(
+        search.coalesced_search("Solar  Power", ["google"], "balanced")
+    )) for _ in range(3)]
+    threads[0].start()
+    assert started.wait(2)
+    for thread in threads[1:]:
+        thread.start()
+    stop = time.monotonic() + 2
+    while search.search_flight.stats()["coalesced"] < coalesced + 2 and time.monotonic() < stop:
+        time.sleep(0.01)
+    release.set()
+    for thread in threads:
+        thread.join(2)
+
+    assert calls == ["Solar  Power"]
+    assert len(responses) == 3
+
+def test_searches_on_a_users_own_key_are_not_shared(monkeypatch):
+    keys = []
+    monkeypatch.setattr(search.search_flight, "do", lambda key, fn: keys.append(key))
+
+    search.coalesced_search("q", ["google"], "balanced", api_key="secret", user_id=7)
+    search.coalesced_search("q", ["google"], "balanced")
+
+    assert keys[0].endswith("|user:7") and keys[1] == search.make_search_key("q", ["google"], "balanced")
+
+def test_each_user_has_a_limit_on_active_jobs(tmp_path):
+    manager = BulkJobManager(max_workers=1, output_dir=str(tmp_path), max_active_per_user=1)
+    release = threading.Event()
+
+    def blocking_search(query):
+        release.wait(2)
+        return fake_search(query)
+
+    first = manager.submit(["a"], ["google"], "balanced", blocking_search, user_id="1")
+    assert manager.submit(["b"], ["google"], "balanced", blocking_search, user_id="1") is None
+    assert manager.submit(["c"], ["google"], "balanced", blocking_search, user_id="2") is not None
+    assert manager.stats()["rejected"] == 1
+
+    first.cancel()
+    assert manager.submit(["d"], ["google"], "balanced", blocking_search, user_id="1") is not None
+    release.set()
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    manager = BulkJobManager(max_workers=1, output_dir=str(tmp_path), max_active_per_user=1)
+    release = threading.Event()
+    monkeypatch.setattr(bulk_api, "bulk_jobs", manager)
+    monkeypatch.setattr(bulk_api, "get_user_api_key", lambda user_id, service: None)
+    monkeypatch.setattr(bulk_api, "coalesced_search", lambda query, *args, **kwargs: release.wait(2) and fake_search(query))
+
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-that-is-long-enough"
+    app.config["PROPAGATE_EXCEPTIONS"] = True
+    JWTManager(app)
+    api = Api(app)
+    api.add_resource(bulk_api.BulkSearchResource, "/search/bulk")
+    api.add_resource(bulk_api.BulkJobResource, "/search/bulk/<job_id>")
+    with app.app_context():
+        headers = [{"Authorization": f"Bearer {create_access_token(identity=user)}"} for user in ("1", "2")]
+    yield app.test_client(), headers
+    release.set()
+    # Let the queued searches finish before the fakes are undone
+    manager._executor.shutdown(wait=True)
+
+def test_bulk_jobs_need_sign_in(client):
+    test_client, _ = client
+    assert test_client.post("/search/bulk", json={"queries": ["a"]}).status_code == 401
+    assert test_client.get("/search/bulk/abc").status_code == 401
+
+def test_bulk_jobs_are_limited_and_private_per_user(client):
+    test_client, (alice, bob) = client
+    response = test_client.post("/search/bulk", json={"queries": ["a", "b"]}, headers=alice)
+    assert response.status_code == 202
+    job_id = response.get_json()["job_id"]
+
+    assert test_client.post("/search/bulk", json={"queries": ["c"]}, headers=alice).status_code == 429
+    assert test_client.get(f"/search/bulk/{job_id}", headers=bob).status_code == 404
+    assert test_client.get(f"/search/bulk/{job_id}", headers=alice).status_code == 200
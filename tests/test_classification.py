@@ -0,0 +1,32 @@
+from urllib.parse import urlparse
+
+from perspective_engine.config.classification_rules import SOURCE_REPUTATION_TIERS
+from perspective_engine.services.classification import (
+    classify_source_type, source_type_memo, source_type_rules
+)
+
+def reference_label(url):
+    """The label from the full rule walk, with no plan or memo"""
+    parsed = urlparse(url)
+    host = (parsed.hostname or "").lower()
+    host = host[4:] if host.startswith("www.") else host
+    path = parsed.path.lower()
+    segments = [p for p in path.split('/') if p]
+    return source_type_rules.match({"host": host, "path": path, "segment": segments[0] if segments else ""})
+
+def test_memoized_plans_match_the_full_rule_walk(url):
+    source_type_memo.clear()
+    cold = classify_source_type(url)
+    warm = classify_source_type(url)
+
+    assert cold == warm == reference_label(url)
+
+def test_reputation_tier_domains_have_rule_labels():
+    # Every domain the credibility tiers know is labelled by the rules, not
+    # left to the generic fallbacks
+    for _, substrings in SOURCE_REPUTATION_TIERS:
+        for substring in substrings:
+            host = {"bbc.": "bbc.co.uk", "springer": "link.springer.com"}.get(substring, substring)
+            if host.startswith("."):
+                host = "example" + host
+            assert classify_source_type(f"https://{host}/a") not in ("website_general", "unknown_other"), host
@@ -0,0 +1,190 @@
+import pytest
+
+from perspective_engine.config.classification_rules import (
+    SOURCE_REPUTATION_TIERS, SOURCE_REPUTATION_DEFAULT, SOURCE_TRANSPARENCY,
+    SOURCE_TRANSPARENCY_DEFAULT, MAINSTREAM_SOURCE_TYPES, NEUTRAL_SOURCE_TYPES,
+    ALTERNATIVE_SOURCE_TYPES, ACADEMIC_URL_MARKERS, CREDIBILITY_KEYWORDS
+)
+from perspective_engine.services.classification import classify_source_type
+from perspective_engine.services.credibility import score_results
+from perspective_engine.services.search_result import CredibilityFactors
+
+LINKS = [
+    "https://www.cdc.gov/flu", "https://www.harvard.edu/study", "https://nasa.gov/university-program",
+    "https://www.who.int/news", "https://www.reuters.com/world", "https://www.nytimes.com/opinion/x",
+    "https://www.bbc.co.uk/news", "https://www.nature.com/articles/1", "https://en.wikipedia.org/wiki/X",
+    "https://medium.com/@a/b", "https://foo.substack.com/p/x", "https://www.youtube.com/watch?v=1",
+    "https://www.reddit.com/r/x", "https://www.breitbart.com/x", "https://www.greenpeace.org/news/x",
+    "https://smallpaper.com/news/local", "https://example.com/page", None
+]
+TEXTS = [
+    ("Study finds data on solar", "According to research published in a journal, the data shows..."),
+    ("Shocking scandal exposed", "The truth they don't want you to know: a hoax and a conspiracy."),
+    ("Weather today", "Sunny with some clouds."),
+    ("Hidden secret", "An alternative view of the report.")
+]
+
+def reference_score(result):
+    """One result scored with plain Python, as score_results should score it"""
+    url = (result.get('link') or '').lower()
+    text = f"{result['title']} {result['snippet']}".lower()
+    label = classify_source_type(result.get('link'))
+    reputation = next(
+        (reputation for reputation, substrings in SOURCE_REPUTATION_TIERS if any(s in url for s in substrings)),
+        SOURCE_REPUTATION_DEFAULT
+    )
+    evidence = sum(k in result['snippet'].lower() for k in CREDIBILITY_KEYWORDS["evidence_indicators"])
+    bias = max(0, 10 - 2 * sum(k in text for k in CREDIBILITY_KEYWORDS["bias_indicators"]))
+    factors = CredibilityFactors(
+        reputation, min(8, evidence * 2 + 2), bias, SOURCE_TRANSPARENCY.get(label, SOURCE_TRANSPARENCY_DEFAULT)
+    )
+    score = factors.source_reputation * 4 + factors.evidence_quality * 3 + bias * 2 + factors.transparency
+    if label in MAINSTREAM_SOURCE_TYPES:
+        perspective = "mainstream"
+    elif label in NEUTRAL_SOURCE_TYPES or (label == "government" and any(m in url for m in ACADEMIC_URL_MARKERS)):
+        perspective = "neutral"
+    elif label == "government":
+        perspective = "mainstream"
+    elif (label in ALTERNATIVE_SOURCE_TYPES or bias <= 5 or
+          any(k in text for k in CREDIBILITY_KEYWORDS["alternative_terms"])):
+        perspective = "alternative"
+    else:
+        perspective = "neutral"
+    return label, score, perspective, factors
+
+@pytest.fixture
+def results():
+    return [{"link": link, "title": title, "snippet": snippet} for link in LINKS for title, snippet in TEXTS]
+
+def test_source_type_is_the_rule_based_label(results):
+    for result in score_results(results):
+        assert result['source_type_label'] == classify_source_type(result['link'])
+
+def test_batch_scores_match_one_result_at_a_time(results):
+    expected = [reference_score(result) for result in results]
+    for result, (label, score, perspective, factors) in zip(score_results(results), expected):
+        assert result['source_type_label'] == label
+        assert result['intrinsic_credibility_score'] == score
+        assert result['perspective'] == perspective
+        assert result['credibility_factors'] == factors
+
+def test_tiers_only_set_the_reputation():
+    nature, = score_results([{"link": "https://www.nature.com/articles/1", "title": "", "snippet": ""}])
+
+    assert nature['source_type_label'] == "research_publication"
+    assert nature['credibility_factors'].source_reputation == 8
+    assert nature['perspective'] == "neutral"
+
+# Scoring as /search did it before score_results, one result at a time
+_BASELINE_TIERS = [
+    ("government", 9, ['.gov', '.mil', '.edu', 'who.int', 'un.org', 'europa.eu', 'nih.gov', 'cdc.gov']),
+    ("news_media_mainstream", 8, ['reuters.com', 'apnews.com', 'bloomberg.com', 'economist.com']),
+    ("news_media_mainstream", 7, ['nytimes.com', 'washingtonpost.com', 'wsj.com', 'bbc.', 'cnn.com', 'nbcnews.com',
+                                  'abcnews.go.com', 'cbsnews.com', 'nypost.com', 'latimes.com', 'chicagotribune.com',
+                                  'bostonglobe.com', 'usatoday.com', 'sfchronicle.com', 'dallasnews.com']),
+    ("news_media_mainstream", 6, ['foxnews.com', 'msnbc.com', 'newsweek.com', 'time.com', 'theatlantic.com',
+                                  'politico.com', 'axios.com', 'vox.com', 'huffpost.com', 'businessinsider.com',
+                                  'forbes.com']),
+    ("encyclopedia", 8, ['nature.com', 'science.org', 'jstor.org', 'springer', 'wikipedia.org', 'britannica.com',
+                         'scholarpedia.org']),
+    ("news_media_other_or_blog", 4, ['medium.com', 'substack.com', 'wordpress.com', 'blogspot.com']),
+    ("social_media_platform", 3, ['facebook.com', 'twitter.com', 'instagram.com', 'tiktok.com', 'reddit.com',
+                                  'youtube.com', 'linkedin.com']),
+    ("news_media_other_or_blog", 4, ['breitbart.com', 'infowars.com', 'dailycaller.com', 'thegatewaypundit.com',
+                                     'motherjones.com', 'democracynow.org', 'counterpunch.org', 'zerohedge.com',
+                                     'dailywire.com', 'theblaze.com', 'alternet.org'])
+]
+
+def baseline_score(result):
+    """(perspective, score, factors) from the baseline loop"""
+    url = result['link'].lower()
+    title = result['title'].lower()
+    snippet = result['snippet'].lower()
+    label, reputation = next(
+        ((label, reputation) for label, reputation, domains in _BASELINE_TIERS if any(d in url for d in domains)),
+        ("website_general", 5)
+    )
+    evidence = sum(1 for k in CREDIBILITY_KEYWORDS["evidence_indicators"] if k in snippet)
+    bias_count = sum(1 for k in CREDIBILITY_KEYWORDS["bias_indicators"] if k in title or k in snippet)
+    bias = max(0, 10 - bias_count * 2)
+    if label in ['government', 'news_media_mainstream', 'encyclopedia']:
+        transparency = 8
+    elif label == 'news_media_other_or_blog':
+        transparency = 5
+    else:
+        transparency = 4
+    factors = CredibilityFactors(reputation, min(8, evidence * 2 + 2), bias, transparency)
+    score = int(reputation * 4 + factors.evidence_quality * 3 + bias * 2 + transparency)
+    if label == 'news_media_mainstream':
+        perspective = 'mainstream'
+    elif label == 'encyclopedia' or (label == 'government' and any(m in url for m in ACADEMIC_URL_MARKERS)):
+        perspective = 'neutral'
+    elif label == 'government':
+        perspective = 'mainstream'
+    elif (label in ['social_media_platform', 'news_media_other_or_blog'] or bias <= 5 or
+          any(k in title or k in snippet for k in CREDIBILITY_KEYWORDS["alternative_terms"])):
+        perspective = 'alternative'
+    else:
+        perspective = 'neutral'
+    return perspective, score, factors
+
+# Scored exactly as the baseline scored them
+BASELINE_LINKS = [
+    "https://www.aljazeera.com/news/2024/5/1/story", "https://example.com/post/123",
+    "https://localpaper.com/article/city-council", "https://smallpaper.com/news/local",
+    "https://acme.com/blog/launch", "https://www.greenpeace.org/news/x", "https://www.gatesfoundation.org/about",
+    "https://example.com/page", "https://example.xyz/page", "https://www.cdc.gov/flu",
+    "https://www.harvard.edu/study", "https://nasa.gov/university-program", "https://www.who.int/news",
+    "https://www.reuters.com/world", "https://www.nytimes.com/opinion/x", "https://www.bbc.co.uk/news",
+    "https://www.foxnews.com/politics", "https://www.nature.com/articles/1", "https://link.springer.com/article/1",
+    "https://en.wikipedia.org/wiki/X", "https://medium.com/@a/b", "https://medium.com/tag/ai",
+    "https://foo.substack.com/p/x", "https://www.youtube.com/watch?v=1", "https://www.youtube.com/@creator",
+    "https://www.reddit.com/r/x", "https://www.breitbart.com/x", "https://www.democracynow.org/news/x"
+]
+
+# Deliberate differences from the baseline, with neutral text: domains the
+# source type rules know but the baseline reputation tiers did not are scored
+# by their rule label (source type, perspective, transparency)
+INTENDED_CHANGES = {
+    # Mainstream outlets: mainstream, transparency 8
+    "https://www.npr.org/2024/05/01/story": ("news_media_mainstream", "mainstream", 8),
+    "https://www.theguardian.com/world/x": ("news_media_mainstream", "mainstream", 8),
+    "https://www.cnbc.com/markets": ("news_media_mainstream", "mainstream", 8),
+    "https://www.newyorker.com/magazine/x": ("news_media_mainstream", "mainstream", 8),
+    "https://news.google.com/topics/x": ("news_media_mainstream", "mainstream", 8),
+    # Academic publishers: transparency 8, and neutral even with biased text
+    "https://arxiv.org/abs/1234": ("research_publication", "neutral", 8),
+    "https://www.thelancet.com/journals/x": ("research_publication", "neutral", 8),
+    "https://journals.plos.org/plosone/x": ("research_publication", "neutral", 8),
+    # Social platforms: alternative
+    "https://x.com/user/status/1": ("social_media_platform", "alternative", 4),
+    "https://www.quora.com/What-is-x": ("social_media_platform", "alternative", 4),
+    "https://youtu.be/xyz": ("social_media_platform_video", "alternative", 4),
+    # Tier substrings inside other hosts still set the reputation, but no
+    # longer the source type (sun.org is not un.org, signature.com not nature.com)
+    "https://www.sun.org/about": ("ngo_nonprofit_general", "neutral", 4),
+    "https://www.signature.com/x": ("website_general", "neutral", 4),
+}
+
+@pytest.mark.parametrize("link", BASELINE_LINKS)
+def test_scores_match_the_baseline_loop(link):
+    results = [{"link": link, "title": title, "snippet": snippet} for title, snippet in TEXTS]
+    expected = [baseline_score(dict(result)) for result in results]
+    for result, (perspective, score, factors) in zip(score_results(results), expected):
+        assert (result['perspective'], result['intrinsic_credibility_score'], result['credibility_factors']) == (
+            perspective, score, factors
+        )
+
+@pytest.mark.parametrize("link", sorted(INTENDED_CHANGES))
+def test_intended_changes_from_the_baseline(link):
+    result = {"link": link, "title": "Weather today", "snippet": "Sunny with some clouds."}
+    label, perspective, transparency = INTENDED_CHANGES[link]
+    baseline = baseline_score(dict(result))
+    score_results([result])
+
+    assert (result['source_type_label'], result['perspective'], result['credibility_factors'].transparency) == (
+        label, perspective, transparency
+    )
+    # Only the transparency moves the score, and the baseline really differed
+    assert result['intrinsic_credibility_score'] == baseline[1] - baseline[2].transparency + transparency
+    assert (baseline[0], baseline[2].transparency) != (perspective, transparency)
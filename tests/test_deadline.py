@@ -0,0 +1,119 @@
+import functools
+import json
+import math
+import threading
+import time
+
+import pytest
+
+from perspective_engine.api import search
+from perspective_engine.services import ai_classification_service, fusion
+from perspective_engine.services.deadline import Deadline, deadline_for, run_stage
+
+STAGES = [("serp", 8), ("rules", 1)]
+
+def test_stages_share_the_time_left_by_weight():
+    deadline = Deadline(900, STAGES)
+
+    assert deadline.stage("serp") == pytest.approx(0.8, abs=0.01)
+    assert deadline.stage("rules") == pytest.approx(0.9, abs=0.01)
+
+def test_unbounded_deadline_never_runs_out():
+    deadline = Deadline(stages=STAGES)
+
+    assert deadline.stage("serp") == math.inf
+    assert not deadline.expired
+    assert deadline.report() == {}
+
+def test_cut_stages_are_reported_once():
+    deadline = Deadline(500, STAGES)
+    deadline.cut("serp")
+    deadline.cut("serp")
+
+    assert deadline.report() == {"deadline_ms": 500, "cut_short": ["serp"]}
+
+@pytest.mark.parametrize("value", ["abc", 0, -5])
+def test_malformed_deadline_is_rejected(value):
+    with pytest.raises(ValueError):
+        deadline_for(value, STAGES)
+
+def test_run_stage_falls_back_when_the_stage_overruns():
+    deadline = Deadline(100, [("ai", 1)])
+
+    assert run_stage(deadline, "ai", time.sleep, 0.5, fallback=lambda: "rules") == "rules"
+    assert deadline.cut_short == ["ai"]
+    assert run_stage(Deadline(1000, [("ai", 1)]), "ai", lambda: "ai") == "ai"
+
+@pytest.fixture
+def engines(monkeypatch):
+    """Fake engines: "slow" answers after a second, "empty" with nothing, others with one result"""
+    release = threading.Event()
+
+    def fetch_engine_page(query, engine, api_key, start, max_staleness=None):
+        if engine == "slow":
+            release.wait(1)
+        results = [] if engine in ("empty", "slow") else [
+            {"title": query, "link": f"https://{engine}.example/{query}", "snippet": "", "source_engine": engine}
+        ]
+        return results, {"status": "live", "age_seconds": 0}
+
+    monkeypatch.setattr(search, "fetch_engine_page", fetch_engine_page)
+    monkeypatch.setattr(search.local_index, "add_results", lambda results: None)
+    monkeypatch.setattr(search, "record_search", lambda *args: None)
+    yield
+    release.set()
+
+def test_serp_cut_returns_partial_results_not_mock_ones(engines):
+    response = search.run_search("q", ["google", "slow"], "balanced", deadline=Deadline(200, STAGES))
+
+    assert [result["link"] for result in response["results"]] == ["https://google.example/q"]
+    assert response["timed_out_engines"] == ["slow"]
+    assert response["cut_short"] == ["serp"]
+    assert "is_mock" not in response and "error_info" not in response
+
+def test_serp_cut_with_every_engine_timed_out_returns_nothing(engines):
+    response = search.run_search("q", ["slow"], "balanced", deadline=Deadline(200, STAGES))
+
+    assert response["results"] == []
+    assert response["cut_short"] == ["serp"]
+    assert "is_mock" not in response
+    # The timed-out engine is retried on the next page
+    assert response["next_cursor"]
+
+def test_mock_results_only_when_every_engine_answered_empty(engines):
+    response = search.run_search("q", ["empty"], "balanced")
+
+    assert response["is_mock"] is True
+    assert response["error_info"] == search.MOCK_RESULTS_NOTICE
+    assert response["results"]
+
+def stream_events(*args, **kwargs):
+    return [json.loads(line) for line in search.stream_search(*args, **kwargs)]
+
+def test_stream_timeout_sends_no_mock_results(engines):
+    events = stream_events("q", ["slow"], "balanced", deadline=Deadline(200, [("serp", 6), ("ai", 4)]))
+
+    assert [event["event"] for event in events] == ["engine_timeout", "done"]
+    assert events[-1]["cut_short"] == ["serp"]
+    assert events[-1]["total_results"] == 0
+
+def test_stream_mock_results_are_marked(engines):
+    events = stream_events("q", ["empty"], "balanced")
+
+    mock = [event for event in events if event.get("engine") == "mock"]
+    assert len(mock) == 1 and mock[0]["is_mock"] is True and mock[0]["results"]
+
+def test_stream_sends_only_the_top_results_to_the_ai(engines, monkeypatch):
+    sent = []
+
+    def classify(results, ai_provider, user_id):
+        sent.extend(results)
+        return [{**result, "perspective": "neutral"} for result in results]
+
+    monkeypatch.setattr(ai_classification_service, "classify_perspectives_with_ai", classify)
+    monkeypatch.setattr(search, "classify_within_budget", functools.partial(fusion.classify_within_budget, top_k=2))
+    events = stream_events("q", ["google", "bing", "yahoo"], "balanced", ai_provider="openai")
+
+    classification, = [event for event in events if event["event"] == "classification"]
+    assert len(sent) == 2
+    assert [result["link"] for result in classification["results"]] == [result["link"] for result in sent]
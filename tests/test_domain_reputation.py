@@ -0,0 +1,133 @@
+import os
+import struct
+
+import pytest
+
+from perspective_engine.config.classification_rules import GENERIC_SOURCE_TYPES
+from perspective_engine.services import classification, credibility
+from perspective_engine.services.domain_reputation import (
+    DomainReputationDB, ReputationTable, compile_reputation_db, read_reputation_csv
+)
+from perspective_engine.services.host_memo import HostRuleMemo
+
+ROWS = [
+    ("example-news.com", "news_media_other_or_blog", 3, "alternative"),
+    ("sub.example.org", "research_publication", 6, ""),
+    ("whitehouse.gov", "corporate", 2, ""),
+    ("co.uk", "corporate", 1, "")
+]
+
+@pytest.fixture
+def db_path(tmp_path):
+    path = str(tmp_path / "domain_reputation.bin")
+    compile_reputation_db(ROWS, path)
+    return path
+
+def rewrite(path, patch):
+    """Replace the file with a patched copy, as a new build would be renamed over it"""
+    with open(path, "rb") as f:
+        data = bytearray(f.read())
+    patch(data)
+    with open(path + ".new", "wb") as f:
+        f.write(data)
+    os.replace(path + ".new", path)
+
+def first_slot(data):
+    """Byte offset of the first occupied slot"""
+    _, _, slot_count, _, metadata_length = struct.unpack_from("<4sHxxIII", data)
+    start = struct.calcsize("<4sHxxIII") + metadata_length
+    for at in range(start, start + slot_count * 16, 16):
+        if struct.unpack_from("<Q", data, at)[0]:
+            return at
+
+def test_compiled_file_round_trips(db_path):
+    db = DomainReputationDB(db_path, check_seconds=0)
+
+    entry = db.lookup("https://www.example-news.com/story")
+    assert (entry.source_type, entry.reputation, entry.perspective) == ("news_media_other_or_blog", 3, "alternative")
+    assert db.lookup("deep.sub.example.org").perspective is None
+    assert db.lookup("example.org") is None
+    # Listed public suffixes above the registrable domain never match
+    assert db.lookup("bbc.co.uk") is None
+    assert db.stats()["domains"] == len(ROWS)
+
+def test_csv_rows_are_validated(tmp_path):
+    path = tmp_path / "domains.csv"
+    path.write_text("domain,source_type,reputation,perspective\nWWW.Example.com,website_general,7,\n")
+    assert list(read_reputation_csv(str(path))) == [("example.com", "website_general", 7, "")]
+
+    path.write_text("domain,source_type,reputation,perspective\nexample.com,website_general,11,\n")
+    with pytest.raises(ValueError):
+        list(read_reputation_csv(str(path)))
+
+def test_replaced_file_is_swapped_in(db_path):
+    db = DomainReputationDB(db_path, check_seconds=0)
+    version = db.version
+    compile_reputation_db([("fresh.com", "website_general", 9, "")], db_path)
+
+    assert db.lookup("fresh.com").reputation == 9
+    assert db.lookup("example-news.com") is None
+    assert db.version == version + 1
+
+@pytest.mark.parametrize("patch", [
+    # Source type and perspective indexes past the metadata lists
+    lambda data: data.__setitem__(first_slot(data) + 13, 200),
+    lambda data: data.__setitem__(first_slot(data) + 15, 200),
+    # String past the end of the file
+    lambda data: struct.pack_into("<I", data, first_slot(data) + 8, 1 << 30),
+    # Entry count that does not match the occupied slots
+    lambda data: struct.pack_into("<I", data, 12, 3),
+    # More entries than half the slots, so probes could never stop
+    lambda data: struct.pack_into("<I", data, 12, 1000),
+    # Metadata that is not JSON
+    lambda data: data.__setitem__(slice(20, 21), b"["),
+])
+def test_corrupt_file_is_rejected_and_the_old_table_kept(db_path, patch):
+    db = DomainReputationDB(db_path, check_seconds=0)
+    rewrite(db_path, patch)
+    with pytest.raises(ValueError):
+        ReputationTable(db_path)
+
+    assert db.lookup("example-news.com").reputation == 3
+    assert db.stats()["reload_errors"] == 1
+
+def test_full_slot_table_is_rejected(db_path):
+    def fill(data):
+        _, _, slot_count, _, metadata_length = struct.unpack_from("<4sHxxIII", data)
+        start = struct.calcsize("<4sHxxIII") + metadata_length
+        for at in range(start, start + slot_count * 16, 16):
+            if not struct.unpack_from("<Q", data, at)[0]:
+                struct.pack_into("<QIBBBB", data, at, 12345, 0, 1, 0, 1, 0)
+        struct.pack_into("<I", data, 12, slot_count)
+    rewrite(db_path, fill)
+
+    with pytest.raises(ValueError):
+        ReputationTable(db_path)
+
+@pytest.fixture
+def listed(db_path, monkeypatch):
+    """classify_source_type and score_results backed by the test database"""
+    db = DomainReputationDB(db_path, check_seconds=0)
+    memo = HostRuleMemo(classification.source_type_rules, classification._host_of, db, GENERIC_SOURCE_TYPES)
+    monkeypatch.setattr(classification, "source_type_memo", memo)
+    monkeypatch.setattr(credibility, "domain_reputation", db)
+    return db
+
+def test_database_only_replaces_generic_labels(listed):
+    # A host the rules label from its suffix keeps that label
+    assert classification.classify_source_type("https://www.whitehouse.gov/briefing") == "government"
+    assert classification.classify_source_type("https://sub.example.org/about") == "ngo_nonprofit_general"
+    # A generic website takes the database's label, whatever its path
+    assert classification.classify_source_type("https://example-news.com/blog/x") == "news_media_other_or_blog"
+    assert classification.classify_source_type("https://unlisted.com/blog/x") == "corporate_blog_pr_info"
+
+def test_score_results_uses_the_entry_that_gave_the_label(listed):
+    results = credibility.score_results([
+        {"link": "https://example-news.com/a", "title": "", "snippet": ""},
+        {"link": "https://www.whitehouse.gov/a", "title": "", "snippet": ""}
+    ])
+
+    assert [result["source_type_label"] for result in results] == ["news_media_other_or_blog", "government"]
+    assert results[0]["credibility_factors"].source_reputation == 3
+    assert results[0]["perspective"] == "alternative"
+    assert results[1]["credibility_factors"].source_reputation == 9
@@ -0,0 +1,91 @@
+import base64
+import json
+
+import pytest
+
+from perspective_engine.api import search
+from perspective_engine.config.constants import SEARCH_CURSOR_MAX_SEEN
+from perspective_engine.services.dedup import content_id
+from perspective_engine.services.pagination import (
+    decode_cursor, encode_cursor, next_page_cursor, serp_page_params
+)
+
+def test_cursor_round_trip():
+    cursor = encode_cursor("solar power", ["google", "bing"], "balanced", {"google": 10, "bing": 10}, ["b", "a"])
+
+    assert decode_cursor(cursor) == {
+        "query": "solar power",
+        "engines": ["google", "bing"],
+        "perspective": "balanced",
+        "offsets": {"google": 10, "bing": 10},
+        "seen_ids": ["b", "a"]
+    }
+
+@pytest.mark.parametrize("cursor", ["not a cursor", "e30", encode_cursor("q", ["google"], "x", {}, set())[:-4]])
+def test_malformed_cursor_is_rejected(cursor):
+    with pytest.raises(ValueError):
+        decode_cursor(cursor)
+
+def test_cursor_keeps_only_the_most_recent_ids():
+    ids = [content_id(f"https://site{n}.example/article") for n in range(SEARCH_CURSOR_MAX_SEEN * 5)]
+    small = encode_cursor("q", ["google"], "balanced", {"google": 10}, ids[:SEARCH_CURSOR_MAX_SEEN])
+    large = encode_cursor("q", ["google"], "balanced", {"google": 10}, ids)
+
+    page = decode_cursor(large)
+    assert page["seen_ids"] == ids[-SEARCH_CURSOR_MAX_SEEN:]
+    # However many pages were loaded, the cursor and the search key stay the same size
+    assert len(large) == len(small)
+    assert len(search.make_search_key("q", ["google"], "balanced", page=page)) == len(
+        search.make_search_key("q", ["google"], "balanced", page=decode_cursor(small))
+    )
+    # An oversized cursor built by a client is cut down when decoded
+    raw = json.dumps({"q": "q", "e": ["google"], "o": {"google": 10}, "s": ids}).encode("utf-8")
+    assert decode_cursor(base64.urlsafe_b64encode(raw).decode("ascii"))["seen_ids"] == ids[-SEARCH_CURSOR_MAX_SEEN:]
+
+def test_serp_page_params_per_engine():
+    assert serp_page_params("google", 0) == {}
+    assert serp_page_params("google", 10) == {"start": 10}
+    assert serp_page_params("Bing", 10) == {"first": 11}
+
+def test_next_cursor_advances_retries_and_drops_engines():
+    offsets = {"google": 10, "bing": 10, "duckduckgo": 10}
+    cursor = next_page_cursor(
+        "q", ["google", "bing", "duckduckgo"], "balanced", offsets,
+        {"google": 10, "bing": 0}, ["duckduckgo"], {"id1"}, 10
+    )
+
+    page = decode_cursor(cursor)
+    # google moves on a page, the timed-out engine retries, and the exhausted one is dropped
+    assert page["offsets"] == {"google": 20, "duckduckgo": 10}
+    assert page["seen_ids"] == ["id1"]
+
+def test_no_cursor_once_every_engine_is_exhausted():
+    assert next_page_cursor("q", ["google"], "balanced", {"google": 0}, {"google": 0}, [], set(), 10) is None
+
+def fake_engine_pages(monkeypatch, pages):
+    """Serve run_search from {start: [link, ...]} instead of SerpAPI"""
+    def fetch_engine_page(query, engine, api_key, start, max_staleness=None):
+        links = pages.get(start, [])
+        return [{"title": link, "link": link, "snippet": "", "source_engine": engine} for link in links], {
+            "status": "live", "age_seconds": 0
+        }
+
+    monkeypatch.setattr(search, "fetch_engine_page", fetch_engine_page)
+    monkeypatch.setattr(search.local_index, "add_results", lambda results: None)
+
+def test_load_more_fetches_the_next_page_without_repeats(monkeypatch):
+    links = [f"https://site{n}.example/article" for n in range(16)]
+    # The second page repeats the last two links of the first
+    fake_engine_pages(monkeypatch, {0: links[:10], 10: links[8:16]})
+
+    first = search.run_search("q", ["google"], "balanced")
+    assert [result["link"] for result in first["results"]] == links[:10]
+    page = decode_cursor(first["next_cursor"])
+    assert page["offsets"] == {"google": 10}
+
+    second = search.run_search(page["query"], page["engines"], page["perspective"], page=page)
+    assert [result["link"] for result in second["results"]] == links[10:16]
+    assert decode_cursor(second["next_cursor"])["offsets"] == {"google": 20}
+
+    third = search.run_search("q", ["google"], "balanced", page=decode_cursor(second["next_cursor"]))
+    assert third["results"] == [] and third["next_cursor"] is None
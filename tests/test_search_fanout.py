@@ -0,0 +1,82 @@
+import threading
+import time
+
+from perspective_engine.api import search
+from perspective_engine.services import search_service
+from perspective_engine.services.serp_key_pool import PooledKey, serp_key_pool
+from perspective_engine.services.search_fanout import (
+    call_time_left, fanout_stats, fetch_engines_concurrently, iter_engine_results
+)
+
+def test_results_merge_in_engine_order():
+    def fetch(query, engine):
+        time.sleep(0.05 if engine == "google" else 0)
+        return [{"link": f"https://{engine}.example/{query}"}]
+
+    results, timed_out = fetch_engines_concurrently("q", ["google", "bing", "google"], fetch, 2)
+
+    assert timed_out == []
+    assert [result["link"] for result in results] == ["https://google.example/q", "https://bing.example/q"]
+
+def test_engine_errors_count_as_empty_results():
+    def fetch(query, engine):
+        if engine == "bing":
+            raise RuntimeError("boom")
+        return [{"link": "https://a.example"}]
+
+    assert dict(iter_engine_results("q", ["google", "bing"], fetch, 2)) == {
+        "google": [{"link": "https://a.example"}], "bing": []
+    }
+
+def test_slow_engine_times_out_and_its_call_is_bounded():
+    release = threading.Event()
+    seen_limits = {}
+
+    def fetch(query, engine):
+        seen_limits[engine] = call_time_left(30)
+        if engine == "slow":
+            # Stands in for an HTTP call that times out a little after call_time_left
+            release.wait(seen_limits[engine] + 0.2)
+        return [{"link": f"https://{engine}.example"}]
+
+    before = fanout_stats()
+    results, timed_out = fetch_engines_concurrently("q", ["fast", "slow"], fetch, 0.2)
+
+    assert timed_out == ["slow"]
+    assert results == [{"link": "https://fast.example"}]
+    assert all(0 < limit <= 0.2 for limit in seen_limits.values())
+    during = fanout_stats()
+    assert during["timed_out"] == before["timed_out"] + 1
+    assert during["timed_out_running"] == before["timed_out_running"] + 1
+
+    # The straggler finishes at the deadline and gives its worker back
+    stop = time.monotonic() + 2
+    while fanout_stats()["timed_out_running"] > before["timed_out_running"] and time.monotonic() < stop:
+        time.sleep(0.01)
+    assert fanout_stats()["timed_out_running"] == before["timed_out_running"]
+
+def test_call_time_left_outside_a_fanout_is_the_limit():
+    assert call_time_left(7.5) == 7.5
+
+def test_serpapi_fetch_is_bounded_by_the_fanout_deadline(monkeypatch):
+    timeouts = {}
+
+    def acquire(user_api_key=None, timeout=None):
+        timeouts["key"] = timeout
+        return PooledKey(user_api_key, "test", 1, 1)
+
+    def make_serp_client(params, timeout):
+        timeouts["http"] = timeout
+        raise RuntimeError("offline")
+
+    monkeypatch.setattr(serp_key_pool, "acquire", acquire)
+    monkeypatch.setattr(search_service, "make_serp_client", make_serp_client)
+    # The key pool and the fetch itself, below the cache and hedging layers
+    fetch = search_service.fetch_results_via_serpapi.__wrapped__.__wrapped__
+    fetch_engines_concurrently("q", ["fanout-test"], lambda query, engine: fetch(query, engine, "user-key"), 0.5)
+
+    assert 0 < timeouts["key"] <= 0.5
+    assert 0 < timeouts["http"] <= 0.5
+
+def test_search_api_uses_the_search_service_fetch():
+    assert search.fetch_results_via_serpapi is search_service.fetch_results_via_serpapi
@@ -0,0 +1,64 @@
+import time
+from datetime import datetime, timezone
+
+import pytest
+from flask import Flask
+
+from perspective_engine.extensions import db
+from perspective_engine.models import SearchHistory
+from perspective_engine.services.search_history import SearchHistoryWriter, popular_queries
+
+@pytest.fixture
+def app(tmp_path):
+    app = Flask(__name__)
+    app.config["SQLALCHEMY_DATABASE_URI"] = f"sqlite:///{tmp_path / 'app.db'}"
+    db.init_app(app)
+    with app.app_context():
+        db.create_all()
+    return app
+
+def row(query, engines='["google"]', user_id=None):
+    return {
+        "user_id": user_id,
+        "query": query,
+        "engines_used": engines,
+        "perspective": "balanced",
+        "results_count": 10,
+        "created_at": datetime.now(timezone.utc)
+    }
+
+def test_project_prism_app_maps_the_same_columns():
+    from project_prism_app.models import SearchHistory as PrismSearchHistory
+
+    assert [(column.name, str(column.type), column.nullable) for column in PrismSearchHistory.__table__.columns] == [
+        (column.name, str(column.type), column.nullable) for column in SearchHistory.__table__.columns
+    ]
+
+def test_writer_commits_queued_rows_in_the_background(app):
+    writer = SearchHistoryWriter(batch_size=2)
+    for query in ["solar power", "Solar Power", "wind power"]:
+        assert writer.enqueue(row(query))
+    writer.start(app)
+
+    stop = time.monotonic() + 2
+    while writer.stats()["written"] < 3 and time.monotonic() < stop:
+        time.sleep(0.01)
+    assert writer.stats() == {"written": 3, "dropped": 0, "failed": 0, "queued": 0}
+    with app.app_context():
+        assert db.session.query(SearchHistory).count() == 3
+        assert popular_queries(top_n=1) == [("solar power", ["google"])]
+
+def test_full_queue_drops_rows_instead_of_blocking():
+    writer = SearchHistoryWriter(max_queued=1)
+
+    assert writer.enqueue(row("a"))
+    assert not writer.enqueue(row("b"))
+    assert writer.stats()["dropped"] == 1
+
+def test_failed_batch_is_counted_and_rolled_back(app):
+    writer = SearchHistoryWriter()
+    with app.app_context():
+        writer.write([row(None)])
+        assert writer.stats()["failed"] == 1
+        writer.write([row("after the failure")])
+        assert db.session.query(SearchHistory).count() == 1
@@ -0,0 +1,22 @@
+import pickle
+
+from perspective_engine.services.classification import classify_source_type
+from perspective_engine.services.credibility import score_results
+from perspective_engine.services.search_result import SearchResult, SourceType
+
+def test_every_classified_label_is_interned(urls):
+    for url in urls + [None, "https://[broken"]:
+        result = SearchResult({"source_type_label": classify_source_type(url)})
+        assert isinstance(result["source_type_label"], SourceType), url
+
+def test_scored_labels_are_interned_and_leave_as_strings(urls):
+    results = score_results([SearchResult({"link": url, "title": "", "snippet": ""}) for url in urls])
+    for result in results:
+        assert isinstance(result["source_type_label"], SourceType)
+        assert type(result.to_dict()["source_type_label"]) is str
+
+def test_labels_outside_the_rules_stay_strings():
+    result = SearchResult({"source_type_label": "corporate"})
+
+    assert type(result["source_type_label"]) is str
+    assert pickle.loads(pickle.dumps(SourceType.GOVERNMENT)) is SourceType.GOVERNMENT
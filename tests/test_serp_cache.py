@@ -0,0 +1,113 @@
+import threading
+import time
+
+import pytest
+
+from perspective_engine.services import serp_cache as serp_cache_module
+from perspective_engine.services.serp_cache import SerpCache, fetch_with_freshness, make_cache_key
+
+RESULTS = [{"title": "A", "link": "https://a.example"}]
+
+@pytest.fixture
+def cache(tmp_path):
+    return SerpCache(db_path=str(tmp_path / "serp_cache.db"), ttls={"google": 60}, max_staleness=600)
+
+def age_entry(cache, key, seconds):
+    """Move an entry's stored time back in both tiers"""
+    stored_at, results = cache._memory[key]
+    cache._memory[key] = (stored_at - seconds, results)
+    cache._db.execute("UPDATE serp_cache SET stored_at = stored_at - ? WHERE key = ?", (seconds, key))
+    cache._db.commit()
+
+def test_make_cache_key_normalizes_query_and_engine():
+    assert make_cache_key("  Climate   Change ", "Google") == make_cache_key("climate change", "google")
+    assert make_cache_key("q", "google", start=10) != make_cache_key("q", "google")
+
+def test_fresh_entry_is_a_memory_hit_and_a_copy(cache):
+    cache.set("k", "google", RESULTS)
+    results, age, is_stale = cache.get_entry("k", "google")
+    results[0]["title"] = "changed"
+
+    assert not is_stale and age < 1
+    assert cache.get("k", "google") == RESULTS
+    assert cache.stats()["memory_hits"] == 2
+
+def test_expired_entry_is_served_stale_within_max_staleness(cache):
+    cache.set("k", "google", RESULTS)
+    age_entry(cache, "k", 120)
+
+    assert cache.get("k", "google") is None
+    results, age, is_stale = cache.get_entry("k", "google")
+    assert results == RESULTS and is_stale and age >= 120
+    assert cache.get_entry("k", "google", max_staleness=30) is None
+
+    age_entry(cache, "k", 600)
+    assert cache.get_entry("k", "google") is None
+
+def test_disk_tier_survives_the_memory_tier(cache):
+    cache.set("k", "google", RESULTS)
+    cache._memory.clear()
+
+    assert cache.get_entry("k", "google")[0] == RESULTS
+    assert cache.stats()["disk_hits"] == 1
+    # The disk hit was promoted to memory
+    assert cache.get_entry("k", "google")[0] == RESULTS
+    assert cache.stats()["memory_hits"] == 1
+
+def test_disk_hit_only_rewrites_last_access_when_it_is_old(cache):
+    cache.set("k", "google", RESULTS)
+    last_access = cache._db.execute("SELECT last_access FROM serp_cache").fetchone()[0]
+
+    cache._memory.clear()
+    cache.get_entry("k", "google")
+    assert cache._db.execute("SELECT last_access FROM serp_cache").fetchone()[0] == last_access
+
+    cache._db.execute("UPDATE serp_cache SET last_access = last_access - ?", (cache.access_resolution + 1,))
+    cache._db.commit()
+    cache._memory.clear()
+    cache.get_entry("k", "google")
+    assert cache._db.execute("SELECT last_access FROM serp_cache").fetchone()[0] > last_access
+
+def test_memory_hits_do_not_wait_for_the_database(cache):
+    cache.set("k", "google", RESULTS)
+    with cache._db_lock:
+        hit = []
+        reader = threading.Thread(target=lambda: hit.append(cache.get_entry("k", "google")))
+        reader.start()
+        reader.join(1)
+        assert hit and hit[0][0] == RESULTS
+
+def test_stale_entry_is_returned_and_refreshed_in_the_background(cache, monkeypatch):
+    monkeypatch.setattr(serp_cache_module, "serp_cache", cache)
+    refreshed = threading.Event()
+    calls = []
+
+    def fetch(query, engine_name, api_key, num_results, start):
+        calls.append(query)
+        refreshed.set()
+        return [{"title": "B", "link": "https://b.example"}]
+
+    key = make_cache_key("q", "google", 10)
+    cache.set(key, "google", RESULTS)
+    age_entry(cache, key, 120)
+
+    results, freshness = fetch_with_freshness(fetch, "q", "google", None, 10)
+    assert results == RESULTS
+    assert freshness["status"] == "stale"
+
+    assert refreshed.wait(2)
+    stop = time.monotonic() + 2
+    while cache.get(key, "google") is None and time.monotonic() < stop:
+        time.sleep(0.01)
+    assert cache.get(key, "google")[0]["title"] == "B"
+    assert calls == ["q"]
+
+def test_miss_fetches_live_and_empty_results_are_not_cached(cache, monkeypatch):
+    monkeypatch.setattr(serp_cache_module, "serp_cache", cache)
+
+    results, freshness = fetch_with_freshness(lambda *args: [], "q", "google", None, 10)
+    assert results == [] and freshness == {"status": "live", "age_seconds": 0}
+    assert cache.get(make_cache_key("q", "google", 10), "google") is None
+
+    fetch_with_freshness(lambda *args: RESULTS, "q", "google", None, 10)
+    assert fetch_with_freshness(lambda *args: [], "q", "google", None, 10)[1]["status"] == "fresh"
@@ -0,0 +1,79 @@
+import threading
+import time
+
+import pytest
+
+from perspective_engine.services.singleflight import SingleFlight
+
+def wait_until(condition, seconds=2):
+    stop = time.monotonic() + seconds
+    while not condition() and time.monotonic() < stop:
+        time.sleep(0.001)
+
+def test_concurrent_callers_share_one_call():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    calls = []
+
+    def work():
+        calls.append(1)
+        started.set()
+        release.wait(2)
+        return {"results": []}
+
+    results = []
+    leader = threading.Thread(target=lambda: results.append(flight.do("k", work)))
+    leader.start()
+    assert started.wait(2)
+    followers = [threading.Thread(target=lambda: results.append(flight.do("k", work))) for _ in range(4)]
+    for follower in followers:
+        follower.start()
+    # Followers are waiting on the leader's future once they are counted
+    wait_until(lambda: flight.stats()["coalesced"] == 4)
+    release.set()
+    for thread in [leader] + followers:
+        thread.join(2)
+
+    assert len(calls) == 1
+    assert len(results) == 5 and all(result is results[0] for result in results)
+    assert flight.stats() == {"executed": 1, "coalesced": 4, "in_flight": 0, "coalesced_ratio": 0.8}
+
+def test_calls_after_completion_run_again():
+    flight = SingleFlight()
+    assert flight.do("k", lambda: 1) == 1
+    assert flight.do("k", lambda: 2) == 2
+    assert flight.do("other", lambda: 3) == 3
+    assert flight.stats()["executed"] == 3
+
+def test_errors_reach_every_waiter_and_free_the_key():
+    flight = SingleFlight()
+    started, release = threading.Event(), threading.Event()
+    errors = []
+
+    def failing():
+        started.set()
+        release.wait(2)
+        raise RuntimeError("upstream down")
+
+    def call():
+        try:
+            flight.do("k", failing)
+        except RuntimeError as e:
+            errors.append(str(e))
+
+    leader = threading.Thread(target=call)
+    leader.start()
+    assert started.wait(2)
+    follower = threading.Thread(target=call)
+    follower.start()
+    wait_until(lambda: flight.stats()["coalesced"] == 1)
+    release.set()
+    leader.join(2)
+    follower.join(2)
+
+    assert errors == ["upstream down", "upstream down"]
+    assert flight.do("k", lambda: "ok") == "ok"
+
+def test_error_in_a_lone_call_propagates():
+    with pytest.raises(ValueError):
+        SingleFlight().do("k", lambda: int("x"))
@@ -0,0 +1,90 @@
+import pytest
+from flask import Flask
+from flask_jwt_extended import JWTManager, create_access_token
+from flask_restful import Api
+
+from perspective_engine.api import suggest as suggest_api
+from perspective_engine.config.constants import SEARCH_PAGE_SIZE
+from perspective_engine.services.serp_cache import SerpCache, make_cache_key
+from perspective_engine.services.suggest import QuerySuggester
+
+def searched(suggester, query, users, timestamp=1_800_000_000):
+    for user in users:
+        suggester.add(query, timestamp, user=user)
+
+def test_queries_need_enough_distinct_users():
+    suggester = QuerySuggester(min_users=3)
+    searched(suggester, "climate change", ["a", "a", "b"])
+    suggester.add("climate change")  # anonymous
+    assert suggester.suggest("cli") == []
+    assert len(suggester) == 0
+
+    searched(suggester, "climate change", ["c"])
+    assert suggester.suggest("cli") == ["climate change"]
+    assert len(suggester) == 1
+
+def test_scores_before_the_threshold_still_count():
+    suggester = QuerySuggester(min_users=2)
+    # Many searches by one user, then a second user
+    searched(suggester, "solar panels", ["a"] * 20)
+    searched(suggester, "solar power", ["a", "b", "c"])
+    searched(suggester, "solar panels", ["b"])
+
+    assert suggester.suggest("solar") == ["solar panels", "solar power"]
+
+def test_recent_searches_outrank_old_ones():
+    suggester = QuerySuggester(min_users=1, half_life_hours=1)
+    searched(suggester, "old news", ["a", "b", "c"], timestamp=1_800_000_000)
+    searched(suggester, "new news", ["a"], timestamp=1_800_000_000 + 3 * 3600)
+
+    assert suggester.suggest("n") == ["new news"]
+    assert suggester.suggest("") == ["new news", "old news"]
+
+def test_prefix_is_normalized_and_limited():
+    suggester = QuerySuggester(min_users=1, top_k=2)
+    for query in ["Wind  Power", "wind farms", "wind turbines"]:
+        suggester.add(query, user="a")
+
+    assert len(suggester.suggest("  WIND ")) == 2
+    assert suggester.suggest("wind p", limit=5) == ["wind power"]
+
+@pytest.fixture
+def client(monkeypatch, tmp_path):
+    suggester = QuerySuggester(min_users=1)
+    for query in ["vaccine safety", "vaccine schedule"]:
+        suggester.add(query, user="a")
+    cache = SerpCache(db_path=str(tmp_path / "serp_cache.db"))
+    cache.set(make_cache_key("vaccine schedule", "google", SEARCH_PAGE_SIZE), "google", [{"link": "https://a.example"}])
+    monkeypatch.setattr(suggest_api, "query_suggester", suggester)
+    monkeypatch.setattr(suggest_api, "serp_cache", cache)
+
+    app = Flask(__name__)
+    app.config["JWT_SECRET_KEY"] = "test-secret-key-that-is-long-enough"
+    # Lets flask_jwt_extended's 401 handler see errors raised inside Flask-RESTful resources
+    app.config["PROPAGATE_EXCEPTIONS"] = True
+    JWTManager(app)
+    Api(app).add_resource(suggest_api.SuggestResource, "/suggest")
+    with app.app_context():
+        token = create_access_token(identity="1")
+    return app.test_client(), token
+
+def test_suggest_requires_sign_in(client):
+    test_client, _ = client
+    assert test_client.get("/suggest?q=vac").status_code == 401
+
+def test_suggest_lists_cached_queries_first(client):
+    test_client, token = client
+    response = test_client.get("/suggest?q=vac", headers={"Authorization": f"Bearer {token}"})
+
+    assert response.status_code == 200
+    assert response.get_json()["suggestions"] == [
+        {"query": "vaccine schedule", "cached": True},
+        {"query": "vaccine safety", "cached": False}
+    ]
+
+def test_cached_flag_ignores_the_disk_tier(client):
+    test_client, token = client
+    suggest_api.serp_cache._memory.clear()
+    response = test_client.get("/suggest?q=vac", headers={"Authorization": f"Bearer {token}"})
+
+    assert all(not suggestion["cached"] for suggestion in response.get_json()["suggestions"])